@@ -4,3 +4,29 @@ from django.apps import AppConfig
 class GeoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.geo"
+
+    def ready(self) -> None:
+        from django.contrib.auth import get_user_model
+        from django.core.checks import Tags, register
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        from apps.geo.checks import check_process_local_caches, check_replicas_have_shared_cache
+        from apps.geo.metrics import install_query_recorder
+        from apps.geo.repositories.query_sampler import install_query_sampler
+        from apps.geo.services.token_blacklist import remember_blacklisted_token
+        from apps.geo.services.user_cache import invalidate_cached_user
+
+        register(check_replicas_have_shared_cache, Tags.caches)
+        register(check_process_local_caches, Tags.caches)
+        connection_created.connect(install_query_recorder, dispatch_uid="geo_query_metrics")
+        connection_created.connect(install_query_sampler, dispatch_uid="geo_query_sampler")
+        user_model = get_user_model()
+        post_save.connect(invalidate_cached_user, sender=user_model, dispatch_uid="geo_user_cache")
+        post_delete.connect(
+            invalidate_cached_user, sender=user_model, dispatch_uid="geo_user_cache_delete"
+        )
+        post_save.connect(
+            remember_blacklisted_token, sender=BlacklistedToken, dispatch_uid="geo_token_blacklist"
+        )
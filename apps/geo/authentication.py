@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from apps.geo.metrics import timed
+from apps.geo.services.user_cache import user_cache
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """`JWTAuthentication` с замером фазы `auth` (проверка подписи и загрузка пользователя)."""
+
+    def authenticate(self, request: Request) -> tuple[Any, Any] | None:
+        with timed("auth"):
+            return super().authenticate(request)
+
+
+class CachedJWTAuthentication(TimedJWTAuthentication):
+    """
+    Пользователь из `user_cache` вместо `SELECT` по `auth_user` на каждый запрос.
+
+    С `JWT_STATELESS_READS=1` безопасные методы (GET/HEAD/OPTIONS) вьюх с
+    `stateless_auth = True` вообще не читают пользователя: `request.user` — `TokenUser`
+    из claims токена. Деактивация такого пользователя вступает в силу с истечением
+    access-токена (`JWT_ACCESS_MINUTES`).
+    """
+
+    stateless = False
+
+    def authenticate(self, request: Request) -> tuple[Any, Any] | None:
+        view = (request.parser_context or {}).get("view")
+        self.stateless = bool(
+            settings.JWT_STATELESS_READS
+            and request.method in SAFE_METHODS
+            and getattr(view, "stateless_auth", False)
+        )
+        return super().authenticate(request)
+
+    def get_user(self, validated_token: Token) -> Any:
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if self.stateless:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        cached = user_cache.get(user_id)
+        if cached is None:
+            # Промах: проверки (не найден, неактивен, смена пароля) — у родителя.
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+            return user
+        user, password_digest = cached
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_digest
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+
+class TimedJWTAuthenticationScheme(SimpleJWTScheme):
+    # Та же схема `jwtAuth` в OpenAPI: расширение simplejwt не распространяется на подклассы.
+    target_class = "apps.geo.authentication.TimedJWTAuthentication"
+    match_subclasses = True
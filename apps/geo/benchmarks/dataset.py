@@ -0,0 +1,110 @@
+"""
+Генерация синтетических данных для нагрузочных прогонов (`manage.py generate_dataset`).
+
+Распределение близко к реальному: точки сгущаются вокруг городов (вес города ~ население,
+разброс — нормальный, в километрах), небольшая доля равномерно размазана по суше-океану;
+число сообщений на точку — Zipf (у большинства 0–1, у единиц — сотни).
+"""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+import random
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+
+KM_PER_DEGREE_LATITUDE = 111.32
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    latitude: float
+    longitude: float
+    # Население, млн — вес при выборе города.
+    weight: float
+
+
+CITIES: tuple[City, ...] = (
+    City("Tokyo", 35.6895, 139.6917, 37.4),
+    City("Delhi", 28.6139, 77.2090, 31.0),
+    City("Shanghai", 31.2304, 121.4737, 27.1),
+    City("Sao Paulo", -23.5505, -46.6333, 22.0),
+    City("Mexico City", 19.4326, -99.1332, 21.8),
+    City("Cairo", 30.0444, 31.2357, 20.9),
+    City("Mumbai", 19.0760, 72.8777, 20.4),
+    City("Beijing", 39.9042, 116.4074, 20.4),
+    City("New York", 40.7128, -74.0060, 18.8),
+    City("Istanbul", 41.0082, 28.9784, 15.2),
+    City("Moscow", 55.7558, 37.6173, 12.6),
+    City("Lagos", 6.5244, 3.3792, 14.4),
+    City("Paris", 48.8566, 2.3522, 11.0),
+    City("London", 51.5074, -0.1278, 9.5),
+    City("Los Angeles", 34.0522, -118.2437, 12.5),
+    City("Jakarta", -6.2088, 106.8456, 10.8),
+    City("Seoul", 37.5665, 126.9780, 9.9),
+    City("Lima", -12.0464, -77.0428, 10.7),
+    City("Saint Petersburg", 59.9311, 30.3609, 5.4),
+    City("Berlin", 52.5200, 13.4050, 3.6),
+    City("Sydney", -33.8688, 151.2093, 5.3),
+    City("Nairobi", -1.2921, 36.8219, 4.9),
+    City("Novosibirsk", 55.0084, 82.9357, 1.6),
+    # Рядом с антимеридианом — покрывает ветку поиска через ±180°.
+    City("Suva", -18.1248, 178.4501, 0.2),
+)
+
+
+def generate_points(
+    rng: random.Random,
+    *,
+    count: int,
+    cities: Sequence[City] = CITIES,
+    spread_km: float = 15.0,
+    background_share: float = 0.05,
+) -> Iterator[dict[str, float | str]]:
+    """
+    `count` словарей `{"title", "latitude", "longitude"}` (формат `PointsRepository.copy_points`).
+    Разброс вокруг города — нормальный с σ = `spread_km`; `background_share` точек — равномерно
+    по сфере.
+    """
+    cum_weights = list(itertools.accumulate(city.weight for city in cities))
+    for index in range(count):
+        if rng.random() < background_share:
+            latitude = math.degrees(math.asin(rng.uniform(-1.0, 1.0)))
+            longitude = rng.uniform(-180.0, 180.0)
+            title = f"bench #{index}"
+        else:
+            city = cities[bisect.bisect_left(cum_weights, rng.random() * cum_weights[-1])]
+            latitude, longitude = jitter_around(rng, city.latitude, city.longitude, spread_km)
+            title = f"{city.name} #{index}"
+        yield {"title": title, "latitude": latitude, "longitude": longitude}
+
+
+def zipf_sampler(rng: random.Random, *, exponent: float, maximum: int) -> Iterator[int]:
+    """
+    Бесконечный поток значений 0..`maximum - 1` с P(k) ~ 1 / (k + 1)^exponent:
+    ограниченный Zipf (обратная функция распределения по накопленным весам).
+    """
+    cum_weights = list(
+        itertools.accumulate(1.0 / (rank**exponent) for rank in range(1, maximum + 1))
+    )
+    total = cum_weights[-1]
+    while True:
+        yield bisect.bisect_left(cum_weights, rng.random() * total)
+
+
+def jitter_around(
+    rng: random.Random, latitude: float, longitude: float, spread_km: float
+) -> tuple[float, float]:
+    """Случайная точка около центра: нормальный разброс с σ = `spread_km` по каждой оси."""
+    new_latitude = latitude + rng.gauss(0.0, spread_km) / KM_PER_DEGREE_LATITUDE
+    new_latitude = max(-89.9, min(89.9, new_latitude))
+    km_per_degree_longitude = KM_PER_DEGREE_LATITUDE * max(
+        math.cos(math.radians(new_latitude)), 0.01
+    )
+    new_longitude = longitude + rng.gauss(0.0, spread_km) / km_per_degree_longitude
+    # Нормализация в [-180, 180): город у антимеридиана разливается на обе стороны.
+    new_longitude = (new_longitude + 180.0) % 360.0 - 180.0
+    return new_latitude, new_longitude
@@ -0,0 +1,188 @@
+"""
+Прогон сценариев в процессе: полный стек Django (middleware, аутентификация, DRF) через
+тестовый клиент, без сети. Параллелизм — потоки, у каждого своё соединение с БД, как у
+воркера gthread. Результат — JSON, пригодный для сравнения прогонов (`compare_runs`).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from apps.geo.benchmarks.scenarios import BenchContext, BenchRequest, Scenario
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    concurrency: int
+    duration_s: float
+    throughput_rps: float
+    latency_ms: dict[str, float]
+    queries_per_request: dict[str, float]
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def run_scenario(
+    scenario: Scenario,
+    *,
+    context: BenchContext,
+    client_defaults: dict[str, str],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> ScenarioResult:
+    """`warmup` запросов не учитываются; затем `requests` запросов в `concurrency` потоков."""
+    warmup_rng = random.Random(seed)
+    warmup_client = Client(raise_request_exception=False, **client_defaults)
+    for _ in range(warmup):
+        _perform(warmup_client, scenario.build(context, warmup_rng))
+
+    latencies: list[float] = []
+    queries: list[int] = []
+    statuses: Counter[int] = Counter()
+    lock = threading.Lock()
+    remaining = requests
+
+    def take_ticket() -> bool:
+        nonlocal remaining
+        with lock:
+            if remaining <= 0:
+                return False
+            remaining -= 1
+            return True
+
+    def worker(worker_index: int) -> None:
+        rng = random.Random(seed * 1000 + worker_index + 1)
+        client = Client(raise_request_exception=False, **client_defaults)
+        try:
+            while take_ticket():
+                status, elapsed, query_count = _perform(client, scenario.build(context, rng))
+                with lock:
+                    latencies.append(elapsed)
+                    queries.append(query_count)
+                    statuses[status] += 1
+        finally:
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), name=f"bench-{scenario.name}-{index}")
+        for index in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return ScenarioResult(
+        name=scenario.name,
+        requests=len(latencies),
+        errors=sum(count for status, count in statuses.items() if status >= 400),
+        concurrency=concurrency,
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        latency_ms={
+            **{f"p{q}": round(percentile(latencies, q) * 1000, 3) for q in PERCENTILES},
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        queries_per_request={
+            "mean": round(sum(queries) / len(queries), 2) if queries else 0.0,
+            "max": max(queries, default=0),
+        },
+        status_codes={str(status): count for status, count in sorted(statuses.items())},
+    )
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией; `sorted_values` отсортированы по возрастанию."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def compare_runs(
+    baseline: dict[str, Any], current: dict[str, Any], *, threshold: float
+) -> list[dict[str, Any]]:
+    """
+    Построчное сравнение двух отчётов `bench_api`. Регрессия — рост p95 больше чем на
+    `threshold` (доля) или рост среднего числа запросов к БД.
+    """
+    baseline_by_name = {result["name"]: result for result in baseline["scenarios"]}
+    rows = []
+    for result in current["scenarios"]:
+        before = baseline_by_name.get(result["name"])
+        if before is None:
+            continue
+        p95_before = before["latency_ms"]["p95"]
+        p95_after = result["latency_ms"]["p95"]
+        p95_change = (p95_after - p95_before) / p95_before if p95_before else 0.0
+        queries_before = before["queries_per_request"]["mean"]
+        queries_after = result["queries_per_request"]["mean"]
+        rows.append(
+            {
+                "name": result["name"],
+                "p95_before_ms": p95_before,
+                "p95_after_ms": p95_after,
+                "p95_change": round(p95_change, 4),
+                "queries_before": queries_before,
+                "queries_after": queries_after,
+                "regressed": p95_change > threshold or queries_after > queries_before,
+            }
+        )
+    return rows
+
+
+def _perform(client: Client, request: BenchRequest) -> tuple[int, float, int]:
+    """`(статус, секунды, число SQL-запросов во всех БД)` одного запроса."""
+    with ExitStack() as stack:
+        captures = [
+            stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections
+        ]
+        started = time.perf_counter()
+        if request.method == "GET":
+            response = client.get(request.path, data=request.params, headers=request.headers)
+        else:
+            response = client.generic(
+                request.method,
+                request.path,
+                data=json.dumps(request.json),
+                content_type="application/json",
+                headers=request.headers,
+            )
+        if response.streaming:
+            chunks = iter(response.streaming_content)
+            if request.first_chunk_only:
+                next(chunks, None)
+            else:
+                for _ in chunks:
+                    pass
+        response.close()
+        elapsed = time.perf_counter() - started
+    return response.status_code, elapsed, sum(len(capture) for capture in captures)
@@ -0,0 +1,233 @@
+"""
+Сценарии нагрузочного прогона (`manage.py bench_api`): по одному на эндпоинт
+`apps/geo/routers/urls.py`, имя сценария — имя маршрута. Новый маршрут без сценария
+прогон не запустит (см. `missing_scenarios`).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from apps.geo.benchmarks.dataset import CITIES, jitter_around
+
+API_PREFIX = "/api/"
+BENCH_PASSWORD = "bench-password-1"
+
+
+@dataclass
+class BenchContext:
+    """Общие для сценариев входные данные: реальные id точек и параметры областей."""
+
+    point_ids: Sequence[int]
+    radius_km: float = 2.0
+    center_spread_km: float = 10.0
+    _counter: itertools.count = field(default_factory=itertools.count)
+
+    def center(self, rng: random.Random) -> tuple[float, float]:
+        # Запросы распределены как данные: вокруг городов, пропорционально весу.
+        city = rng.choices(CITIES, weights=[city.weight for city in CITIES])[0]
+        return jitter_around(rng, city.latitude, city.longitude, self.center_spread_km)
+
+    def point_id(self, rng: random.Random) -> int:
+        return rng.choice(self.point_ids) if self.point_ids else 1
+
+    def unique_username(self) -> str:
+        return f"bench_{uuid.uuid4().hex[:12]}_{next(self._counter)}"
+
+
+@dataclass(frozen=True)
+class BenchRequest:
+    method: str
+    path: str
+    params: dict[str, Any] | None = None
+    json: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+    # Потоковые ответы без конца (SSE): меряется время до первого блока.
+    first_chunk_only: bool = False
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[BenchContext, random.Random], BenchRequest]
+
+
+def _radius_params(context: BenchContext, rng: random.Random) -> dict[str, Any]:
+    latitude, longitude = context.center(rng)
+    return {"latitude": latitude, "longitude": longitude, "radius": context.radius_km}
+
+
+def _center_params(context: BenchContext, rng: random.Random) -> dict[str, Any]:
+    latitude, longitude = context.center(rng)
+    return {"latitude": latitude, "longitude": longitude}
+
+
+def _bbox_params(context: BenchContext, rng: random.Random, *, half_deg: float) -> dict[str, Any]:
+    latitude, longitude = context.center(rng)
+    return {
+        "min_latitude": max(-90.0, latitude - half_deg),
+        "max_latitude": min(90.0, latitude + half_deg),
+        "min_longitude": max(-180.0, longitude - half_deg),
+        "max_longitude": min(180.0, longitude + half_deg),
+    }
+
+
+def _point_payload(context: BenchContext, rng: random.Random) -> dict[str, Any]:
+    latitude, longitude = context.center(rng)
+    return {"title": "bench", "latitude": latitude, "longitude": longitude}
+
+
+def _message_payload(context: BenchContext, rng: random.Random) -> dict[str, Any]:
+    return {"point_id": context.point_id(rng), "text": "bench message"}
+
+
+def _tile_path(context: BenchContext, rng: random.Random, *, zoom: int) -> str:
+    latitude, longitude = context.center(rng)
+    tiles = 2**zoom
+    x = int((longitude + 180.0) / 360.0 * tiles)
+    lat_rad = math.radians(max(-85.0511, min(85.0511, latitude)))
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * tiles)
+    return f"{API_PREFIX}tiles/{zoom}/{min(x, tiles - 1)}/{min(y, tiles - 1)}.mvt"
+
+
+def _get(path: str, params_builder: Callable[..., dict[str, Any]], **extra: Any) -> Callable:
+    def build(context: BenchContext, rng: random.Random) -> BenchRequest:
+        return BenchRequest(
+            "GET", API_PREFIX + path, params={**params_builder(context, rng), **extra}
+        )
+
+    return build
+
+
+def _get_path(path: str) -> Callable:
+    return lambda context, rng: BenchRequest("GET", API_PREFIX + path)
+
+
+def _post(path: str, payload_builder: Callable[..., Any]) -> Callable:
+    def build(context: BenchContext, rng: random.Random) -> BenchRequest:
+        return BenchRequest("POST", API_PREFIX + path, json=payload_builder(context, rng))
+
+    return build
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario("health-ready", _get_path("health/ready/")),
+    Scenario("metrics", _get_path("metrics/")),
+    Scenario(
+        "auth-register",
+        _post(
+            "auth/register/",
+            lambda context, rng: {
+                "username": context.unique_username(),
+                "password": BENCH_PASSWORD,
+            },
+        ),
+    ),
+    Scenario("points-create", _post("points/", _point_payload)),
+    Scenario(
+        "points-bulk-create",
+        _post(
+            "points/bulk/",
+            lambda context, rng: {"items": [_point_payload(context, rng) for _ in range(50)]},
+        ),
+    ),
+    Scenario("messages-create", _post("points/messages/", _message_payload)),
+    Scenario(
+        "messages-bulk-create",
+        _post(
+            "points/messages/bulk/",
+            lambda context, rng: {"items": [_message_payload(context, rng) for _ in range(50)]},
+        ),
+    ),
+    Scenario("points-search", _get("points/search/", _radius_params)),
+    Scenario(
+        "points-batch-search",
+        _post(
+            "points/search/batch/",
+            lambda context, rng: {
+                "probes": [_radius_params(context, rng) for _ in range(20)],
+                "limit": 50,
+            },
+        ),
+    ),
+    Scenario("messages-search", _get("points/messages/search/", _radius_params)),
+    Scenario(
+        "messages-stream",
+        lambda context, rng: BenchRequest(
+            "GET",
+            f"{API_PREFIX}points/messages/stream/",
+            params=_radius_params(context, rng),
+            first_chunk_only=True,
+        ),
+    ),
+    Scenario(
+        "points-bbox-search",
+        _get("points/bbox/", lambda context, rng: _bbox_params(context, rng, half_deg=0.05)),
+    ),
+    Scenario(
+        "messages-bbox-search",
+        _get(
+            "points/messages/bbox/", lambda context, rng: _bbox_params(context, rng, half_deg=0.05)
+        ),
+    ),
+    Scenario("points-export", _get("points/search/export/", _radius_params)),
+    Scenario("messages-export", _get("points/messages/search/export/", _radius_params)),
+    Scenario(
+        "points-clusters",
+        _get(
+            "points/clusters/",
+            lambda context, rng: _bbox_params(context, rng, half_deg=0.5),
+            zoom=10,
+        ),
+    ),
+    Scenario(
+        "points-nearest",
+        _get("points/nearest/", _center_params),
+    ),
+    Scenario(
+        "messages-nearest",
+        _get("points/messages/nearest/", _center_params),
+    ),
+    Scenario(
+        "points-tile",
+        lambda context, rng: BenchRequest("GET", _tile_path(context, rng, zoom=14)),
+    ),
+    Scenario("async-points-create", _post("async/points/", _point_payload)),
+    Scenario("async-messages-create", _post("async/points/messages/", _message_payload)),
+    Scenario("async-points-search", _get("async/points/search/", _radius_params)),
+    Scenario("async-messages-search", _get("async/points/messages/search/", _radius_params)),
+    Scenario(
+        "admin-test-users-create",
+        _post(
+            "admin/test-users/",
+            lambda context, rng: {
+                "username": context.unique_username(),
+                "password": BENCH_PASSWORD,
+            },
+        ),
+    ),
+    Scenario(
+        "admin-test-users-bulk-create",
+        _post(
+            "admin/test-users/bulk/",
+            lambda context, rng: {
+                "usernames": [context.unique_username() for _ in range(50)],
+                "password": BENCH_PASSWORD,
+            },
+        ),
+    ),
+    Scenario("admin-slow-queries", _get_path("admin/slow-queries/")),
+    Scenario("admin-slow-queries-export", _get_path("admin/slow-queries/export/")),
+)
+
+
+def missing_scenarios(url_names: Sequence[str]) -> list[str]:
+    """Маршруты без сценария."""
+    covered = {scenario.name for scenario in SCENARIOS}
+    return [name for name in url_names if name not in covered]
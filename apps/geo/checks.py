@@ -0,0 +1,52 @@
+"""
+Системные проверки конфигурации (`manage.py check`; также перед `migrate` и `runserver`).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Error, Warning
+
+
+def check_replicas_have_shared_cache(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    # Метка read-your-writes ставится в кэш воркера, принявшего запись; с LocMem следующее
+    # чтение в другом воркере её не увидит и уйдёт в отставшую реплику.
+    if not settings.DB_REPLICAS or settings.CACHE_IS_SHARED:
+        return []
+    return [
+        Error(
+            "DB_REPLICA_HOSTS requires a shared cache backend.",
+            hint="Set CACHE_BACKEND to a shared backend (e.g. DatabaseCache or RedisCache): "
+            "read-your-writes flags are stored in the cache.",
+            id="geo.E001",
+        )
+    ]
+
+
+def check_process_local_caches(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    # Эти функции держат состояние в кэше: с LocMem каждый воркер видит только своё.
+    # Для одного процесса (runserver) это не ошибка.
+    if settings.CACHE_IS_SHARED:
+        return []
+    messages: list[CheckMessage] = []
+    if settings.SLOW_QUERY_SAMPLER:
+        messages.append(
+            Warning(
+                "SLOW_QUERY_SAMPLER keeps samples in a per-process cache.",
+                hint="Each worker has its own buffer; set CACHE_BACKEND to a shared backend "
+                "to see samples from all workers in admin/slow-queries/.",
+                id="geo.W001",
+            )
+        )
+    if settings.TILE_CACHE_TTL > 0:
+        messages.append(
+            Warning(
+                "TILE_CACHE_TTL keeps vector tiles in a per-process cache.",
+                hint="New points invalidate tiles only in the worker that created them; set "
+                "CACHE_BACKEND to a shared backend or TILE_CACHE_TTL=0.",
+                id="geo.W001",
+            )
+        )
+    return messages
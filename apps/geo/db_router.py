@@ -0,0 +1,118 @@
+"""
+Маршрутизация запросов к БД: запись — в primary (`default`), чтение моделей `geo` —
+в реплики (`DB_REPLICAS`).
+
+Read-your-writes: запрос с небезопасным методом (POST, ...) целиком работает с primary,
+а после успешной записи чтения этого пользователя `DB_REPLICA_STICKINESS_SECONDS`
+(+ `SEARCH_CACHE_TTL`) секунд тоже идут в primary (метка в общем кэше, см.
+`ReplicaStickinessMiddleware`; без общего кэша реплики не включаются, см. `checks`).
+Остальные модели (пользователи, blacklist токенов, таблица кэша) всегда читаются из
+primary: отставание реплики там недопустимо.
+"""
+
+from __future__ import annotations
+
+import random
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Model
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject, empty
+
+PRIMARY_DB_ALIAS = "default"
+REPLICA_APP_LABELS = frozenset({"geo"})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_current_request: ContextVar[HttpRequest | None] = ContextVar("geo_db_request", default=None)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        if model._meta.app_label not in REPLICA_APP_LABELS or not settings.DB_REPLICAS:
+            return PRIMARY_DB_ALIAS
+        if reads_pinned_to_primary():
+            return PRIMARY_DB_ALIAS
+        return random.choice(settings.DB_REPLICAS)
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str | None:
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:
+        # Реплики — копии primary: объекты из разных алиасов ссылаются на одни и те же строки.
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        return db == PRIMARY_DB_ALIAS
+
+
+def read_connection(model: type[Model]) -> BaseDatabaseWrapper:
+    """Соединение для raw SQL на чтение — тот же выбор, что у ORM."""
+    return connections[router.db_for_read(model)]
+
+
+def reads_pinned_to_primary() -> bool:
+    """Чтения текущего запроса должны идти в primary (запись в этом запросе или недавно)."""
+    request = _current_request.get()
+    if request is None or not settings.DB_REPLICAS:
+        return False
+    pinned = getattr(request, "_geo_reads_pinned", None)
+    if pinned is not None:
+        return pinned
+    if request.method not in SAFE_METHODS:
+        request._geo_reads_pinned = True
+        return True
+
+    user_id = _authenticated_user_id(request)
+    if user_id is None:
+        # Пользователь ещё не известен (DRF аутентифицирует во view) — решим позже.
+        return False
+    request._geo_reads_pinned = cache.get(_sticky_key(user_id)) is not None
+    return request._geo_reads_pinned
+
+
+def bind_request(request: HttpRequest) -> Any:
+    """Делает `request` текущим для роутера; вернуть токен в `unbind_request`."""
+    return _current_request.set(request)
+
+
+def unbind_request(token: Any) -> None:
+    _current_request.reset(token)
+
+
+def current_request() -> HttpRequest | None:
+    """Запрос, в рамках которого выполняется SQL (для диагностики)."""
+    return _current_request.get()
+
+
+def sticky_cache_entry(request: HttpRequest) -> tuple[str, int] | None:
+    """`(ключ, TTL)` метки read-your-writes после записи в этом запросе, иначе `None`."""
+    if not settings.DB_REPLICAS or not settings.DB_REPLICA_STICKINESS_SECONDS:
+        return None
+    if request.method in SAFE_METHODS:
+        return None
+    user_id = _authenticated_user_id(request)
+    if user_id is None:
+        return None
+    # Пока действует метка, поиск идёт мимо кэша; ответ, закэшированный другим пользователем
+    # с отставшей реплики, живёт до SEARCH_CACHE_TTL — метка должна его пережить.
+    return _sticky_key(user_id), settings.DB_REPLICA_STICKINESS_SECONDS + settings.SEARCH_CACHE_TTL
+
+
+def _authenticated_user_id(request: HttpRequest) -> int | None:
+    # DRF кладёт аутентифицированного пользователя в `HttpRequest.user`. Ленивого пользователя
+    # сессии не вычисляем: ради роутера это был бы лишний запрос к БД.
+    user = request.__dict__.get("user")
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def _sticky_key(user_id: int) -> str:
+    return f"geo:db:sticky:{user_id}"
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+GEOJSON_CONTENT_TYPE = "application/geo+json"
+EVENT_STREAM_CONTENT_TYPE = "text/event-stream"
+# Комментарий SSE: клиент его игнорирует, а прокси не закрывают «молчащее» соединение.
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+Record = dict[str, Any]
+
+
+def iter_ndjson(records: Iterable[Record]) -> Iterator[str]:
+    """Одна JSON-строка на запись; в памяти только текущая запись."""
+    for record in records:
+        yield _dumps(record) + "\n"
+
+
+def iter_geojson(features: Iterable[tuple[Record, tuple[float, float]]]) -> Iterator[str]:
+    """
+    GeoJSON FeatureCollection, собираемый по мере чтения строк.
+
+    Элементы — `(properties, (longitude, latitude))`, порядок осей как в GeoJSON.
+    """
+    yield '{"type":"FeatureCollection","features":['
+    separator = ""
+    for record, (longitude, latitude) in features:
+        feature = {
+            "type": "Feature",
+            "id": record["id"],
+            "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+            "properties": record,
+        }
+        yield separator + _dumps(feature)
+        separator = ","
+    yield "]}\n"
+
+
+def sse_event(record: Record, *, event_id: int | None = None, event: str | None = None) -> str:
+    """Одно событие Server-Sent Events; `id` клиент вернёт в `Last-Event-ID` при переподключении."""
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {_dumps(record)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
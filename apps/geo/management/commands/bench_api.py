@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import platform
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.urls import URLPattern
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.geo.benchmarks.runner import compare_runs, run_scenario
+from apps.geo.benchmarks.scenarios import SCENARIOS, BenchContext, missing_scenarios
+from apps.geo.models.message import Message
+from apps.geo.models.point import Point
+from apps.geo.routers import urls as geo_urls
+
+User = get_user_model()
+
+BENCH_USERNAME = "bench_runner"
+SAMPLED_POINT_IDS = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный прогон всех эндпоинтов apps/geo/routers/urls.py в процессе: p50/p95/p99, "
+        "RPS и число SQL-запросов на запрос в JSON. С --compare сравнивает с прошлым отчётом и "
+        "падает при регрессии. Пишущие сценарии создают данные — только на БД для бенчмарков."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--requests", type=int, default=200, help="Запросов на сценарий.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--radius-km", type=float, default=2.0)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--only", default=None, help="Имена маршрутов через запятую (по умолчанию — все)."
+        )
+        parser.add_argument("--output", type=Path, default=None, help="Файл отчёта (JSON).")
+        parser.add_argument("--compare", type=Path, default=None, help="Отчёт для сравнения.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2, help="Допустимый рост p95 (доля)."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for name in ("requests", "concurrency"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name} must be positive")
+        url_names = [
+            pattern.name for pattern in geo_urls.urlpatterns if isinstance(pattern, URLPattern)
+        ]
+        missing = missing_scenarios(url_names)
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(missing)}")
+        scenarios = SCENARIOS
+        if options["only"]:
+            selected = {name.strip() for name in options["only"].split(",") if name.strip()}
+            unknown = selected - {scenario.name for scenario in SCENARIOS}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = tuple(scenario for scenario in SCENARIOS if scenario.name in selected)
+
+        context = BenchContext(
+            point_ids=list(
+                Point.objects.order_by("-id").values_list("id", flat=True)[:SAMPLED_POINT_IDS]
+            ),
+            radius_km=options["radius_km"],
+        )
+        access_token = RefreshToken.for_user(self._bench_user()).access_token
+        client_defaults = {
+            "HTTP_HOST": self._host(),
+            "HTTP_AUTHORIZATION": f"Bearer {access_token}",
+        }
+
+        meta = self._meta(options)
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(
+                scenario,
+                context=context,
+                client_defaults=client_defaults,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                warmup=options["warmup"],
+                seed=options["seed"],
+            )
+            results.append(result.to_dict())
+            self.stderr.write(
+                f"{result.name}: p50={result.latency_ms['p50']}ms p95={result.latency_ms['p95']}ms "
+                f"p99={result.latency_ms['p99']}ms rps={result.throughput_rps} "
+                f"queries={result.queries_per_request['mean']} errors={result.errors}"
+            )
+            if "429" in result.status_codes:
+                self.stderr.write(
+                    self.style.WARNING(f"{result.name}: throttled, raise THROTTLE_USER")
+                )
+
+        report = {"meta": meta, "scenarios": results}
+        report_json = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"] is not None:
+            options["output"].write_text(report_json + "\n", encoding="utf-8")
+        else:
+            self.stdout.write(report_json)
+
+        if options["compare"] is not None:
+            self._compare(options["compare"], report, threshold=options["threshold"])
+
+    def _compare(self, path: Path, report: dict[str, Any], *, threshold: float) -> None:
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+        rows = compare_runs(baseline, report, threshold=threshold)
+        for row in rows:
+            line = (
+                f"{row['name']}: p95 {row['p95_before_ms']} -> {row['p95_after_ms']}ms "
+                f"({row['p95_change']:+.1%}), queries {row['queries_before']} -> "
+                f"{row['queries_after']}"
+            )
+            self.stderr.write(self.style.ERROR(line) if row["regressed"] else line)
+        regressed = [row["name"] for row in rows if row["regressed"]]
+        if regressed:
+            raise CommandError(f"Regressions: {', '.join(regressed)}")
+
+    @staticmethod
+    def _bench_user() -> User:
+        # staff — для admin/test-users/; пароль не нужен, токен выписывается напрямую.
+        user, _ = User.objects.get_or_create(
+            username=BENCH_USERNAME, defaults={"is_staff": True, "is_superuser": True}
+        )
+        return user
+
+    @staticmethod
+    def _host() -> str:
+        host = next((host for host in settings.ALLOWED_HOSTS if host != "*"), "localhost")
+        return host.lstrip(".")
+
+    @staticmethod
+    def _meta(options: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "started_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "warmup": options["warmup"],
+            "radius_km": options["radius_km"],
+            "seed": options["seed"],
+            "points": Point.objects.count(),
+            "messages": Message.objects.count(),
+            "settings": {
+                "DB_POOL": bool(settings.DATABASES["default"].get("OPTIONS", {}).get("pool")),
+                "DB_REPLICAS": len(settings.DB_REPLICAS),
+                "SEARCH_CACHE_TTL": settings.SEARCH_CACHE_TTL,
+                "POINTS_INDEX_PATH": bool(settings.POINTS_INDEX_PATH),
+            },
+        }
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.geo.repositories import points_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Собирает снимок in-process индекса точек (NumPy) в POINTS_INDEX_PATH и атомарно "
+        "переключает на него воркеры. Запускать периодически (cron) и после удаления точек."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--path", type=Path, default=None)
+        parser.add_argument("--cell-deg", type=float, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        root = options["path"] or settings.POINTS_INDEX_PATH
+        if not root:
+            raise CommandError("POINTS_INDEX_PATH is not set (or pass --path)")
+        if points_index.np is None:
+            raise CommandError("numpy is not installed")
+        cell_deg = options["cell_deg"] or settings.POINTS_INDEX_CELL_DEG
+        if not 0 < cell_deg <= 180:
+            raise CommandError("--cell-deg must be in (0, 180]")
+
+        snapshot_dir = points_index.build_snapshot(Path(root), cell_deg=cell_deg)
+        self.stdout.write(self.style.SUCCESS(f"snapshot={snapshot_dir}"))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from apps.geo.exporters import iter_ndjson
+from apps.geo.services.admin_service import AdminService
+from apps.geo.services.exceptions import InvalidUsernameError, UsernameAlreadyExistsError
+from apps.geo.tokens import issue_token_pairs
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт тестовых пользователей {prefix}1..{prefix}N для нагрузочных прогонов: пароль "
+        "хешируется один раз, вставка — bulk_create. Пишет NDJSON (id, username, access, "
+        "refresh) — готовые токены для генератора нагрузки. Занятые имена пропускаются."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--count", type=int, required=True)
+        parser.add_argument("--prefix", default="load_")
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--no-tokens", action="store_true", help="Без выпуска JWT.")
+        parser.add_argument("--output", type=Path, default=None, help="Файл NDJSON.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for name in ("count", "batch_size"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive")
+        try:
+            validate_password(options["password"])
+        except ValidationError as exc:
+            raise CommandError(f"Invalid --password: {' '.join(exc.messages)}") from exc
+        try:
+            get_user_model().username_validator(options["prefix"])
+        except ValidationError as exc:
+            raise CommandError(f"Invalid --prefix: {' '.join(exc.messages)}") from exc
+
+        usernames = [f"{options['prefix']}{number}" for number in range(1, options["count"] + 1)]
+        service = AdminService()
+        records: list[dict[str, Any]] = []
+        conflicts_total = 0
+        for start in range(0, len(usernames), options["batch_size"]):
+            batch = usernames[start : start + options["batch_size"]]
+            try:
+                with transaction.atomic():
+                    created_users, conflicts = service.create_test_users(
+                        usernames=batch, password=options["password"]
+                    )
+                    tokens = (
+                        [{}] * len(created_users)
+                        if options["no_tokens"]
+                        else issue_token_pairs(created_users)
+                    )
+            except UsernameAlreadyExistsError as exc:
+                raise CommandError(f"Username taken concurrently: {exc.username}") from exc
+            except InvalidUsernameError as exc:
+                raise CommandError(f"Invalid username: {exc.username}") from exc
+            conflicts_total += len(conflicts)
+            records.extend(
+                {"id": user.id, "username": user.username, **user_tokens}
+                for user, user_tokens in zip(created_users, tokens, strict=True)
+            )
+
+        lines = iter_ndjson(records)
+        if options["output"] is not None:
+            with options["output"].open("w", encoding="utf-8") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
+        self.stderr.write(self.style.SUCCESS(f"created={len(records)} conflicts={conflicts_total}"))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.geo.benchmarks.dataset import generate_points, zipf_sampler
+from apps.geo.models.message import Message
+from apps.geo.models.point import Point
+from apps.geo.repositories.messages_repo import MessagesRepository
+from apps.geo.repositories.points_repo import PointsRepository
+
+User = get_user_model()
+
+AUTHOR_USERNAME_PREFIX = "bench_author_"
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетический набор для нагрузочных прогонов: точки вокруг городов, "
+        "Zipf-распределение сообщений на точку. Грузится COPY-ом пачками (транзакция на пачку). "
+        "Запускать на отдельной БД для бенчмарков."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--points", type=int, default=1_000_000)
+        parser.add_argument("--authors", type=int, default=100)
+        parser.add_argument("--spread-km", type=float, default=15.0)
+        parser.add_argument("--background-share", type=float, default=0.05)
+        parser.add_argument("--zipf-exponent", type=float, default=1.3)
+        parser.add_argument("--max-messages-per-point", type=int, default=500)
+        parser.add_argument("--days", type=int, default=30, help="Разброс created_at сообщений.")
+        parser.add_argument("--batch-size", type=int, default=20_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for name in ("points", "authors", "max_messages_per_point", "batch_size", "days"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive")
+        if not 0 <= options["background_share"] <= 1:
+            raise CommandError("--background-share must be in [0, 1]")
+
+        rng = random.Random(options["seed"])
+        author_ids = self._ensure_authors(options["authors"])
+        points = generate_points(
+            rng,
+            count=options["points"],
+            spread_km=options["spread_km"],
+            background_share=options["background_share"],
+        )
+        messages_per_point = zipf_sampler(
+            rng, exponent=options["zipf_exponent"], maximum=options["max_messages_per_point"]
+        )
+        points_repo = PointsRepository()
+        messages_repo = MessagesRepository()
+        now = timezone.now()
+        max_age_seconds = options["days"] * 86400
+
+        started = time.monotonic()
+        points_total = messages_total = 0
+        while batch := list(islice(points, options["batch_size"])):
+            with transaction.atomic():
+                point_ids = points_repo.copy_points(rows=batch)
+                message_rows = [
+                    {
+                        "point_id": point_id,
+                        "author_id": rng.choice(author_ids),
+                        "text": f"bench message {number} on point {point_id}",
+                        "latitude": point["latitude"],
+                        "longitude": point["longitude"],
+                        "created_at": now - timedelta(seconds=rng.uniform(0, max_age_seconds)),
+                    }
+                    for point_id, point in zip(point_ids, batch, strict=True)
+                    for number in range(next(messages_per_point))
+                ]
+                messages_total += messages_repo.copy_messages(rows=message_rows)
+            points_total += len(point_ids)
+            self.stdout.write(f"points={points_total} messages={messages_total}")
+
+        # Свежая статистика планировщика: иначе первые прогоны пойдут по планам для пустых таблиц.
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Point._meta.db_table}, {Message._meta.db_table}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"points={points_total} messages={messages_total} authors={len(author_ids)} "
+                f"seconds={time.monotonic() - started:.1f}"
+            )
+        )
+
+    @staticmethod
+    def _ensure_authors(count: int) -> list[int]:
+        usernames = [f"{AUTHOR_USERNAME_PREFIX}{index}" for index in range(count)]
+        # Авторы только для данных: войти под ними нельзя.
+        unusable_password = make_password(None)
+        User.objects.bulk_create(
+            [User(username=username, password=unusable_password) for username in usernames],
+            ignore_conflicts=True,
+        )
+        return list(
+            User.objects.filter(username__in=usernames).order_by("id").values_list("id", flat=True)
+        )
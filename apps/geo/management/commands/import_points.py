@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from apps.geo.schemas.bulk import validate_bulk_items
+from apps.geo.schemas.points import PointCreateSerializer
+from apps.geo.services.points_service import PointsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Импорт точек из CSV (title,latitude,longitude) или NDJSON. "
+        "Невалидные строки пропускаются и печатаются в stderr, остальное грузится "
+        "одной транзакцией через COPY (или многострочным INSERT)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--method", choices=["copy", "insert"], default="copy")
+        parser.add_argument(
+            "--ids-out",
+            type=Path,
+            default=None,
+            help="Файл, куда записать id по строкам входа (пустая строка — ошибка).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: Path = options["path"]
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        file_format = options["format"] or (
+            "ndjson" if path.suffix in {".ndjson", ".jsonl"} else "csv"
+        )
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be positive")
+
+        service = PointsService()
+        use_copy = options["method"] == "copy"
+        imported = failed = 0
+        ids_by_line: list[int | None] = []
+
+        with path.open(encoding="utf-8", newline="") as source, transaction.atomic():
+            rows = self._read_rows(source, file_format)
+            offset = 0
+            while batch := list(islice(rows, batch_size)):
+                valid_items, errors = validate_bulk_items(PointCreateSerializer, batch)
+                for index, item_errors in errors.items():
+                    self.stderr.write(f"row {offset + index + 1}: {json.dumps(item_errors)}")
+
+                created_ids = service.bulk_create_points(
+                    items=[item for _, item in valid_items], use_copy=use_copy
+                )
+                batch_ids: list[int | None] = [None] * len(batch)
+                for (index, _), point_id in zip(valid_items, created_ids, strict=True):
+                    batch_ids[index] = point_id
+                ids_by_line.extend(batch_ids)
+
+                imported += len(created_ids)
+                failed += len(errors)
+                offset += len(batch)
+
+        if options["ids_out"] is not None:
+            options["ids_out"].write_text(
+                "".join(f"{point_id or ''}\n" for point_id in ids_by_line), encoding="utf-8"
+            )
+        self.stdout.write(self.style.SUCCESS(f"imported={imported} failed={failed}"))
+
+    @staticmethod
+    def _read_rows(source: Any, file_format: str) -> Iterator[dict[str, Any]]:
+        if file_format == "csv":
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = {}
+            yield row if isinstance(row, dict) else {}
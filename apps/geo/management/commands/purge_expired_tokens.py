@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps.geo.repositories.token_blacklist_repo import TokenBlacklistRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет истёкшие токены из OutstandingToken/BlacklistedToken порциями по первичному "
+        "ключу: каждая порция — отдельный короткий оператор, без долгих блокировок. "
+        "Замена flushexpiredtokens для больших таблиц; можно запускать по cron."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--sleep", type=float, default=0.0, help="Пауза между порциями (сек), бережёт реплики."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive")
+        if options["sleep"] < 0:
+            raise CommandError("--sleep must be non-negative")
+
+        repo = TokenBlacklistRepository()
+        # Одна отсечка на весь проход: токены, истёкшие во время работы, — в следующий раз.
+        now = timezone.now()
+        after_id = 0
+        deleted_total = blacklisted_total = 0
+        started = time.monotonic()
+        while True:
+            last_id, deleted, blacklisted = repo.purge_expired_batch(
+                after_id=after_id, limit=options["batch_size"], now=now
+            )
+            if last_id is None:
+                break
+            after_id = last_id
+            deleted_total += deleted
+            blacklisted_total += blacklisted
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"deleted={deleted_total} blacklisted={blacklisted_total} "
+                f"seconds={time.monotonic() - started:.1f}"
+            )
+        )
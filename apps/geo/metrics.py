@@ -0,0 +1,163 @@
+"""
+Метрики запросов: время по маршрутам, число и время SQL, строки из БД, время сериализации
+и аутентификации. Пишутся в Prometheus (`GET /api/metrics/`) и в заголовок `Server-Timing`
+каждого ответа (см. `RequestMetricsMiddleware`).
+
+Под gunicorn с несколькими воркерами задайте `PROMETHEUS_MULTIPROC_DIR` (пустой каталог):
+метрики всех воркеров будут собираться в один ответ.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+UNMATCHED_ROUTE = "unmatched"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+REQUEST_SECONDS = Histogram(
+    "geo_http_request_duration_seconds",
+    "Время обработки запроса",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "geo_http_request_db_queries", "SQL-запросов на запрос", ["route"], buckets=QUERY_COUNT_BUCKETS
+)
+DB_SECONDS = Histogram(
+    "geo_http_request_db_seconds", "Время SQL на запрос", ["route"], buckets=LATENCY_BUCKETS
+)
+DB_ROWS = Histogram(
+    "geo_http_request_db_rows", "Строк прочитано из БД за запрос", ["route"], buckets=ROW_BUCKETS
+)
+PHASE_SECONDS = Histogram(
+    "geo_http_request_phase_seconds",
+    "Время фаз запроса (auth, serialize)",
+    ["route", "phase"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_ERRORS = Counter("geo_db_query_errors", "SQL-запросы, завершившиеся ошибкой", ["route"])
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    db_rows: int = 0
+    db_errors: int = 0
+    phases: dict[str, float] = field(default_factory=dict)
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Значение `Server-Timing`: `total`, `db` (с числом запросов) и фазы, в мс."""
+        entries = [
+            f"total;dur={total_seconds * 1000:.1f}",
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+        ]
+        entries.extend(
+            f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items()
+        )
+        return ", ".join(entries)
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("geo_request_metrics", default=None)
+
+
+def start_request() -> tuple[RequestMetrics, Any]:
+    """Новый сборщик для запроса; токен вернуть в `finish_request`."""
+    request_metrics = RequestMetrics()
+    return request_metrics, _current.set(request_metrics)
+
+
+def finish_request(
+    request_metrics: RequestMetrics, token: Any, *, route: str, method: str, status: int
+) -> float:
+    """Пишет метрики запроса и возвращает его длительность (сек)."""
+    _current.reset(token)
+    total = time.perf_counter() - request_metrics.started
+    REQUEST_SECONDS.labels(route, method, str(status)).observe(total)
+    DB_QUERIES.labels(route).observe(request_metrics.db_queries)
+    DB_SECONDS.labels(route).observe(request_metrics.db_seconds)
+    DB_ROWS.labels(route).observe(request_metrics.db_rows)
+    for phase, seconds in request_metrics.phases.items():
+        PHASE_SECONDS.labels(route, phase).observe(seconds)
+    if request_metrics.db_errors:
+        DB_ERRORS.labels(route).inc(request_metrics.db_errors)
+    return total
+
+
+@contextmanager
+def timed(phase: str, *, exclude_db: bool = False) -> Iterator[None]:
+    """
+    Добавляет время блока к фазе `phase` текущего запроса. `exclude_db` — без SQL внутри
+    блока (ленивый QuerySet, прочитанный при сериализации, уйдёт в `db`, а не в `serialize`).
+    """
+    request_metrics = _current.get()
+    if request_metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    db_seconds_before = request_metrics.db_seconds
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if exclude_db:
+            elapsed -= request_metrics.db_seconds - db_seconds_before
+        request_metrics.phases[phase] = request_metrics.phases.get(phase, 0.0) + max(elapsed, 0.0)
+
+
+def record_query(
+    execute: Callable[..., Any], sql: str, params: Any, many: bool, context: dict[str, Any]
+) -> Any:
+    """`execute_wrapper` соединения: время и строки SQL в метрики текущего запроса."""
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        result = execute(sql, params, many, context)
+    except Exception:
+        request_metrics.db_errors += 1
+        raise
+    finally:
+        request_metrics.db_queries += 1
+        request_metrics.db_seconds += time.perf_counter() - started
+    rowcount = getattr(context["cursor"], "rowcount", -1)
+    if not many and rowcount > 0 and sql.lstrip()[:6].upper() in ("SELECT", "WITH"):
+        request_metrics.db_rows += rowcount
+    return result
+
+
+def install_query_recorder(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Обработчик `connection_created`; с пулом сигнал приходит на каждое соединение — без дублей."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def render_latest() -> bytes:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
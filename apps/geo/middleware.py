@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from apps.geo import metrics
+from apps.geo.db_router import bind_request, sticky_cache_entry, unbind_request
+
+
+class RequestMetricsMiddleware:
+    """
+    Метрики запроса (`apps.geo.metrics`) и заголовок `Server-Timing`:
+    `total`, `db` (время и число SQL), `auth`, `serialize`. Для потоковых ответов
+    `total` — время до начала отдачи тела. Ставится первым в MIDDLEWARE.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]]
+    ) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self._finish(request, request_metrics, token, status=500)
+            raise
+        self._finish(
+            request, request_metrics, token, status=response.status_code, response=response
+        )
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self._finish(request, request_metrics, token, status=500)
+            raise
+        self._finish(
+            request, request_metrics, token, status=response.status_code, response=response
+        )
+        return response
+
+    @staticmethod
+    def _finish(
+        request: HttpRequest,
+        request_metrics: metrics.RequestMetrics,
+        token: Any,
+        *,
+        status: int,
+        response: HttpResponse | None = None,
+    ) -> None:
+        resolver_match = request.resolver_match
+        total = metrics.finish_request(
+            request_metrics,
+            token,
+            route=resolver_match.route if resolver_match else metrics.UNMATCHED_ROUTE,
+            method=request.method or "",
+            status=status,
+        )
+        if response is not None:
+            response["Server-Timing"] = request_metrics.server_timing(total)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Связывает запрос с `PrimaryReplicaRouter` и после успешной записи ставит
+    пользователю метку read-your-writes (его чтения пойдут в primary).
+
+    Работает и под WSGI, и под ASGI (без лишнего перехода между sync и async).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]]
+    ) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = bind_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            unbind_request(token)
+        entry = self._sticky_entry(request, response)
+        if entry is not None:
+            key, timeout = entry
+            cache.set(key, True, timeout=timeout)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = bind_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            unbind_request(token)
+        entry = self._sticky_entry(request, response)
+        if entry is not None:
+            key, timeout = entry
+            await cache.aset(key, True, timeout=timeout)
+        return response
+
+    @staticmethod
+    def _sticky_entry(request: HttpRequest, response: HttpResponse) -> tuple[str, int] | None:
+        if response.status_code >= 400:
+            return None
+        return sticky_cache_entry(request)
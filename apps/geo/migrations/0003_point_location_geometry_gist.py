@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Функциональный GiST-индекс по `location::geometry`.
+
+    Прямоугольные выборки (тайлы, кластеры, bbox) сравнивают точку с
+    lat/lon-прямоугольником на плоскости; для geography рёбра прямоугольника —
+    дуги больших кругов, поэтому такие фильтры идут через geometry.
+    """
+
+    dependencies = [
+        (
+            "geo",
+            "0002_rename_geo_messages_point_created_at_idx_geo_message_point_i_7a2e75_idx_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS geo_points_location_geom_gist "
+                "ON geo_points USING gist ((location::geometry))"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS geo_points_location_geom_gist",
+        ),
+    ]
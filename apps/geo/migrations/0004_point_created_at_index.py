@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Индекс по `created_at`: догрузка новых точек в in-process индекс."""
+
+    dependencies = [
+        ("geo", "0003_point_location_geometry_gist"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="point",
+            index=models.Index(fields=["created_at"], name="geo_points_created_at_idx"),
+        ),
+    ]
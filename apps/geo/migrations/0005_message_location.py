@@ -0,0 +1,32 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Денормализованная `Message.location` (копия `point.location`) и её заполнение.
+
+    Поле пока допускает NULL: ограничение и индексы — в 0006, отдельной транзакцией
+    (ALTER TABLE после UPDATE в той же транзакции упирается в отложенные FK-триггеры).
+    """
+
+    dependencies = [
+        ("geo", "0004_point_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="location",
+            field=django.contrib.gis.db.models.fields.PointField(
+                geography=True, null=True, srid=4326
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "UPDATE geo_messages AS m SET location = p.location "
+                "FROM geo_points AS p WHERE m.point_id = p.id AND m.location IS NULL"
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
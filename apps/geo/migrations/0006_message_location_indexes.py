@@ -0,0 +1,39 @@
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    `Message.location` NOT NULL и индексы для поиска сообщений без JOIN:
+
+    - составной GiST `(location, created_at)` (нужен btree_gist) — радиус и «новые с»;
+    - функциональный GiST по `location::geometry` — прямоугольники (bbox), как у точек в 0003.
+    """
+
+    dependencies = [
+        ("geo", "0005_message_location"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AlterField(
+            model_name="message",
+            name="location",
+            field=django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["location", "created_at"], name="geo_messages_loc_created_gist"
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS geo_messages_location_geom_gist "
+                "ON geo_messages USING gist ((location::geometry))"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS geo_messages_location_geom_gist",
+        ),
+    ]
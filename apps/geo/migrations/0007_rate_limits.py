@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Таблица состояния throttling-а (GCRA). UNLOGGED — без WAL на каждый запрос: при падении
+    БД лимиты просто обнуляются. fillfactor 70 — место под HOT-обновления `tat`.
+    """
+
+    dependencies = [
+        ("geo", "0006_message_location_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateLimit",
+            fields=[
+                ("key", models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ("tat", models.FloatField()),
+            ],
+            options={
+                "db_table": "geo_rate_limits",
+            },
+        ),
+        migrations.RunSQL(
+            "ALTER TABLE geo_rate_limits SET UNLOGGED, SET (fillfactor = 70)",
+            reverse_sql="ALTER TABLE geo_rate_limits SET LOGGED, RESET (fillfactor)",
+        ),
+    ]
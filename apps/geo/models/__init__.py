@@ -1,4 +1,5 @@
 from .message import Message as Message
 from .point import Point as Point
+from .rate_limit import RateLimit as RateLimit
 
-__all__ = ["Message", "Point"]
+__all__ = ["Message", "Point", "RateLimit"]
@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.db import models
+from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GistIndex
 
 from .point import Point
 
@@ -10,8 +11,19 @@ class Message(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="geo_messages"
     )
     text = models.TextField()
+    # Копия `point.location`: гео-поиск сообщений идёт по одной таблице, без JOIN с точками.
+    location = models.PointField(srid=4326, geography=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "geo_messages"
-        indexes = [models.Index(fields=["point", "created_at"])]
+        indexes = [
+            models.Index(fields=["point", "created_at"]),
+            # btree_gist: гео-фильтр и диапазон по created_at одним индексом.
+            GistIndex(fields=["location", "created_at"], name="geo_messages_loc_created_gist"),
+        ]
+
+    def save(self, *args, **kwargs) -> None:
+        if self.location is None and self.point_id is not None:
+            self.location = self.point.location
+        super().save(*args, **kwargs)
@@ -9,7 +9,10 @@ class Point(models.Model):
 
     class Meta:
         db_table = "geo_points"
-        indexes = [GistIndex(fields=["location"])]
+        indexes = [
+            GistIndex(fields=["location"]),
+            models.Index(fields=["created_at"], name="geo_points_created_at_idx"),
+        ]
 
     @property
     def latitude(self) -> float:
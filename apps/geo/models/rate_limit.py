@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class RateLimit(models.Model):
+    """
+    Состояние GCRA на ключ throttling-а: одно число — теоретическое время прихода (TAT)
+    следующего запроса, секунды эпохи по часам БД. Пишется только raw SQL из
+    `RateLimitsRepository`.
+    """
+
+    key = models.CharField(max_length=255, primary_key=True)
+    tat = models.FloatField()
+
+    class Meta:
+        db_table = "geo_rate_limits"
@@ -0,0 +1,21 @@
+from typing import Any
+
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Для эндпоинтов с фиксированным бинарным/потоковым форматом ответа (выгрузки, тайлы):
+    `Accept` клиента (например, `application/x-ndjson`) не должен приводить к 406,
+    а ошибки по-прежнему отдаются в JSON.
+    """
+
+    def select_parser(self, request: Request, parsers: list[Any]) -> Any:
+        return parsers[0]
+
+    def select_renderer(
+        self, request: Request, renderers: list[BaseRenderer], format_suffix: str | None = None
+    ) -> tuple[BaseRenderer, str]:
+        return renderers[0], renderers[0].media_type
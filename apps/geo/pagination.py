@@ -1,4 +1,35 @@
-from rest_framework.pagination import PageNumberPagination
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q, QuerySet
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+SEARCH_PAGINATION_PARAMETERS = [
+    OpenApiParameter("page", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
+    OpenApiParameter(
+        "page_size", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False
+    ),
+    OpenApiParameter(
+        "pagination",
+        OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        enum=["cursor"],
+        description="cursor — keyset-пагинация без count (ответ: next, results)",
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+]
 
 
 class StandardPageNumberPagination(PageNumberPagination):
@@ -8,3 +39,178 @@ class StandardPageNumberPagination(PageNumberPagination):
 
     page_size_query_param = "page_size"
     max_page_size = 200
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        """
+        Как `paginate_queryset`, но COUNT(*) и строки страницы читаются async ORM
+        (`Paginator` синхронный и сам их не умеет).
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # `count` — cached_property: подставляем посчитанное значение заранее.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg) from exc
+        self.page.object_list = [row async for row in self.page.object_list]
+        self.request = request
+        return list(self.page)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset-пагинация: следующая страница ищется по ключу последней строки,
+    без COUNT(*) и OFFSET.
+
+    Ключ задаётся атрибутом `cursor_ordering` у view (по умолчанию `("id",)`).
+    Поля ключа вместе должны быть уникальными, поэтому последним идёт `id`.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = StandardPageNumberPagination.page_size_query_param
+    max_page_size = StandardPageNumberPagination.max_page_size
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any]:
+        return self._set_page(list(self._page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any]:
+        """Как `paginate_queryset`, но строки читаются async ORM."""
+        return self._set_page([row async for row in self._page_queryset(queryset, request, view)])
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        last_row = self.page[-1]
+        position = [_row_value(last_row, field) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, _encode_position(position))
+
+    def _page_queryset(self, queryset: QuerySet, request: Request, view: Any) -> QuerySet:
+        """Запрос страницы: `page_size + 1` строк после курсора (лишняя — признак `next`)."""
+        self.request = request
+        self.ordering = tuple(getattr(view, "cursor_ordering", ("id",)))
+        self.page_size = self._get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self._decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+        return queryset[: self.page_size + 1]
+
+    def _set_page(self, rows: list[Any]) -> list[Any]:
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def _get_page_size(self, request: Request) -> int:
+        raw_page_size = request.query_params.get(self.page_size_query_param)
+        default_page_size = StandardPageNumberPagination.page_size or self.max_page_size
+        if raw_page_size is None:
+            return default_page_size
+        try:
+            page_size = int(raw_page_size)
+        except ValueError:
+            return default_page_size
+        if page_size <= 0:
+            return default_page_size
+        return min(page_size, self.max_page_size)
+
+    def _decode_cursor(self, request: Request, queryset: QuerySet) -> list[Any] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw_position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if not isinstance(raw_position, list) or len(raw_position) != len(self.ordering):
+                raise ValueError("cursor length mismatch")
+            meta = queryset.model._meta
+            return [
+                meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, raw_position, strict=True)
+            ]
+        except (binascii.Error, UnicodeEncodeError, ValueError, DjangoValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def _after(self, position: list[Any]) -> Q:
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            equal_prefix = dict(zip(self.ordering[:index], position[:index], strict=True))
+            condition |= Q(**equal_prefix, **{f"{field}__gt": position[index]})
+        return condition
+
+
+class SearchPagination(BasePagination):
+    """
+    Пагинация поисковых эндпоинтов.
+
+    По умолчанию — page-number (совместимость со старыми клиентами);
+    keyset-режим включается параметром `pagination=cursor` или наличием `cursor`.
+    """
+
+    mode_query_param = "pagination"
+    cursor_mode = "cursor"
+
+    def __init__(self) -> None:
+        self._delegate: BasePagination | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        self._delegate = self._select_delegate(request)
+        return self._delegate.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> list[Any] | None:
+        """Для async-view: тот же выбор режима, строки читаются async ORM."""
+        self._delegate = self._select_delegate(request)
+        return await self._delegate.apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return self._delegate.get_paginated_response(data)
+
+    def _select_delegate(
+        self, request: Request
+    ) -> KeysetCursorPagination | StandardPageNumberPagination:
+        if self.is_cursor_request(request):
+            return KeysetCursorPagination()
+        return StandardPageNumberPagination()
+
+    @classmethod
+    def is_cursor_request(cls, request: Request) -> bool:
+        query_params = request.query_params
+        return (
+            query_params.get(cls.mode_query_param) == cls.cursor_mode
+            or KeysetCursorPagination.cursor_query_param in query_params
+        )
+
+
+def _row_value(row: Any, field: str) -> Any:
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+def _encode_position(position: list[Any]) -> str:
+    raw = json.dumps(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in position],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+
+from apps.geo.metrics import timed
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """`JSONRenderer` с замером фазы `serialize` (кодирование ответа в JSON)."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict[str, Any] | None = None,
+    ) -> bytes:
+        with timed("serialize"):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models.functions import GeoFunc
+from django.contrib.gis.geos import Point as GeoPoint
+from django.db.models import BooleanField, FloatField, Func, Value
+
+
+def geography_point(*, latitude: float, longitude: float) -> Value:
+    """Точка-параметр запроса с типом geography (как у `Point.location`)."""
+    center = GeoPoint(longitude, latitude, srid=4326)
+    return Value(center, output_field=GeometryField(srid=4326, geography=True))
+
+
+class Latitude(Func):
+    """`ST_Y(location::geometry)` — широта прямо в SQL, без GEOS-объекта на строку."""
+
+    function = "ST_Y"
+    template = "%(function)s(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+class Longitude(Func):
+    """`ST_X(location::geometry)` — долгота прямо в SQL."""
+
+    function = "ST_X"
+    template = "%(function)s(%(expressions)s::geometry)"
+    output_field = FloatField()
+
+
+class KNNDistance(GeoFunc):
+    """
+    `location <-> center` для geography — расстояние по сфере в метрах.
+
+    В ORDER BY PostGIS обслуживает этот оператор GiST-индексом (KNN-обход),
+    поэтому `ORDER BY ... LIMIT N` стоит O(N), а не O(точек в области).
+    """
+
+    function = ""
+    arg_joiner = " <-> "
+    template = "(%(expressions)s)"
+    geom_param_pos = (0, 1)
+    output_field = FloatField()
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """
+    Прямоугольник в градусах. `min_longitude > max_longitude` означает, что
+    прямоугольник пересекает антимеридиан (например, 170 .. -170).
+    """
+
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+
+    @property
+    def crosses_antimeridian(self) -> bool:
+        return self.min_longitude > self.max_longitude
+
+    def envelopes(self) -> list[tuple[float, float, float, float]]:
+        """`(xmin, ymin, xmax, ymax)` без пересечения антимеридиана (одна или две части)."""
+        if not self.crosses_antimeridian:
+            return [(self.min_longitude, self.min_latitude, self.max_longitude, self.max_latitude)]
+        return [
+            (self.min_longitude, self.min_latitude, 180.0, self.max_latitude),
+            (-180.0, self.min_latitude, self.max_longitude, self.max_latitude),
+        ]
+
+
+def bbox_condition_sql(
+    column_sql: str, bbox: BoundingBox, column_params: Sequence[Any] = ()
+) -> tuple[str, list[Any]]:
+    """
+    `column::geometry && envelope [OR ...]` для raw SQL.
+
+    Использует функциональные индексы `geo_points_location_geom_gist` и
+    `geo_messages_location_geom_gist` (миграции 0003 и 0006).
+    """
+    conditions = []
+    params: list[Any] = []
+    for envelope in bbox.envelopes():
+        conditions.append(f"{column_sql}::geometry && ST_MakeEnvelope(%s, %s, %s, %s, 4326)")
+        params.extend(column_params)
+        params.extend(envelope)
+    return "(" + " OR ".join(conditions) + ")", params
+
+
+class InBoundingBox(Func):
+    """
+    Условие «точка в прямоугольнике» для `QuerySet.filter()`.
+
+    Только пересечение `&&` по индексу, без геодезических вычислений; прямоугольник
+    через антимеридиан превращается в `OR` из двух конвертов.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, expression: Any, bbox: BoundingBox) -> None:
+        super().__init__(expression)
+        self.bbox = bbox
+
+    def as_sql(self, compiler: Any, connection: Any, **extra_context: Any) -> tuple[str, list]:
+        column_sql, column_params = compiler.compile(self.source_expressions[0])
+        return bbox_condition_sql(column_sql, self.bbox, column_params)
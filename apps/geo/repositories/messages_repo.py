@@ -1,26 +1,162 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+from typing import Any
+
 from django.contrib.auth import get_user_model
 from django.contrib.gis.geos import Point as GeoPoint
 from django.contrib.gis.measure import D
-from django.db.models import QuerySet
+from django.db import connection
+from django.db.models import Count, Exists, F, Max, OuterRef, QuerySet
 
+from apps.geo.db_router import PRIMARY_DB_ALIAS
 from apps.geo.models.message import Message
 from apps.geo.models.point import Point
+from apps.geo.repositories.expressions import (
+    BoundingBox,
+    InBoundingBox,
+    KNNDistance,
+    geography_point,
+)
 
 User = get_user_model()
 
 
+def message_rows(queryset: QuerySet[Message]) -> QuerySet[dict[str, Any]]:
+    """
+    Проекция для ответов поиска: `author_username` берётся JOIN-ом в том же запросе,
+    без экземпляров `Message`/`Point`/`User`.
+    """
+    return queryset.values(
+        "id", "point_id", "text", "created_at", author_username=F("author__username")
+    )
+
+
 class MessagesRepository:
     def create_message(self, *, point: Point, author: User, text: str) -> Message:
-        return Message.objects.create(point=point, author=author, text=text)
+        return Message.objects.create(
+            point=point, author=author, text=text, location=point.location
+        )
+
+    async def acreate_message(self, *, point: Point, author: User, text: str) -> Message:
+        return await Message.objects.acreate(
+            point=point, author=author, text=text, location=point.location
+        )
+
+    def bulk_create_messages(
+        self,
+        *,
+        author: User,
+        rows: Sequence[tuple[int, str]],
+        point_locations: Mapping[int, tuple[float, float]],
+    ) -> list[Message]:
+        """
+        Один многострочный INSERT для пар `(point_id, text)`; `point_locations` —
+        `{point_id: (lat, lon)}` для копии координат точки в сообщении.
+        """
+        messages = [
+            Message(
+                point_id=point_id,
+                author=author,
+                text=text,
+                location=GeoPoint(
+                    point_locations[point_id][1], point_locations[point_id][0], srid=4326
+                ),
+            )
+            for point_id, text in rows
+        ]
+        return Message.objects.bulk_create(messages)
+
+    def copy_messages(self, *, rows: Sequence[dict[str, Any]]) -> int:
+        """
+        Загрузка через COPY FROM STDIN для синтетических данных. Строки —
+        `{point_id, author_id, text, latitude, longitude, created_at}`, координаты — копия
+        точки. Вызывать внутри транзакции; возвращает число строк.
+        """
+        if not rows:
+            return 0
+        table = Message._meta.db_table
+        copy_sql = f"COPY {table} (point_id, author_id, text, location, created_at) FROM STDIN"
+        with connection.cursor() as cursor, cursor.copy(copy_sql) as copy:
+            for row in rows:
+                location_ewkt = f"SRID=4326;POINT({row['longitude']!r} {row['latitude']!r})"
+                copy.write_row(
+                    (
+                        row["point_id"],
+                        row["author_id"],
+                        row["text"],
+                        location_ewkt,
+                        row["created_at"],
+                    )
+                )
+        return len(rows)
+
+    def get_message_rows(self, *, message_ids: Sequence[int]) -> list[dict[str, Any]]:
+        # Из primary: вызывается сразу после коммита, реплика может ещё не догнать.
+        return list(
+            message_rows(
+                Message.objects.using(PRIMARY_DB_ALIAS).filter(id__in=message_ids).order_by("id")
+            )
+        )
 
     def search_messages_within_radius(
-        self, *, latitude: float, longitude: float, radius_km: float
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since_id: int | None = None,
+    ) -> QuerySet[dict[str, Any]]:
+        return message_rows(
+            self._within_radius(
+                latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+            ).order_by("id")
+        )
+
+    def summarize_messages_within_radius(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        using: str,
+        since_id: int | None = None,
+    ) -> dict[str, int | None]:
+        """`{"count", "newest_id"}` без строк и JOIN — только GiST-индекс `geo_messages`."""
+        return (
+            self._within_radius(
+                latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+            )
+            .using(using)
+            .aggregate(count=Count("id"), newest_id=Max("id"))
+        )
+
+    def search_messages_in_bbox(self, *, bbox: BoundingBox) -> QuerySet[dict[str, Any]]:
+        return message_rows(Message.objects.filter(InBoundingBox("location", bbox)).order_by("id"))
+
+    @staticmethod
+    def _within_radius(
+        *, latitude: float, longitude: float, radius_km: float, since_id: int | None
     ) -> QuerySet[Message]:
         center = GeoPoint(longitude, latitude, srid=4326)
+        queryset = Message.objects.filter(location__dwithin=(center, D(km=radius_km)))
+        if since_id is not None:
+            queryset = queryset.filter(id__gt=since_id)
+        return queryset
+
+    def find_latest_messages_on_nearest_points(
+        self, *, latitude: float, longitude: float, limit: int
+    ) -> QuerySet[Message]:
+        center = geography_point(latitude=latitude, longitude=longitude)
+        # KNN-обход индекса точек до первых `limit` точек, у которых есть сообщения.
+        nearest_point_ids = (
+            Point.objects.filter(Exists(Message.objects.filter(point=OuterRef("pk"))))
+            .order_by(KNNDistance("location", center))
+            .values("id")[:limit]
+        )
         return (
             Message.objects.select_related("point", "author")
-            .filter(point__location__dwithin=(center, D(km=radius_km)))
-            .order_by("id")
+            .filter(point_id__in=nearest_point_ids)
+            .annotate(distance_m=KNNDistance("point__location", center))
+            .order_by("distance_m", "-created_at", "-id")[:limit]
         )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+
+import psycopg
+from django.db import connection, connections
+from psycopg import sql
+
+from apps.geo.db_router import PRIMARY_DB_ALIAS
+
+# Лимит payload у NOTIFY — 8000 байт; оставляем запас.
+NOTIFY_MAX_PAYLOAD_BYTES = 7900
+
+
+class NotificationsRepository:
+    """Postgres LISTEN/NOTIFY: межпроцессная рассылка событий всем воркерам."""
+
+    def publish(self, *, channel: str, payloads: Sequence[str]) -> None:
+        """
+        NOTIFY в текущей транзакции: слушатели получат события только после коммита
+        (и не получат при откате). Пачка — одним запросом.
+        """
+        if not payloads:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                [channel, list(payloads)],
+            )
+
+    def listen(self, *, channel: str, timeout: float) -> Iterator[str | None]:
+        """
+        Payload-ы событий `channel` и `None` каждые `timeout` секунд (тик для проверок
+        у вызывающего кода).
+
+        Отдельное долгоживущее соединение с primary (не из пула Django): NOTIFY
+        не реплицируется, а соединение занято LISTEN всё время жизни процесса.
+        """
+        params = connections[PRIMARY_DB_ALIAS].get_connection_params()
+        with psycopg.connect(**params, autocommit=True) as listen_connection:
+            listen_connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+            while True:
+                for notify in listen_connection.notifies(timeout=timeout):
+                    yield notify.payload
+                yield None
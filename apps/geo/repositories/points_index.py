@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, overload
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.geo.models.point import Point
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - движок опциональный
+    np = None
+
+logger = logging.getLogger("apps.geo")
+
+SNAPSHOT_FORMAT_VERSION = 1
+CURRENT_LINK_NAME = "current"
+SNAPSHOTS_TO_KEEP = 2
+ARRAY_NAMES = ("ids", "latitudes", "longitudes", "cell_keys", "cell_offsets", "sorted_ids")
+
+MEAN_EARTH_RADIUS_M = 6_371_008.8
+WGS84_A = 6_378_137.0
+WGS84_F = 1 / 298.257223563
+# Расстояние по сфере отличается от расстояния по эллипсоиду WGS84 не больше чем на ~0.56%:
+# всё, что внутри/снаружи круга с таким запасом, решается haversine, остальное — Vincenty.
+SPHERE_ERROR_MARGIN = 0.007
+VINCENTY_MAX_ITERATIONS = 50
+# Консервативные оценки длины градуса (м) для выбора ячеек сетки.
+METERS_PER_DEGREE_LATITUDE = 110_000.0
+METERS_PER_DEGREE_LONGITUDE_AT_EQUATOR = 111_000.0
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    path: Path
+    arrays: dict[str, Any]
+    cell_deg: float
+    columns_total: int
+
+
+class PointsIndex:
+    """
+    In-process индекс точек для поиска в радиусе без SQL.
+
+    Снимок (`build_snapshot`) — каталог `.npy`-массивов, отсортированных по ячейке
+    сетки: id, широта, долгота и смещения ячеек. Массивы открываются через
+    `mmap_mode="r"`, поэтому все gunicorn-воркеры делят одни страницы page cache.
+
+    Точки, созданные после снимка, подтягиваются по `id` больше последнего увиденного и
+    хранятся в небольшом «дельта»-массиве в памяти. id выдаются последовательностью при
+    вставке, поэтому строки долгой транзакции (`import_points`) попадут и после коммита,
+    как бы давно ни был проставлен их `created_at`. Строки, закоммиченные позже строк с
+    бо́льшими id (параллельные короткие транзакции), ловит второе условие — `created_at`
+    не старше `POINTS_INDEX_CATCHUP_OVERLAP_SECONDS`.
+
+    Фильтр совпадает с `ST_DWithin` по geography: haversine отсекает очевидные
+    случаи, а узкая полоса у границы круга досчитывается на эллипсоиде WGS84.
+    Удаление точек индекс не видит — после удалений нужен новый снимок.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._lock = threading.Lock()
+        # Снимок и дельта к нему публикуются одним кортежем: поиск в другом потоке не должен
+        # увидеть новый снимок со старой дельтой (или наоборот).
+        self._state: tuple[_Snapshot | None, tuple[Any, Any, Any]] = (None, _empty_arrays())
+        self._watermark = timezone.now()
+        self._max_id = 0
+        self._delta: dict[int, tuple[float, float]] = {}
+        self._refreshed_at = 0.0
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def search_ids(self, *, latitude: float, longitude: float, radius_km: float) -> Any:
+        """Отсортированный массив id точек не дальше `radius_km` от центра."""
+        self.refresh()
+        radius_m = radius_km * 1000.0
+        snapshot, (delta_ids, delta_latitudes, delta_longitudes) = self._state
+        snapshot_ids = _search_snapshot(
+            snapshot, latitude=latitude, longitude=longitude, radius_m=radius_m
+        )
+        delta_mask = _within(
+            latitude, longitude, delta_latitudes, delta_longitudes, radius_m=radius_m
+        )
+        return np.union1d(snapshot_ids, delta_ids[delta_mask])
+
+    def refresh(self, *, force: bool = False) -> None:
+        """Подхватывает новый снимок и догоняет дельту не чаще `POINTS_INDEX_REFRESH_SECONDS`."""
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < settings.POINTS_INDEX_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if not force and now - self._refreshed_at < settings.POINTS_INDEX_REFRESH_SECONDS:
+                return
+            current = (self._root / CURRENT_LINK_NAME).resolve()
+            snapshot = self._state[0]
+            if snapshot is None or current != snapshot.path:
+                self._load_snapshot(current)
+            self._catch_up()
+            self._refreshed_at = now
+
+    def _load_snapshot(self, snapshot_dir: Path) -> None:
+        meta = json.loads((snapshot_dir / "meta.json").read_text(encoding="utf-8"))
+        if meta["format_version"] != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported points index snapshot: {snapshot_dir}")
+        arrays = {
+            name: np.load(snapshot_dir / f"{name}.npy", mmap_mode="r") for name in ARRAY_NAMES
+        }
+        sorted_ids = arrays["sorted_ids"]
+        self._watermark = datetime.fromisoformat(meta["watermark"])
+        self._max_id = int(sorted_ids[-1]) if len(sorted_ids) else 0
+        self._delta = {}
+        snapshot = _Snapshot(
+            path=snapshot_dir,
+            arrays=arrays,
+            cell_deg=meta["cell_deg"],
+            columns_total=meta["columns_total"],
+        )
+        self._state = (snapshot, _empty_arrays())
+        logger.info("points_index_loaded path=%s count=%s", snapshot_dir, meta["count"])
+
+    def _catch_up(self) -> None:
+        overlap = timedelta(seconds=settings.POINTS_INDEX_CATCHUP_OVERLAP_SECONDS)
+        rows = list(
+            Point.objects.filter(
+                Q(id__gt=self._max_id) | Q(created_at__gte=self._watermark - overlap)
+            ).values_list("id", "location", "created_at")
+        )
+        if not rows:
+            return
+
+        snapshot = self._state[0]
+        candidate_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        in_snapshot = _contains_sorted(snapshot.arrays["sorted_ids"], candidate_ids)
+        added = 0
+        for (point_id, location, _), known in zip(rows, in_snapshot, strict=True):
+            if not known and point_id not in self._delta:
+                self._delta[point_id] = (location.y, location.x)
+                added += 1
+        self._watermark = max(self._watermark, *(row[2] for row in rows))
+        self._max_id = max(self._max_id, int(candidate_ids.max()))
+        if added:
+            self._state = (snapshot, _arrays_from_delta(self._delta))
+            logger.info("points_index_caught_up added=%s delta=%s", added, len(self._delta))
+
+
+class IndexedPointsResult(Sequence):
+    """
+    Результат поиска по индексу для page-number пагинации: `len()` без COUNT(*),
+    строки страницы догружаются из БД по первичному ключу через `fetch_rows`
+    (id -> строки в любом порядке; пропавшие точки просто пропускаются).
+    """
+
+    def __init__(
+        self, point_ids: Any, *, fetch_rows: Callable[[list[int]], Iterable[dict[str, Any]]]
+    ) -> None:
+        self._point_ids = point_ids
+        self._fetch_rows = fetch_rows
+
+    def __len__(self) -> int:
+        return len(self._point_ids)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            page_ids = [int(point_id) for point_id in self._point_ids[index]]
+            rows_by_id = {row["id"]: row for row in self._fetch_rows(page_ids)}
+            return [rows_by_id[point_id] for point_id in page_ids if point_id in rows_by_id]
+        position = range(len(self))[index]
+        rows = self[position : position + 1]
+        if not rows:
+            raise IndexError(index)
+        return rows[0]
+
+
+def build_snapshot(root: Path, *, cell_deg: float, chunk_size: int = 100_000) -> Path:
+    """
+    Собирает новый снимок в `root/snapshot-<ts>/` и атомарно переключает на него
+    ссылку `root/current`. Возвращает каталог снимка.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required to build the points index")
+    columns_total = math.ceil(360.0 / cell_deg)
+    ids, latitudes, longitudes, watermark = _read_points(chunk_size=chunk_size)
+
+    rows = np.floor((latitudes + 90.0) / cell_deg).astype(np.int64)
+    columns = np.floor((longitudes + 180.0) / cell_deg).astype(np.int64) % columns_total
+    keys = rows * columns_total + columns
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    cell_keys, cell_starts = np.unique(keys, return_index=True)
+    arrays = {
+        "ids": ids[order],
+        "latitudes": latitudes[order],
+        "longitudes": longitudes[order],
+        "cell_keys": cell_keys,
+        "cell_offsets": np.append(cell_starts, len(keys)).astype(np.int64),
+        "sorted_ids": np.sort(ids),
+    }
+
+    root.mkdir(parents=True, exist_ok=True)
+    snapshot_dir = root / f"snapshot-{time.time_ns()}"
+    snapshot_dir.mkdir()
+    for name in ARRAY_NAMES:
+        np.save(snapshot_dir / f"{name}.npy", arrays[name])
+    meta = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "cell_deg": cell_deg,
+        "columns_total": columns_total,
+        "count": len(ids),
+        "watermark": watermark.isoformat(),
+    }
+    (snapshot_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    # Новая ссылка рядом и rename поверх старой: воркеры видят либо старый, либо новый снимок.
+    temporary_link = root / f"{CURRENT_LINK_NAME}.{os.getpid()}"
+    temporary_link.unlink(missing_ok=True)
+    temporary_link.symlink_to(snapshot_dir.name)
+    os.replace(temporary_link, root / CURRENT_LINK_NAME)
+    _remove_old_snapshots(root, keep=snapshot_dir)
+    return snapshot_dir
+
+
+_index: PointsIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_points_index() -> PointsIndex | None:
+    """Индекс процесса или `None`, если он не настроен, нет numpy или ещё нет снимка."""
+    global _index
+    root = settings.POINTS_INDEX_PATH
+    if not root or np is None:
+        return None
+    if not (Path(root) / CURRENT_LINK_NAME).exists():
+        return None
+    if _index is None or _index.root != Path(root):
+        with _index_lock:
+            if _index is None or _index.root != Path(root):
+                _index = PointsIndex(Path(root))
+    return _index
+
+
+def _read_points(*, chunk_size: int) -> tuple[Any, Any, Any, datetime]:
+    ids: list[int] = []
+    latitudes: list[float] = []
+    longitudes: list[float] = []
+    # Берём отметку до чтения: всё созданное во время сборки догонит дельта.
+    watermark = timezone.now()
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(
+            f"SELECT id, ST_Y(location::geometry), ST_X(location::geometry) "
+            f"FROM {Point._meta.db_table}"
+        )
+        while batch := cursor.fetchmany(chunk_size):
+            for point_id, latitude, longitude in batch:
+                ids.append(point_id)
+                latitudes.append(latitude)
+                longitudes.append(longitude)
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(latitudes, dtype=np.float64),
+        np.array(longitudes, dtype=np.float64),
+        watermark,
+    )
+
+
+def _remove_old_snapshots(root: Path, *, keep: Path) -> None:
+    # Уже открытые через mmap файлы остаются доступны процессам и после удаления.
+    snapshots = sorted(root.glob("snapshot-*"), key=lambda path: path.name)
+    for snapshot_dir in snapshots[:-SNAPSHOTS_TO_KEEP]:
+        if snapshot_dir != keep:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+
+def _search_snapshot(
+    snapshot: _Snapshot, *, latitude: float, longitude: float, radius_m: float
+) -> Any:
+    arrays = snapshot.arrays
+    slices = []
+    for row, first_column, last_column in _cell_ranges(
+        snapshot, latitude=latitude, longitude=longitude, radius_m=radius_m
+    ):
+        first_key = row * snapshot.columns_total + first_column
+        last_key = row * snapshot.columns_total + last_column
+        start_cell = np.searchsorted(arrays["cell_keys"], first_key)
+        end_cell = np.searchsorted(arrays["cell_keys"], last_key, side="right")
+        if start_cell < end_cell:
+            start, end = arrays["cell_offsets"][start_cell], arrays["cell_offsets"][end_cell]
+            slices.append(np.arange(start, end))
+    if not slices:
+        return np.empty(0, dtype=np.int64)
+
+    positions = np.concatenate(slices)
+    mask = _within(
+        latitude,
+        longitude,
+        arrays["latitudes"][positions],
+        arrays["longitudes"][positions],
+        radius_m=radius_m,
+    )
+    return arrays["ids"][positions[mask]]
+
+
+def _cell_ranges(
+    snapshot: _Snapshot, *, latitude: float, longitude: float, radius_m: float
+) -> Iterator[tuple[int, int, int]]:
+    """`(row, first_column, last_column)` ячеек, покрывающих круг поиска."""
+    cell_deg, columns_total = snapshot.cell_deg, snapshot.columns_total
+    delta_lat = radius_m / METERS_PER_DEGREE_LATITUDE
+    min_lat = max(-90.0, latitude - delta_lat)
+    max_lat = min(90.0, latitude + delta_lat)
+
+    column_ranges = [(0, columns_total - 1)]
+    widest_lat = max(abs(min_lat), abs(max_lat))
+    if widest_lat < 90.0:
+        delta_lon = radius_m / (
+            METERS_PER_DEGREE_LONGITUDE_AT_EQUATOR * math.cos(math.radians(widest_lat))
+        )
+        first = math.floor((longitude - delta_lon + 180.0) / cell_deg)
+        last = math.floor((longitude + delta_lon + 180.0) / cell_deg)
+        if last - first + 1 < columns_total:
+            first %= columns_total
+            last %= columns_total
+            if first <= last:
+                column_ranges = [(first, last)]
+            else:  # через антимеридиан
+                column_ranges = [(first, columns_total - 1), (0, last)]
+
+    for row in range(_row_of(min_lat, cell_deg), _row_of(max_lat, cell_deg) + 1):
+        for first_column, last_column in column_ranges:
+            yield row, first_column, last_column
+
+
+def _contains_sorted(sorted_values: Any, values: Any) -> Any:
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+def _row_of(latitude: float, cell_deg: float) -> int:
+    return math.floor((latitude + 90.0) / cell_deg)
+
+
+def _empty_arrays() -> tuple[Any, Any, Any]:
+    return (
+        np.empty(0, dtype=np.int64),
+        np.empty(0, dtype=np.float64),
+        np.empty(0, dtype=np.float64),
+    )
+
+
+def _arrays_from_delta(delta: dict[int, tuple[float, float]]) -> tuple[Any, Any, Any]:
+    ids = np.fromiter(delta.keys(), dtype=np.int64, count=len(delta))
+    coordinates = np.array(list(delta.values()), dtype=np.float64).reshape(-1, 2)
+    return ids, coordinates[:, 0], coordinates[:, 1]
+
+
+def _within(
+    latitude: float, longitude: float, latitudes: Any, longitudes: Any, *, radius_m: float
+) -> Any:
+    """Маска «расстояние по эллипсоиду WGS84 <= radius_m», как у `ST_DWithin(geography)`."""
+    sphere_distances = _haversine_m(latitude, longitude, latitudes, longitudes)
+    mask = sphere_distances <= radius_m * (1 - SPHERE_ERROR_MARGIN)
+    border = ~mask & (sphere_distances <= radius_m * (1 + SPHERE_ERROR_MARGIN))
+    if border.any():
+        mask[border] = (
+            _vincenty_m(latitude, longitude, latitudes[border], longitudes[border]) <= radius_m
+        )
+    return mask
+
+
+def _haversine_m(latitude: float, longitude: float, latitudes: Any, longitudes: Any) -> Any:
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = np.radians(longitudes - longitude) / 2
+    h = np.sin(half_dlat) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(half_dlon) ** 2
+    return 2 * MEAN_EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def _vincenty_m(latitude: float, longitude: float, latitudes: Any, longitudes: Any) -> Any:
+    """Обратная задача Винсенти на эллипсоиде WGS84 (точность — доли миллиметра)."""
+    semi_minor = (1 - WGS84_F) * WGS84_A
+    lon_diff = np.radians((longitudes - longitude + 180.0) % 360.0 - 180.0)
+    reduced_1 = math.atan((1 - WGS84_F) * math.tan(math.radians(latitude)))
+    reduced_2 = np.arctan((1 - WGS84_F) * np.tan(np.radians(latitudes)))
+    sin_u1, cos_u1 = math.sin(reduced_1), math.cos(reduced_1)
+    sin_u2, cos_u2 = np.sin(reduced_2), np.cos(reduced_2)
+
+    lam = lon_diff
+    for _ in range(VINCENTY_MAX_ITERATIONS):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        sin_alpha = np.divide(
+            cos_u1 * cos_u2 * sin_lam,
+            sin_sigma,
+            out=np.zeros_like(sin_sigma),
+            where=sin_sigma != 0,
+        )
+        cos2_alpha = 1 - sin_alpha**2
+        # На экваториальной линии cos²α = 0, и по соглашению cos(2σm) = 0.
+        cos_2sigma_m = np.where(
+            cos2_alpha != 0,
+            cos_sigma
+            - np.divide(
+                2 * sin_u1 * sin_u2,
+                cos2_alpha,
+                out=np.zeros_like(cos2_alpha),
+                where=cos2_alpha != 0,
+            ),
+            0.0,
+        )
+        c = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+        previous_lam = lam
+        lam = lon_diff + (1 - c) * WGS84_F * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m**2))
+        )
+        if np.all(np.abs(lam - previous_lam) < 1e-12):
+            break
+
+    u2 = cos2_alpha * (WGS84_A**2 - semi_minor**2) / semi_minor**2
+    a = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    b = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = (
+        b
+        * sin_sigma
+        * (
+            cos_2sigma_m
+            + b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m**2)
+                - b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sigma_m**2)
+            )
+        )
+    )
+    return semi_minor * a * (sigma - delta_sigma)
@@ -1,10 +1,43 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from django.conf import settings
 from django.contrib.gis.geos import Point as GeoPoint
 from django.contrib.gis.measure import D
+from django.db import connection
 from django.db.models import QuerySet
+from django.utils import timezone
 
+from apps.geo.db_router import read_connection
 from apps.geo.models.point import Point
+from apps.geo.repositories.expressions import (
+    BoundingBox,
+    InBoundingBox,
+    KNNDistance,
+    Latitude,
+    Longitude,
+    bbox_condition_sql,
+    geography_point,
+)
+from apps.geo.repositories.points_index import IndexedPointsResult, get_points_index
+
+BULK_INSERT_BATCH_SIZE = 1000
+
+
+def point_rows(queryset: QuerySet[Point]) -> QuerySet[dict[str, Any]]:
+    """
+    Проекция для ответов поиска: ключи как у `PointResponseSerializer`, координаты
+    считаются в SQL — без экземпляров модели и GEOS-объектов на строку.
+    """
+    return queryset.values(
+        "id",
+        "title",
+        "created_at",
+        latitude=Latitude("location"),
+        longitude=Longitude("location"),
+    )
 
 
 class PointsRepository:
@@ -12,11 +45,142 @@ class PointsRepository:
         location = GeoPoint(longitude, latitude, srid=4326)
         return Point.objects.create(title=title, location=location)
 
+    async def acreate_point(self, *, title: str | None, latitude: float, longitude: float) -> Point:
+        location = GeoPoint(longitude, latitude, srid=4326)
+        return await Point.objects.acreate(title=title, location=location)
+
+    def bulk_create_points(self, *, rows: Sequence[dict[str, Any]]) -> list[int]:
+        """Многострочный INSERT ... RETURNING id; id возвращаются в порядке `rows`."""
+        points = [
+            Point(
+                title=row["title"],
+                location=GeoPoint(row["longitude"], row["latitude"], srid=4326),
+            )
+            for row in rows
+        ]
+        created_points = Point.objects.bulk_create(points, batch_size=BULK_INSERT_BATCH_SIZE)
+        return [point.id for point in created_points]
+
+    def copy_points(self, *, rows: Sequence[dict[str, Any]]) -> list[int]:
+        """
+        Загрузка через COPY FROM STDIN. COPY не умеет RETURNING, поэтому id заранее
+        резервируются из последовательности таблицы. Вызывать внутри транзакции.
+        """
+        if not rows:
+            return []
+        table = Point._meta.db_table
+        created_at = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [table, len(rows)],
+            )
+            point_ids = [row[0] for row in cursor.fetchall()]
+            copy_sql = f"COPY {table} (id, title, location, created_at) FROM STDIN"
+            with cursor.copy(copy_sql) as copy:
+                for point_id, row in zip(point_ids, rows, strict=True):
+                    location_ewkt = f"SRID=4326;POINT({row['longitude']!r} {row['latitude']!r})"
+                    copy.write_row((point_id, row["title"], location_ewkt, created_at))
+        return point_ids
+
     def get_point_by_id(self, *, point_id: int) -> Point | None:
         return Point.objects.filter(id=point_id).first()
 
+    async def aget_point_by_id(self, *, point_id: int) -> Point | None:
+        return await Point.objects.filter(id=point_id).afirst()
+
+    def get_point_locations(self, *, point_ids: Iterable[int]) -> dict[int, tuple[float, float]]:
+        """`{id: (lat, lon)}` для существующих точек из `point_ids`."""
+        rows = Point.objects.filter(id__in=list(point_ids)).values_list("id", "location")
+        return {point_id: (location.y, location.x) for point_id, location in rows}
+
     def search_points_within_radius(
         self, *, latitude: float, longitude: float, radius_km: float
-    ) -> QuerySet[Point]:
+    ) -> QuerySet[dict[str, Any]]:
         center = GeoPoint(longitude, latitude, srid=4326)
-        return Point.objects.filter(location__dwithin=(center, D(km=radius_km))).order_by("id")
+        return point_rows(
+            Point.objects.filter(location__dwithin=(center, D(km=radius_km))).order_by("id")
+        )
+
+    def search_points_within_radii(
+        self, *, probes: Sequence[tuple[float, float, float]], limit: int
+    ) -> list[Point]:
+        """
+        Все центры `(lat, lon, radius_km)` одним запросом: `VALUES` со списком центров и
+        `LATERAL`-подзапрос с `ST_DWithin` и `LIMIT` на каждый. У точек есть атрибут
+        `probe_index`; порядок — по центру, затем по id.
+        """
+        if not probes:
+            return []
+        values_sql = ", ".join(["(%s, %s::float8, %s::float8, %s::float8)"] * len(probes))
+        params: list[Any] = []
+        for index, (latitude, longitude, radius_km) in enumerate(probes):
+            params.extend([index, latitude, longitude, radius_km * 1000.0])
+        table = Point._meta.db_table
+        sql = f"""
+            SELECT p.id, p.title, p.location, p.created_at, probe.probe_index
+            FROM (VALUES {values_sql}) AS probe (probe_index, latitude, longitude, radius_m)
+            CROSS JOIN LATERAL (
+                SELECT id, title, location, created_at
+                FROM {table}
+                WHERE ST_DWithin(
+                    location,
+                    ST_SetSRID(ST_MakePoint(probe.longitude, probe.latitude), 4326)::geography,
+                    probe.radius_m
+                )
+                ORDER BY id
+                LIMIT %s
+            ) AS p
+            ORDER BY probe.probe_index, p.id
+        """
+        return list(Point.objects.raw(sql, [*params, limit]))
+
+    def search_points_within_radius_indexed(
+        self, *, latitude: float, longitude: float, radius_km: float
+    ) -> IndexedPointsResult | None:
+        """
+        Тот же поиск через in-process индекс (`POINTS_INDEX_PATH`), отсортированный по id.
+        `None` — индекс не настроен или радиус слишком большой для него.
+        """
+        if radius_km > settings.POINTS_INDEX_MAX_RADIUS_KM:
+            return None
+        points_index = get_points_index()
+        if points_index is None:
+            return None
+        return IndexedPointsResult(
+            points_index.search_ids(latitude=latitude, longitude=longitude, radius_km=radius_km),
+            fetch_rows=lambda point_ids: point_rows(Point.objects.filter(id__in=point_ids)),
+        )
+
+    def search_points_in_bbox(self, *, bbox: BoundingBox) -> QuerySet[dict[str, Any]]:
+        return point_rows(Point.objects.filter(InBoundingBox("location", bbox)).order_by("id"))
+
+    def find_nearest_points(
+        self, *, latitude: float, longitude: float, limit: int
+    ) -> QuerySet[Point]:
+        center = geography_point(latitude=latitude, longitude=longitude)
+        return Point.objects.annotate(distance_m=KNNDistance("location", center)).order_by(
+            "distance_m", "id"
+        )[:limit]
+
+    def cluster_points_in_bbox(
+        self, *, bbox: BoundingBox, grid_size_deg: float, limit: int
+    ) -> list[dict[str, Any]]:
+        """Одна строка на ячейку сетки `grid_size_deg`: count, центроид, пример id."""
+        bbox_sql, bbox_params = bbox_condition_sql("p.location", bbox)
+        sql = f"""
+            SELECT
+                COUNT(*) AS count,
+                ST_Y(ST_Centroid(ST_Collect(p.location::geometry))) AS latitude,
+                ST_X(ST_Centroid(ST_Collect(p.location::geometry))) AS longitude,
+                MIN(p.id) AS sample_id
+            FROM {Point._meta.db_table} AS p
+            WHERE {bbox_sql}
+            GROUP BY ST_SnapToGrid(p.location::geometry, %s)
+            ORDER BY count DESC, sample_id
+            LIMIT %s
+        """
+        with read_connection(Point).cursor() as cursor:
+            cursor.execute(sql, [*bbox_params, grid_size_deg, limit])
+            columns = [column.name for column in cursor.description]
+            return [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
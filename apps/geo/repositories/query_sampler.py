@@ -0,0 +1,208 @@
+"""
+Сэмплер медленных гео-запросов (`SLOW_QUERY_SAMPLER=1`).
+
+SELECT по `geo_points`/`geo_messages`, выполнявшийся дольше `SLOW_QUERY_THRESHOLD_MS`,
+с вероятностью `SLOW_QUERY_SAMPLE_RATE` (и не чаще раза в `SLOW_QUERY_MIN_INTERVAL_SECONDS`
+на процесс) повторяется как `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` на том же соединении —
+план с той же реплики и с теми же параметрами. План, параметры и тайминги кладутся в
+кольцевой буфер в кэше Django (`SlowQueryLog`). Все воркеры видят его только с общим
+`CACHE_BACKEND`; с LocMem (по умолчанию) буфер у каждого процесса свой (см. `geo.W001`).
+
+EXPLAIN ANALYZE выполняет запрос повторно, поэтому сэмплированный запрос пользователя
+дольше примерно вдвое — отсюда вероятность и минимальный интервал. По той же причине
+запросы с побочными эффектами (`nextval`/`setval`, блокировки `FOR UPDATE`/`FOR SHARE`,
+изменяющие CTE) не сэмплируются: повтор израсходовал бы значения последовательности или
+взял бы блокировки ещё раз.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils import timezone
+
+from apps.geo.db_router import current_request
+
+logger = logging.getLogger("apps.geo")
+
+SPATIAL_QUERY_RE = re.compile(r'^\s*(SELECT|WITH)\b.*"?(geo_points|geo_messages)"?', re.I | re.S)
+SIDE_EFFECT_RE = re.compile(
+    r"\b(nextval|setval|INSERT|UPDATE|DELETE|FOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE))\b",
+    re.I,
+)
+CACHE_KEY_PREFIX = "geo:slowq"
+# Записи буфера живут не дольше суток: буфер для разбора свежих проблем, не архив.
+ENTRY_TTL_SECONDS = 86400
+
+
+class SlowQueryLog:
+    """
+    Кольцевой буфер на `SLOW_QUERY_BUFFER_SIZE` записей поверх Django cache: номер записи —
+    `cache.incr` общего счётчика, слот — номер по модулю размера (старые перезаписываются).
+    """
+
+    def append(self, entry: dict[str, Any]) -> int:
+        sequence = self._next_sequence()
+        cache.set(
+            self._slot_key(sequence % settings.SLOW_QUERY_BUFFER_SIZE),
+            {**entry, "id": sequence},
+            timeout=ENTRY_TTL_SECONDS,
+        )
+        return sequence
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Записи буфера, новые первыми."""
+        keys = [self._slot_key(slot) for slot in range(settings.SLOW_QUERY_BUFFER_SIZE)]
+        return sorted(cache.get_many(keys).values(), key=lambda entry: entry["id"], reverse=True)
+
+    def clear(self) -> None:
+        cache.delete_many([self._slot_key(slot) for slot in range(settings.SLOW_QUERY_BUFFER_SIZE)])
+
+    @staticmethod
+    def _next_sequence() -> int:
+        key = f"{CACHE_KEY_PREFIX}:seq"
+        cache.add(key, 0, timeout=None)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Счётчик вытеснен между add и incr — начинаем заново.
+            cache.set(key, 1, timeout=None)
+            return 1
+
+    @staticmethod
+    def _slot_key(slot: int) -> str:
+        return f"{CACHE_KEY_PREFIX}:slot:{slot}"
+
+
+class QuerySampler:
+    """`execute_wrapper` соединения (см. `install_query_sampler`)."""
+
+    def __init__(self, *, log: SlowQueryLog | None = None) -> None:
+        self._log = log or SlowQueryLog()
+        self._last_sampled = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        if not settings.SLOW_QUERY_SAMPLER or many:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if (
+            duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+            and is_sampleable(sql)
+            and self._take_sample()
+        ):
+            self._explain(context["connection"], sql, params, duration_ms=duration_ms)
+        return result
+
+    def _take_sample(self) -> bool:
+        if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sampled < settings.SLOW_QUERY_MIN_INTERVAL_SECONDS:
+                return False
+            self._last_sampled = now
+            return True
+
+    def _explain(
+        self, connection: BaseDatabaseWrapper, sql: str, params: Any, *, duration_ms: float
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            # Курсор драйвера, минуя execute_wrappers Django. transaction(): внутри
+            # atomic — SAVEPOINT, ошибка EXPLAIN не ломает транзакцию запроса.
+            raw_connection = connection.connection
+            with raw_connection.transaction(), raw_connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+                explain = cursor.fetchone()[0]
+        except Exception:
+            logger.exception("slow_query_explain_failed alias=%s", connection.alias)
+            return
+        explain = json.loads(explain) if isinstance(explain, str) else explain
+        plan = explain[0]
+        request = current_request()
+        resolver_match = getattr(request, "resolver_match", None)
+        entry = {
+            "captured_at": timezone.now().isoformat(),
+            "route": resolver_match.route if resolver_match else None,
+            "database": connection.alias,
+            "sql": sql,
+            "params": _jsonable_params(params),
+            "duration_ms": round(duration_ms, 3),
+            "explain_ms": round((time.perf_counter() - started) * 1000, 3),
+            "planning_ms": plan.get("Planning Time"),
+            "execution_ms": plan.get("Execution Time"),
+            **summarize_plan(plan["Plan"]),
+            "plan": plan,
+        }
+        sequence = self._log.append(entry)
+        logger.warning(
+            "slow_query_sampled id=%s route=%s duration_ms=%.1f indexes=%s seq_scans=%s",
+            sequence,
+            entry["route"],
+            duration_ms,
+            ",".join(entry["indexes"]) or "-",
+            ",".join(entry["seq_scans"]) or "-",
+        )
+
+
+def is_sampleable(sql: str) -> bool:
+    """Гео-SELECT без побочных эффектов — его можно безопасно повторить под EXPLAIN ANALYZE."""
+    return SPATIAL_QUERY_RE.match(sql) is not None and SIDE_EFFECT_RE.search(sql) is None
+
+
+def summarize_plan(plan: dict[str, Any]) -> dict[str, list[str]]:
+    """Какие индексы использованы и какие таблицы читались последовательным сканом."""
+    indexes: list[str] = []
+    seq_scans: list[str] = []
+    for node in _walk(plan):
+        index_name = node.get("Index Name")
+        if index_name and index_name not in indexes:
+            indexes.append(index_name)
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") not in seq_scans:
+            seq_scans.append(node.get("Relation Name"))
+    return {"indexes": indexes, "seq_scans": seq_scans}
+
+
+_sampler = QuerySampler()
+
+
+def install_query_sampler(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Обработчик `connection_created` (только PostgreSQL, без дублей при пуле)."""
+    if connection.vendor == "postgresql" and _sampler not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sampler)
+
+
+def _walk(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def _jsonable_params(params: Any) -> list[Any]:
+    if params is None:
+        return []
+    values = params.values() if isinstance(params, dict) else params
+    return [
+        value if isinstance(value, int | float | str | bool | type(None)) else str(value)
+        for value in values
+    ]
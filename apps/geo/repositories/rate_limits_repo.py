@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.db import connections
+
+from apps.geo.db_router import PRIMARY_DB_ALIAS
+
+# GCRA одним запросом: ключ без строки — первый запрос (вставка), иначе TAT сдвигается на
+# интервал, только если новый TAT не уходит за `now + tolerance`. Строку блокирует сам
+# ON CONFLICT, поэтому конкурентные воркеры не теряют обновлений. Время — часы БД, общие
+# для всех воркеров. Второй столбец — TAT из снимка запроса для Retry-After при отказе.
+ACQUIRE_SQL = """
+WITH clock AS (SELECT extract(epoch FROM clock_timestamp())::float8 AS now),
+acquired AS (
+    INSERT INTO geo_rate_limits AS state (key, tat)
+    SELECT %(key)s, clock.now + %(interval)s FROM clock
+    ON CONFLICT (key) DO UPDATE
+        SET tat = GREATEST(state.tat + %(interval)s, EXCLUDED.tat)
+        WHERE GREATEST(state.tat + %(interval)s, EXCLUDED.tat) - EXCLUDED.tat
+            <= %(tolerance)s - %(interval)s
+    RETURNING 1
+)
+SELECT
+    EXISTS (SELECT 1 FROM acquired),
+    (SELECT state.tat FROM geo_rate_limits AS state WHERE state.key = %(key)s) - clock.now
+FROM clock
+"""
+
+PURGE_SQL = """
+DELETE FROM geo_rate_limits
+WHERE ctid IN (
+    SELECT ctid FROM geo_rate_limits
+    WHERE tat < extract(epoch FROM clock_timestamp())
+    LIMIT %s
+)
+"""
+
+
+class RateLimitsRepository:
+    """Состояние GCRA в `geo_rate_limits` на primary (таблица UNLOGGED, на репликах её нет)."""
+
+    def acquire(self, *, key: str, interval: float, tolerance: float) -> float | None:
+        """`None` — запрос разрешён, иначе секунды до следующей попытки."""
+        with connections[PRIMARY_DB_ALIAS].cursor() as cursor:
+            cursor.execute(ACQUIRE_SQL, {"key": key, "interval": interval, "tolerance": tolerance})
+            allowed, lag = cursor.fetchone()
+        if allowed:
+            return None
+        if lag is None:
+            # Строку вставил конкурент после снимка запроса — точного TAT нет.
+            return interval
+        return max(lag + interval - tolerance, 0.0)
+
+    def purge_expired(self, *, limit: int) -> int:
+        """Удаляет до `limit` строк с TAT в прошлом: они равносильны отсутствию строки."""
+        with connections[PRIMARY_DB_ALIAS].cursor() as cursor:
+            cursor.execute(PURGE_SQL, [limit])
+            return cursor.rowcount
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from django.db import connection
+
+from apps.geo.models.point import Point
+
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+
+# Фильтр `location::geometry && ...` обслуживается индексом geo_points_location_geom_gist.
+# Границы тайла Web Mercator в EPSG:4326 — ровно lat/lon-прямоугольник.
+POINTS_TILE_SQL = f"""
+WITH bounds AS (
+    SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+),
+mvt_rows AS (
+    SELECT
+        ST_AsMVTGeom(
+            ST_Transform(p.location::geometry, 3857), bounds.geom, %(extent)s, %(buffer)s
+        ) AS geom,
+        p.id,
+        p.title
+    FROM {Point._meta.db_table} AS p, bounds
+    WHERE p.location::geometry && ST_Transform(bounds.geom, 4326)
+)
+SELECT ST_AsMVT(mvt_rows, 'points', %(extent)s, 'geom')
+FROM mvt_rows
+WHERE mvt_rows.geom IS NOT NULL
+"""
+
+
+class TilesRepository:
+    def render_points_tile(self, *, z: int, x: int, y: int) -> bytes:
+        params = {"z": z, "x": x, "y": y, "extent": MVT_EXTENT, "buffer": MVT_BUFFER}
+        # Из primary, не из реплики: тайл кэшируется надолго, отставший снимок остался бы
+        # в кэше и после инвалидации.
+        with connection.cursor() as cursor:
+            cursor.execute(POINTS_TILE_SQL, params)
+            row = cursor.fetchone()
+        tile = row[0] if row else None
+        return bytes(tile) if tile else b""
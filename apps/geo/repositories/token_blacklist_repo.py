@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+
+from django.db import connections
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.geo.db_router import PRIMARY_DB_ALIAS
+
+# Порция удаления идёт по первичному ключу (индекс есть всегда, в отличие от `expires_at`):
+# каждая порция — один короткий оператор в autocommit, блокирует только свои строки.
+# FK `BlacklistedToken -> OutstandingToken` в Postgres без ON DELETE CASCADE, поэтому
+# строки чёрного списка удаляются тем же оператором.
+PURGE_BATCH_SQL = """
+WITH chunk AS (
+    SELECT id, expires_at FROM {outstanding} WHERE id > %(after_id)s ORDER BY id LIMIT %(limit)s
+),
+expired AS (SELECT id FROM chunk WHERE expires_at <= %(now)s),
+dropped_blacklisted AS (
+    DELETE FROM {blacklisted} WHERE token_id IN (SELECT id FROM expired) RETURNING 1
+),
+dropped AS (DELETE FROM {outstanding} WHERE id IN (SELECT id FROM expired) RETURNING 1)
+SELECT
+    (SELECT max(id) FROM chunk),
+    (SELECT count(*) FROM dropped),
+    (SELECT count(*) FROM dropped_blacklisted)
+"""
+
+
+class TokenBlacklistRepository:
+    """Таблицы `token_blacklist` simplejwt; всё на primary — чёрный список не ждёт реплик."""
+
+    def blacklisted_jtis(
+        self, *, since: datetime | None, now: datetime
+    ) -> Iterator[tuple[str, datetime]]:
+        """`(jti, blacklisted_at)` ещё не истёкших токенов, попавших в список не раньше `since`."""
+        queryset = BlacklistedToken.objects.using(PRIMARY_DB_ALIAS).filter(
+            token__expires_at__gt=now
+        )
+        if since is not None:
+            queryset = queryset.filter(blacklisted_at__gte=since)
+        return queryset.values_list("token__jti", "blacklisted_at").iterator(chunk_size=10000)
+
+    def is_blacklisted(self, jti: str) -> bool:
+        return BlacklistedToken.objects.using(PRIMARY_DB_ALIAS).filter(token__jti=jti).exists()
+
+    def purge_expired_batch(
+        self, *, after_id: int, limit: int, now: datetime
+    ) -> tuple[int | None, int, int]:
+        """
+        Удаляет истёкшие токены среди следующих `limit` строк после `after_id`.
+        `(последний просмотренный id или None в конце таблицы, удалено токенов, из них в списке)`.
+        """
+        connection = connections[PRIMARY_DB_ALIAS]
+        query = PURGE_BATCH_SQL.format(
+            outstanding=connection.ops.quote_name(OutstandingToken._meta.db_table),
+            blacklisted=connection.ops.quote_name(BlacklistedToken._meta.db_table),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(query, {"after_id": after_id, "limit": limit, "now": now})
+            last_id, deleted, blacklisted = cursor.fetchone()
+        return last_id, deleted, blacklisted
@@ -1,14 +1,27 @@
 from django.conf import settings
-from drf_spectacular.utils import extend_schema
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.geo.schemas.admin import TestUserCreateSerializer, TestUserResponseSerializer
+from apps.geo.exporters import NDJSON_CONTENT_TYPE, iter_ndjson
+from apps.geo.negotiation import IgnoreClientContentNegotiation
+from apps.geo.schemas.admin import (
+    SlowQueriesQuerySerializer,
+    SlowQuerySampleSerializer,
+    TestUserCreateSerializer,
+    TestUserResponseSerializer,
+    TestUsersBulkCreateSerializer,
+    TestUsersBulkResponseSerializer,
+)
 from apps.geo.services.admin_service import AdminService
-from apps.geo.services.exceptions import UsernameAlreadyExistsError
+from apps.geo.services.exceptions import InvalidUsernameError, UsernameAlreadyExistsError
+from apps.geo.services.slow_queries_service import SlowQueriesService
+from apps.geo.tokens import issue_token_pairs
 
 
 class TestUsersCreateAPIView(APIView):
@@ -38,3 +51,102 @@ class TestUsersCreateAPIView(APIView):
         response_payload = {"id": created_user.id, "username": created_user.username}
         response_data = TestUserResponseSerializer(response_payload).data
         return Response(data=response_data, status=201)
+
+
+class TestUsersBulkCreateAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["admin"],
+        request=TestUsersBulkCreateSerializer,
+        responses={201: TestUsersBulkResponseSerializer, 200: TestUsersBulkResponseSerializer},
+        summary="Пакетное создание тестовых пользователей с готовыми JWT (только для dev/test)",
+        description="201 — создан хотя бы один пользователь; 200 с `created: 0` — все имена заняты.",
+    )
+    def post(self, request: Request) -> Response:
+        if not settings.ENABLE_TEST_USER_ENDPOINT:
+            return Response(status=404)
+
+        request_serializer = TestUsersBulkCreateSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+        payload = request_serializer.validated_data
+
+        try:
+            # Пользователи без токенов (упал выпуск JWT) пакету не нужны — откатываем всё.
+            with transaction.atomic():
+                created_users, conflicts = AdminService().create_test_users(
+                    usernames=payload["usernames"], password=payload["password"]
+                )
+                tokens = (
+                    issue_token_pairs(created_users)
+                    if payload["issue_tokens"] and created_users
+                    else [{}] * len(created_users)
+                )
+        except UsernameAlreadyExistsError as exc:
+            raise ValidationError(
+                {"usernames": [f"Пользователь {exc.username} уже существует, повторите запрос."]}
+            ) from exc
+        except InvalidUsernameError as exc:
+            raise ValidationError(
+                {"usernames": [f"Недопустимый username: {exc.username}."]}
+            ) from exc
+
+        users = [
+            {"id": user.id, "username": user.username, **user_tokens}
+            for user, user_tokens in zip(created_users, tokens, strict=True)
+        ]
+
+        response_data = TestUsersBulkResponseSerializer(
+            {"created": len(users), "conflicts": conflicts, "users": users}
+        ).data
+        return Response(data=response_data, status=201 if users else 200)
+
+
+class SlowQueriesAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        tags=["admin"],
+        parameters=[SlowQueriesQuerySerializer],
+        responses={200: SlowQuerySampleSerializer(many=True)},
+        summary="Сэмплы медленных гео-запросов с планами EXPLAIN (новые первыми)",
+        description="Буфер хранится в кэше Django: с LocMem (без общего `CACHE_BACKEND`) "
+        "видны только сэмплы воркера, обработавшего этот запрос.",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = SlowQueriesQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        samples = SlowQueriesService().list_samples(
+            route=request_serializer.validated_data.get("route")
+        )
+        return Response(data=samples, status=200)
+
+    @extend_schema(tags=["admin"], responses={204: None}, summary="Очистить буфер сэмплов")
+    def delete(self, request: Request) -> Response:
+        SlowQueriesService().clear()
+        return Response(status=204)
+
+
+class SlowQueriesExportAPIView(APIView):
+    permission_classes = [IsAdminUser]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["admin"],
+        parameters=[SlowQueriesQuerySerializer],
+        responses={(200, NDJSON_CONTENT_TYPE): OpenApiResponse(description="Один сэмпл на строку")},
+        summary="Выгрузка сэмплов медленных запросов (NDJSON)",
+    )
+    def get(self, request: Request) -> StreamingHttpResponse:
+        request_serializer = SlowQueriesQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        samples = SlowQueriesService().list_samples(
+            route=request_serializer.validated_data.get("route")
+        )
+        return StreamingHttpResponse(
+            iter_ndjson(samples),
+            content_type=NDJSON_CONTENT_TYPE,
+            headers={"Content-Disposition": 'attachment; filename="slow-queries.ndjson"'},
+        )
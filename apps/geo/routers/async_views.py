@@ -0,0 +1,150 @@
+"""
+Async-версии поиска и создания (`/api/async/...`) для запуска под ASGI-сервером.
+
+Ответы совпадают с синхронными эндпоинтами. Пока запрос ждёт БД, воркер не держит
+поток: под `uvicorn` один процесс обслуживает тысячи одновременных поисков, а число
+параллельных SQL-запросов ограничивает пул соединений (`DB_POOL_MAX_SIZE`).
+Аутентификация, права и throttling остаются синхронными (adrf выполняет их в потоке).
+"""
+
+from typing import Any
+
+from adrf.views import APIView
+from django.db.models import QuerySet
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.geo.pagination import SEARCH_PAGINATION_PARAMETERS, SearchPagination
+from apps.geo.routers.messages import PAGINATED_MESSAGE_RESPONSE
+from apps.geo.routers.search import PAGINATED_POINT_RESPONSE
+from apps.geo.schemas.messages import MessageCreateSerializer, MessageResponseSerializer
+from apps.geo.schemas.points import PointCreateSerializer, PointResponseSerializer
+from apps.geo.schemas.rows import MessageRowSerializer, PointRowSerializer
+from apps.geo.schemas.search import RadiusSearchQuerySerializer
+from apps.geo.services.exceptions import PointNotFoundError
+from apps.geo.services.messages_service import MessagesService
+from apps.geo.services.points_service import PointsService
+from apps.geo.services.search_cache import request_variant
+from apps.geo.services.search_service import SearchService
+
+RADIUS_SEARCH_PARAMETERS = [
+    OpenApiParameter(
+        "latitude", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
+    ),
+    OpenApiParameter(
+        "longitude", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
+    ),
+    OpenApiParameter("radius", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True),
+    *SEARCH_PAGINATION_PARAMETERS,
+]
+
+
+class AsyncPointsCreateAPIView(APIView):
+    @extend_schema(
+        tags=["async"],
+        request=PointCreateSerializer,
+        responses={201: PointResponseSerializer},
+        summary="Создание точки (async)",
+    )
+    async def post(self, request: Request) -> Response:
+        request_serializer = PointCreateSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        payload = request_serializer.validated_data
+        created_point = await PointsService().acreate_point(**payload)
+        response_data = PointResponseSerializer(created_point).data
+        return Response(data=response_data, status=201)
+
+
+class AsyncMessagesCreateAPIView(APIView):
+    @extend_schema(
+        tags=["async"],
+        request=MessageCreateSerializer,
+        responses={201: MessageResponseSerializer},
+        summary="Создание сообщения к точке (async)",
+    )
+    async def post(self, request: Request) -> Response:
+        request_serializer = MessageCreateSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        try:
+            payload = request_serializer.validated_data
+            created_message = await MessagesService().acreate_message(
+                author=request.user, **payload
+            )
+        except PointNotFoundError as exc:
+            raise NotFound(f"Point with id={exc.point_id} not found") from exc
+
+        response_data = MessageResponseSerializer(created_message).data
+        return Response(data=response_data, status=201)
+
+
+class AsyncPointsSearchAPIView(APIView):
+    stateless_auth = True
+
+    @extend_schema(
+        tags=["async"],
+        parameters=RADIUS_SEARCH_PARAMETERS,
+        responses={200: PAGINATED_POINT_RESPONSE},
+        summary="Поиск точек в радиусе (async)",
+    )
+    async def get(self, request: Request) -> Response:
+        request_serializer = RadiusSearchQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        response_data = await SearchService().asearch_points_cached(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            radius_km=search_params["radius"],
+            variant=_variant(request),
+            render=lambda queryset: _render(request, self, queryset, PointRowSerializer()),
+        )
+        return Response(data=response_data, status=200)
+
+
+class AsyncMessagesSearchAPIView(APIView):
+    stateless_auth = True
+
+    @extend_schema(
+        tags=["async"],
+        parameters=RADIUS_SEARCH_PARAMETERS,
+        responses={200: PAGINATED_MESSAGE_RESPONSE},
+        summary="Поиск сообщений в радиусе (async)",
+    )
+    async def get(self, request: Request) -> Response:
+        request_serializer = RadiusSearchQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        response_data = await SearchService().asearch_messages_cached(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            radius_km=search_params["radius"],
+            variant=_variant(request),
+            render=lambda queryset: _render(request, self, queryset, MessageRowSerializer()),
+        )
+        return Response(data=response_data, status=200)
+
+
+def _variant(request: Request) -> str:
+    return request_variant(
+        base_url=request.build_absolute_uri(request.path),
+        query_params=request.query_params,
+        exclude=RadiusSearchQuerySerializer().fields,
+    )
+
+
+async def _render(
+    request: Request,
+    view: APIView,
+    queryset: QuerySet,
+    row_serializer: PointRowSerializer | MessageRowSerializer,
+) -> Any:
+    paginator = SearchPagination()
+    page = await paginator.apaginate_queryset(queryset, request, view=view)
+    if page is not None:
+        return paginator.get_paginated_response(row_serializer.serialize_many(page)).data
+    return row_serializer.serialize_many([row async for row in queryset])
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from apps.geo.exporters import GEOJSON_CONTENT_TYPE, NDJSON_CONTENT_TYPE, iter_geojson, iter_ndjson
+from apps.geo.negotiation import IgnoreClientContentNegotiation
+from apps.geo.repositories.expressions import Latitude, Longitude
+from apps.geo.schemas.rows import MessageRowSerializer, PointRowSerializer
+from apps.geo.schemas.search import ExportQuerySerializer
+from apps.geo.services.search_service import SearchService
+
+EXPORT_RESPONSES = {
+    (200, NDJSON_CONTENT_TYPE): OpenApiResponse(description="Одна JSON-строка на запись"),
+    (200, GEOJSON_CONTENT_TYPE): OpenApiResponse(description="GeoJSON FeatureCollection"),
+}
+
+
+def _stream(
+    queryset: QuerySet,
+    *,
+    output: str,
+    serializer: PointRowSerializer | MessageRowSerializer,
+) -> StreamingHttpResponse:
+    # iterator(chunk_size=...) читает через серверный курсор порциями —
+    # память не растёт с размером выборки, запрос выполняется один раз.
+    rows = queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    if output == "geojson":
+        features = (
+            (serializer.to_representation(row), (row["longitude"], row["latitude"])) for row in rows
+        )
+        return StreamingHttpResponse(iter_geojson(features), content_type=GEOJSON_CONTENT_TYPE)
+    records = (serializer.to_representation(row) for row in rows)
+    return StreamingHttpResponse(iter_ndjson(records), content_type=NDJSON_CONTENT_TYPE)
+
+
+class PointsExportAPIView(APIView):
+    stateless_auth = True
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[ExportQuerySerializer],
+        responses=EXPORT_RESPONSES,
+        summary="Потоковая выгрузка точек в радиусе (NDJSON / GeoJSON)",
+    )
+    def get(self, request: Request) -> StreamingHttpResponse:
+        request_serializer = ExportQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        queryset = SearchService().search_points(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            radius_km=search_params["radius"],
+        )
+        return _stream(
+            queryset,
+            output=search_params["output"],
+            serializer=PointRowSerializer(),
+        )
+
+
+class MessagesExportAPIView(APIView):
+    stateless_auth = True
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[ExportQuerySerializer],
+        responses=EXPORT_RESPONSES,
+        summary="Потоковая выгрузка сообщений в радиусе (NDJSON / GeoJSON)",
+    )
+    def get(self, request: Request) -> StreamingHttpResponse:
+        request_serializer = ExportQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        queryset = SearchService().search_messages(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            radius_km=search_params["radius"],
+        )
+        if search_params["output"] == "geojson":
+            queryset = queryset.annotate(
+                latitude=Latitude("location"), longitude=Longitude("location")
+            )
+        return _stream(queryset, output=search_params["output"], serializer=MessageRowSerializer())
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from drf_spectacular.utils import OpenApiResponse, extend_schema, inline_serializer
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny, BasePermission
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.geo.metrics import METRICS_CONTENT_TYPE, render_latest
+from apps.geo.negotiation import IgnoreClientContentNegotiation
+from apps.geo.services.readiness_service import ReadinessService
+
+READINESS_RESPONSE = inline_serializer(
+    name="ReadinessResponse", fields={"status": serializers.CharField()}
+)
+
+
+class ReadinessAPIView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    @extend_schema(
+        tags=["health"],
+        responses={200: READINESS_RESPONSE, 503: READINESS_RESPONSE},
+        summary="Готовность воркера: соединения с БД прогреты и БД отвечает",
+    )
+    def get(self, request: Request) -> Response:
+        if ReadinessService().is_ready():
+            return Response(data={"status": "ready"}, status=200)
+        return Response(data={"status": "unavailable"}, status=503)
+
+
+class HasMetricsToken(BasePermission):
+    """
+    `Authorization: Bearer <METRICS_TOKEN>`. Без настроенного токена эндпоинт открыт только
+    в DEBUG: метрики раскрывают маршруты и нагрузку.
+    """
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        if not settings.METRICS_TOKEN:
+            return settings.DEBUG
+        return constant_time_compare(
+            request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+        )
+
+
+class MetricsAPIView(APIView):
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+    throttle_classes = []
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["health"],
+        responses={
+            (200, METRICS_CONTENT_TYPE): OpenApiResponse(description="Prometheus text format")
+        },
+        summary="Метрики запросов (Prometheus)",
+    )
+    def get(self, request: Request) -> HttpResponse:
+        return HttpResponse(render_latest(), content_type=METRICS_CONTENT_TYPE)
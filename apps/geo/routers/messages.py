@@ -1,4 +1,19 @@
-from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema, inline_serializer
+import hashlib
+import json
+from functools import partial
+from typing import Any
+
+from django.db.models import QuerySet
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    OpenApiTypes,
+    extend_schema,
+    inline_serializer,
+)
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
 from rest_framework.generics import GenericAPIView
@@ -6,12 +21,41 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.geo.schemas.messages import MessageCreateSerializer, MessageResponseSerializer
-from apps.geo.schemas.search import RadiusSearchQuerySerializer
+from apps.geo.pagination import SEARCH_PAGINATION_PARAMETERS, SearchPagination
+from apps.geo.repositories.expressions import BoundingBox
+from apps.geo.schemas.bulk import (
+    BulkCreateResponseSerializer,
+    BulkItemsRequestSerializer,
+    build_bulk_response,
+    validate_bulk_items,
+)
+from apps.geo.schemas.messages import (
+    MessageCreateSerializer,
+    MessageResponseSerializer,
+    NearestMessageResponseSerializer,
+)
+from apps.geo.schemas.rows import MessageRowSerializer
+from apps.geo.schemas.search import (
+    BoundingBoxQuerySerializer,
+    MessagesSearchQuerySerializer,
+    NearestSearchQuerySerializer,
+    RadiusSearchQuerySerializer,
+)
 from apps.geo.services.exceptions import PointNotFoundError
 from apps.geo.services.messages_service import MessagesService
+from apps.geo.services.search_cache import request_variant
 from apps.geo.services.search_service import SearchService
 
+PAGINATED_MESSAGE_RESPONSE = inline_serializer(
+    name="PaginatedMessageResponse",
+    fields={
+        "count": serializers.IntegerField(),
+        "next": serializers.URLField(allow_null=True),
+        "previous": serializers.URLField(allow_null=True),
+        "results": MessageResponseSerializer(many=True),
+    },
+)
+
 
 class MessagesCreateAPIView(APIView):
     @extend_schema(
@@ -34,53 +78,150 @@ class MessagesCreateAPIView(APIView):
         return Response(data=response_data, status=201)
 
 
+class MessagesBulkCreateAPIView(APIView):
+    @extend_schema(
+        tags=["points"],
+        request=BulkItemsRequestSerializer,
+        responses={201: BulkCreateResponseSerializer, 400: BulkCreateResponseSerializer},
+        summary="Пакетное создание сообщений (items: [{point_id, text}])",
+    )
+    def post(self, request: Request) -> Response:
+        request_serializer = BulkItemsRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        items = request_serializer.validated_data["items"]
+        valid_items, errors = validate_bulk_items(MessageCreateSerializer, items)
+        created_ids: dict[int, int] = {}
+        if valid_items:
+            created_messages = MessagesService().bulk_create_messages(
+                author=request.user, items=[item for _, item in valid_items]
+            )
+            for (index, item), created_message in zip(valid_items, created_messages, strict=True):
+                if created_message is None:
+                    errors[index] = {"point_id": [f"Point with id={item['point_id']} not found"]}
+                else:
+                    created_ids[index] = created_message.id
+
+        response_data = BulkCreateResponseSerializer(
+            build_bulk_response(total=len(items), created_ids=created_ids, errors=errors)
+        ).data
+        return Response(data=response_data, status=201 if created_ids else 400)
+
+
 class MessagesSearchAPIView(GenericAPIView):
+    stateless_auth = True
+    pagination_class = SearchPagination
+    cursor_ordering = ("created_at", "id")
+
     @extend_schema(
         tags=["points"],
         parameters=[
+            MessagesSearchQuerySerializer,
+            *SEARCH_PAGINATION_PARAMETERS,
             OpenApiParameter(
-                "latitude", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
-            ),
-            OpenApiParameter(
-                "longitude", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
-            ),
-            OpenApiParameter(
-                "radius", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
-            ),
-            OpenApiParameter(
-                "page", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False
-            ),
-            OpenApiParameter(
-                "page_size", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False
+                "If-None-Match", OpenApiTypes.STR, location=OpenApiParameter.HEADER, required=False
             ),
         ],
         responses={
-            200: inline_serializer(
-                name="PaginatedMessageResponse",
-                fields={
-                    "count": serializers.IntegerField(),
-                    "next": serializers.URLField(allow_null=True),
-                    "previous": serializers.URLField(allow_null=True),
-                    "results": MessageResponseSerializer(many=True),
-                },
-            )
+            200: PAGINATED_MESSAGE_RESPONSE,
+            304: OpenApiResponse(description="Выборка не изменилась (ETag из If-None-Match)"),
         },
-        summary="Поиск сообщений в радиусе",
+        summary="Поиск сообщений в радиусе (since — только новые; ETag / 304)",
     )
-    def get(self, request: Request) -> Response:
-        request_serializer = RadiusSearchQuerySerializer(data=request.query_params)
+    def get(self, request: Request) -> HttpResponseBase:
+        request_serializer = MessagesSearchQuerySerializer(data=request.query_params)
         request_serializer.is_valid(raise_exception=True)
 
         search_params = request_serializer.validated_data
-        queryset = SearchService().search_messages(
-            latitude=search_params["latitude"],
-            longitude=search_params["longitude"],
-            radius_km=search_params["radius"],
+        search_service = SearchService()
+        area = {
+            "latitude": search_params["latitude"],
+            "longitude": search_params["longitude"],
+            "radius_km": search_params["radius"],
+            "since_id": search_params.get("since"),
+        }
+        # Неизменившаяся выборка — 304 по пробе через индекс, без запроса страницы.
+        etag, response_data = search_service.search_messages_validated(
+            **area,
+            variant=request_variant(
+                base_url=request.build_absolute_uri(request.path),
+                query_params=request.query_params,
+                exclude=RadiusSearchQuerySerializer().fields,
+            ),
+            render=self._render,
+            etag_for=partial(_search_etag, request),
+            is_fresh=lambda etag: get_conditional_response(request, etag=etag) is not None,
         )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+        return Response(data=response_data, status=200, headers={"ETag": etag})
+
+    def _render(self, queryset: QuerySet) -> Any:
         page = self.paginate_queryset(queryset)
         if page is not None:
-            paginated_data = MessageResponseSerializer(page, many=True).data
+            paginated_data = MessageRowSerializer().serialize_many(page)
+            return self.get_paginated_response(paginated_data).data
+        return MessageRowSerializer().serialize_many(queryset)
+
+
+def _search_etag(request: Request, state: dict[str, Any]) -> str:
+    """
+    Сильный ETag: полный URL запроса (страница, курсор, `since`) и состояние выборки
+    (`count`, `newest_id`) — новое или удалённое сообщение в области меняет его.
+    """
+    raw = json.dumps(
+        [request.build_absolute_uri(), state["count"], state["newest_id"]],
+        separators=(",", ":"),
+    )
+    return quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32])
+
+
+class MessagesBBoxSearchAPIView(GenericAPIView):
+    stateless_auth = True
+    pagination_class = SearchPagination
+    cursor_ordering = ("created_at", "id")
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[BoundingBoxQuerySerializer, *SEARCH_PAGINATION_PARAMETERS],
+        responses={200: PAGINATED_MESSAGE_RESPONSE},
+        summary="Поиск сообщений в прямоугольнике (viewport)",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = BoundingBoxQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        bbox = BoundingBox(**request_serializer.validated_data)
+        queryset = SearchService().search_messages_in_bbox(bbox=bbox)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            paginated_data = MessageRowSerializer().serialize_many(page)
             return self.get_paginated_response(paginated_data)
 
-        response_data = MessageResponseSerializer(queryset, many=True).data
+        response_data = MessageRowSerializer().serialize_many(queryset)
+        return Response(data=response_data, status=200)
+
+
+class MessagesNearestAPIView(APIView):
+    stateless_auth = True
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[NearestSearchQuerySerializer],
+        responses={200: NearestMessageResponseSerializer(many=True)},
+        summary="Последние N сообщений на ближайших точках (по расстоянию)",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = NearestSearchQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        queryset = SearchService().nearest_messages(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            limit=search_params["limit"],
+        )
+        response_data = NearestMessageResponseSerializer(queryset, many=True).data
         return Response(data=response_data, status=200)
@@ -3,6 +3,12 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.geo.schemas.bulk import (
+    BulkCreateResponseSerializer,
+    BulkItemsRequestSerializer,
+    build_bulk_response,
+    validate_bulk_items,
+)
 from apps.geo.schemas.points import PointCreateSerializer, PointResponseSerializer
 from apps.geo.services.points_service import PointsService
 
@@ -22,3 +28,29 @@ class PointsCreateAPIView(APIView):
         created_point = PointsService().create_point(**payload)
         response_data = PointResponseSerializer(created_point).data
         return Response(data=response_data, status=201)
+
+
+class PointsBulkCreateAPIView(APIView):
+    @extend_schema(
+        tags=["points"],
+        request=BulkItemsRequestSerializer,
+        responses={201: BulkCreateResponseSerializer, 400: BulkCreateResponseSerializer},
+        summary="Пакетное создание точек (items: [{title, latitude, longitude}])",
+    )
+    def post(self, request: Request) -> Response:
+        request_serializer = BulkItemsRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        items = request_serializer.validated_data["items"]
+        valid_items, errors = validate_bulk_items(PointCreateSerializer, items)
+        created_ids: dict[int, int] = {}
+        if valid_items:
+            point_ids = PointsService().bulk_create_points(items=[item for _, item in valid_items])
+            created_ids = {
+                index: point_id for (index, _), point_id in zip(valid_items, point_ids, strict=True)
+            }
+
+        response_data = BulkCreateResponseSerializer(
+            build_bulk_response(total=len(items), created_ids=created_ids, errors=errors)
+        ).data
+        return Response(data=response_data, status=201 if created_ids else 400)
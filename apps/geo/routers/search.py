@@ -1,15 +1,45 @@
+from collections.abc import Sequence
+from typing import Any
+
+from django.db.models import QuerySet
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema, inline_serializer
 from rest_framework import serializers
 from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from apps.geo.schemas.points import PointResponseSerializer
-from apps.geo.schemas.search import RadiusSearchQuerySerializer
+from apps.geo.pagination import SEARCH_PAGINATION_PARAMETERS, SearchPagination
+from apps.geo.repositories.expressions import BoundingBox
+from apps.geo.schemas.points import NearestPointResponseSerializer, PointResponseSerializer
+from apps.geo.schemas.rows import PointRowSerializer
+from apps.geo.schemas.search import (
+    BatchSearchRequestSerializer,
+    BatchSearchResponseSerializer,
+    BoundingBoxQuerySerializer,
+    ClusterQuerySerializer,
+    ClusterResponseSerializer,
+    NearestSearchQuerySerializer,
+    RadiusSearchQuerySerializer,
+)
+from apps.geo.services.search_cache import request_variant
 from apps.geo.services.search_service import SearchService
 
+PAGINATED_POINT_RESPONSE = inline_serializer(
+    name="PaginatedPointResponse",
+    fields={
+        "count": serializers.IntegerField(),
+        "next": serializers.URLField(allow_null=True),
+        "previous": serializers.URLField(allow_null=True),
+        "results": PointResponseSerializer(many=True),
+    },
+)
+
 
 class PointsSearchAPIView(GenericAPIView):
+    stateless_auth = True
+    pagination_class = SearchPagination
+
     @extend_schema(
         tags=["points"],
         parameters=[
@@ -22,24 +52,9 @@ class PointsSearchAPIView(GenericAPIView):
             OpenApiParameter(
                 "radius", OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True
             ),
-            OpenApiParameter(
-                "page", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False
-            ),
-            OpenApiParameter(
-                "page_size", OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False
-            ),
+            *SEARCH_PAGINATION_PARAMETERS,
         ],
-        responses={
-            200: inline_serializer(
-                name="PaginatedPointResponse",
-                fields={
-                    "count": serializers.IntegerField(),
-                    "next": serializers.URLField(allow_null=True),
-                    "previous": serializers.URLField(allow_null=True),
-                    "results": PointResponseSerializer(many=True),
-                },
-            )
-        },
+        responses={200: PAGINATED_POINT_RESPONSE},
         summary="Поиск точек в радиусе",
     )
     def get(self, request: Request) -> Response:
@@ -47,15 +62,113 @@ class PointsSearchAPIView(GenericAPIView):
         request_serializer.is_valid(raise_exception=True)
 
         search_params = request_serializer.validated_data
-        queryset = SearchService().search_points(
+        response_data = SearchService().search_points_cached(
             latitude=search_params["latitude"],
             longitude=search_params["longitude"],
             radius_km=search_params["radius"],
+            variant=request_variant(
+                base_url=request.build_absolute_uri(request.path),
+                query_params=request.query_params,
+                exclude=RadiusSearchQuerySerializer().fields,
+            ),
+            render=self._render,
+            # Индекс отдаёт последовательность id, keyset-пагинации нужен QuerySet.
+            allow_index=not SearchPagination.is_cursor_request(request),
         )
+        return Response(data=response_data, status=200)
+
+    def _render(self, queryset: QuerySet | Sequence) -> Any:
         page = self.paginate_queryset(queryset)
         if page is not None:
-            paginated_data = PointResponseSerializer(page, many=True).data
+            paginated_data = PointRowSerializer().serialize_many(page)
+            return self.get_paginated_response(paginated_data).data
+        return PointRowSerializer().serialize_many(queryset)
+
+
+class PointsBatchSearchAPIView(APIView):
+    @extend_schema(
+        tags=["points"],
+        request=BatchSearchRequestSerializer,
+        responses={200: BatchSearchResponseSerializer},
+        summary="Пакетный поиск точек в радиусе для многих центров (один SQL-запрос)",
+    )
+    def post(self, request: Request) -> Response:
+        request_serializer = BatchSearchRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        results = SearchService().search_points_batch(
+            probes=search_params["probes"],
+            limit=search_params["limit"],
+            dedupe=search_params["dedupe"],
+        )
+        response_data = BatchSearchResponseSerializer({"results": results}).data
+        return Response(data=response_data, status=200)
+
+
+class PointsBBoxSearchAPIView(GenericAPIView):
+    stateless_auth = True
+    pagination_class = SearchPagination
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[BoundingBoxQuerySerializer, *SEARCH_PAGINATION_PARAMETERS],
+        responses={200: PAGINATED_POINT_RESPONSE},
+        summary="Поиск точек в прямоугольнике (viewport)",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = BoundingBoxQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        bbox = BoundingBox(**request_serializer.validated_data)
+        queryset = SearchService().search_points_in_bbox(bbox=bbox)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            paginated_data = PointRowSerializer().serialize_many(page)
             return self.get_paginated_response(paginated_data)
 
-        response_data = PointResponseSerializer(queryset, many=True).data
+        response_data = PointRowSerializer().serialize_many(queryset)
+        return Response(data=response_data, status=200)
+
+
+class PointsNearestAPIView(APIView):
+    stateless_auth = True
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[NearestSearchQuerySerializer],
+        responses={200: NearestPointResponseSerializer(many=True)},
+        summary="Ближайшие N точек (по расстоянию, с distance_m в метрах)",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = NearestSearchQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        queryset = SearchService().nearest_points(
+            latitude=search_params["latitude"],
+            longitude=search_params["longitude"],
+            limit=search_params["limit"],
+        )
+        response_data = NearestPointResponseSerializer(queryset, many=True).data
+        return Response(data=response_data, status=200)
+
+
+class PointsClustersAPIView(APIView):
+    stateless_auth = True
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[ClusterQuerySerializer],
+        responses={200: ClusterResponseSerializer(many=True)},
+        summary="Кластеры точек во viewport для зума (count, центроид, пример id)",
+    )
+    def get(self, request: Request) -> Response:
+        request_serializer = ClusterQuerySerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        query_params = dict(request_serializer.validated_data)
+        zoom = query_params.pop("zoom")
+        clusters = SearchService().cluster_points(bbox=BoundingBox(**query_params), zoom=zoom)
+        response_data = ClusterResponseSerializer(clusters, many=True).data
         return Response(data=response_data, status=200)
@@ -0,0 +1,102 @@
+"""
+Живая лента сообщений (Server-Sent Events): клиент держит одно соединение и получает
+новые сообщения в своей области, вместо опроса `points/messages/search/`.
+
+Под ASGI (`uvicorn`) ожидание событий не занимает поток; под WSGI каждое открытое
+соединение держит поток воркера — для ленты нужен ASGI-воркер.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, OpenApiTypes, extend_schema
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from apps.geo.exporters import EVENT_STREAM_CONTENT_TYPE, SSE_KEEPALIVE, sse_event
+from apps.geo.negotiation import IgnoreClientContentNegotiation
+from apps.geo.schemas.rows import MessageRowSerializer
+from apps.geo.schemas.search import MessagesSearchQuerySerializer
+from apps.geo.services.exceptions import LiveFeedBacklogTruncatedError, LiveFeedOverflowError
+from apps.geo.services.live_feed import LiveFeedService
+
+OVERFLOW_EVENT = "overflow"
+TRUNCATED_EVENT = "truncated"
+
+
+class MessagesStreamAPIView(APIView):
+    stateless_auth = True
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["points"],
+        parameters=[
+            MessagesSearchQuerySerializer,
+            OpenApiParameter(
+                "Last-Event-ID", OpenApiTypes.INT, location=OpenApiParameter.HEADER, required=False
+            ),
+        ],
+        responses={
+            (200, EVENT_STREAM_CONTENT_TYPE): OpenApiResponse(
+                description="События `id: <id сообщения>`, `data: <сообщение>`; "
+                "`event: overflow` — клиент отстал, `event: truncated` — пропущенных "
+                "сообщений больше лимита; в обоих случаях переподключиться с Last-Event-ID"
+            )
+        },
+        summary="Живая лента новых сообщений в радиусе (SSE)",
+    )
+    def get(self, request: Request) -> StreamingHttpResponse:
+        query_params = request.query_params.copy()
+        last_event_id = request.headers.get("Last-Event-ID")
+        if last_event_id and "since" not in query_params:
+            query_params["since"] = last_event_id
+        request_serializer = MessagesSearchQuerySerializer(data=query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        search_params = request_serializer.validated_data
+        area = {
+            "latitude": search_params["latitude"],
+            "longitude": search_params["longitude"],
+            "radius_km": search_params["radius"],
+            "since_id": search_params.get("since"),
+        }
+        if isinstance(request._request, ASGIRequest):
+            content = _aiter_events(LiveFeedService().afollow(**area))
+        else:
+            content = _iter_events(LiveFeedService().follow(**area))
+        return StreamingHttpResponse(
+            content,
+            content_type=EVENT_STREAM_CONTENT_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+def _iter_events(rows: Iterator[dict[str, Any] | None]) -> Iterator[str]:
+    # Первый байт сразу: клиент и прокси видят, что поток открыт.
+    yield SSE_KEEPALIVE
+    try:
+        for row in rows:
+            yield _event(row)
+    except LiveFeedOverflowError:
+        yield sse_event({}, event=OVERFLOW_EVENT)
+    except LiveFeedBacklogTruncatedError:
+        yield sse_event({}, event=TRUNCATED_EVENT)
+
+
+async def _aiter_events(rows: AsyncIterator[dict[str, Any] | None]) -> AsyncIterator[str]:
+    yield SSE_KEEPALIVE
+    try:
+        async for row in rows:
+            yield _event(row)
+    except LiveFeedOverflowError:
+        yield sse_event({}, event=OVERFLOW_EVENT)
+    except LiveFeedBacklogTruncatedError:
+        yield sse_event({}, event=TRUNCATED_EVENT)
+
+
+def _event(row: dict[str, Any] | None) -> str:
+    if row is None:
+        return SSE_KEEPALIVE
+    return sse_event(MessageRowSerializer().to_representation(row), event_id=row["id"])
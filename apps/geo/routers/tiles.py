@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.http import HttpResponse
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from apps.geo.negotiation import IgnoreClientContentNegotiation
+from apps.geo.services.tiles_service import TilesService
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+class PointsTileAPIView(APIView):
+    stateless_auth = True
+    # Клиенты карт шлют Accept: application/vnd.mapbox-vector-tile.
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @extend_schema(
+        tags=["points"],
+        responses={(200, MVT_CONTENT_TYPE): OpenApiResponse(description="Mapbox Vector Tile")},
+        summary="Векторный тайл точек (слой points: id, title)",
+    )
+    def get(self, request: Request, z: int, x: int, y: int) -> HttpResponse:
+        tiles_service = TilesService()
+        if not tiles_service.is_valid_tile(z=z, x=x, y=y):
+            raise NotFound(f"Tile {z}/{x}/{y} is out of range")
+
+        tile = tiles_service.get_points_tile(z=z, x=x, y=y)
+        response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+        response["Cache-Control"] = f"private, max-age={settings.TILE_CLIENT_MAX_AGE}"
+        return response
@@ -1,16 +1,88 @@
 from django.urls import path
 
-from .admin import TestUsersCreateAPIView
+from .admin import (
+    SlowQueriesAPIView,
+    SlowQueriesExportAPIView,
+    TestUsersBulkCreateAPIView,
+    TestUsersCreateAPIView,
+)
+from .async_views import (
+    AsyncMessagesCreateAPIView,
+    AsyncMessagesSearchAPIView,
+    AsyncPointsCreateAPIView,
+    AsyncPointsSearchAPIView,
+)
 from .auth import RegisterAPIView
-from .messages import MessagesCreateAPIView, MessagesSearchAPIView
-from .points import PointsCreateAPIView
-from .search import PointsSearchAPIView
+from .export import MessagesExportAPIView, PointsExportAPIView
+from .health import MetricsAPIView, ReadinessAPIView
+from .messages import (
+    MessagesBBoxSearchAPIView,
+    MessagesBulkCreateAPIView,
+    MessagesCreateAPIView,
+    MessagesNearestAPIView,
+    MessagesSearchAPIView,
+)
+from .points import PointsBulkCreateAPIView, PointsCreateAPIView
+from .search import (
+    PointsBatchSearchAPIView,
+    PointsBBoxSearchAPIView,
+    PointsClustersAPIView,
+    PointsNearestAPIView,
+    PointsSearchAPIView,
+)
+from .stream import MessagesStreamAPIView
+from .tiles import PointsTileAPIView
 
 urlpatterns = [
+    path("health/ready/", ReadinessAPIView.as_view(), name="health-ready"),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
     path("auth/register/", RegisterAPIView.as_view(), name="auth-register"),
     path("points/", PointsCreateAPIView.as_view(), name="points-create"),
+    path("points/bulk/", PointsBulkCreateAPIView.as_view(), name="points-bulk-create"),
     path("points/messages/", MessagesCreateAPIView.as_view(), name="messages-create"),
+    path("points/messages/bulk/", MessagesBulkCreateAPIView.as_view(), name="messages-bulk-create"),
     path("points/search/", PointsSearchAPIView.as_view(), name="points-search"),
+    path("points/search/batch/", PointsBatchSearchAPIView.as_view(), name="points-batch-search"),
     path("points/messages/search/", MessagesSearchAPIView.as_view(), name="messages-search"),
+    path("points/messages/stream/", MessagesStreamAPIView.as_view(), name="messages-stream"),
+    path("points/bbox/", PointsBBoxSearchAPIView.as_view(), name="points-bbox-search"),
+    path(
+        "points/messages/bbox/",
+        MessagesBBoxSearchAPIView.as_view(),
+        name="messages-bbox-search",
+    ),
+    path("points/search/export/", PointsExportAPIView.as_view(), name="points-export"),
+    path(
+        "points/messages/search/export/",
+        MessagesExportAPIView.as_view(),
+        name="messages-export",
+    ),
+    path("points/clusters/", PointsClustersAPIView.as_view(), name="points-clusters"),
+    path("points/nearest/", PointsNearestAPIView.as_view(), name="points-nearest"),
+    path("points/messages/nearest/", MessagesNearestAPIView.as_view(), name="messages-nearest"),
+    path("tiles/<int:z>/<int:x>/<int:y>.mvt", PointsTileAPIView.as_view(), name="points-tile"),
+    path("async/points/", AsyncPointsCreateAPIView.as_view(), name="async-points-create"),
+    path(
+        "async/points/messages/",
+        AsyncMessagesCreateAPIView.as_view(),
+        name="async-messages-create",
+    ),
+    path("async/points/search/", AsyncPointsSearchAPIView.as_view(), name="async-points-search"),
+    path(
+        "async/points/messages/search/",
+        AsyncMessagesSearchAPIView.as_view(),
+        name="async-messages-search",
+    ),
     path("admin/test-users/", TestUsersCreateAPIView.as_view(), name="admin-test-users-create"),
+    path(
+        "admin/test-users/bulk/",
+        TestUsersBulkCreateAPIView.as_view(),
+        name="admin-test-users-bulk-create",
+    ),
+    path("admin/slow-queries/", SlowQueriesAPIView.as_view(), name="admin-slow-queries"),
+    path(
+        "admin/slow-queries/export/",
+        SlowQueriesExportAPIView.as_view(),
+        name="admin-slow-queries-export",
+    ),
 ]
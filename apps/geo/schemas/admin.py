@@ -1,6 +1,12 @@
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
+User = get_user_model()
+
 
 class TestUserCreateSerializer(serializers.Serializer):
     username = serializers.CharField(min_length=1, max_length=150)
@@ -15,3 +21,68 @@ class TestUserCreateSerializer(serializers.Serializer):
 class TestUserResponseSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     username = serializers.CharField()
+
+
+class TestUsersBulkCreateSerializer(serializers.Serializer):
+    """Либо явный список `usernames`, либо `count` имён вида `{prefix}{1..count}`."""
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(
+            min_length=1, max_length=150, validators=[User.username_validator]
+        ),
+        required=False,
+        min_length=1,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+    count = serializers.IntegerField(required=False, min_value=1, max_value=settings.BULK_MAX_ITEMS)
+    prefix = serializers.CharField(
+        required=False, default="load_", max_length=140, validators=[User.username_validator]
+    )
+    password = serializers.CharField(
+        min_length=8,
+        max_length=128,
+        write_only=True,
+        validators=[validate_password],
+    )
+    issue_tokens = serializers.BooleanField(required=False, default=True)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if ("usernames" in attrs) == ("count" in attrs):
+            raise serializers.ValidationError("Укажите либо usernames, либо count.")
+        if "count" in attrs:
+            attrs["usernames"] = [
+                f"{attrs['prefix']}{number}" for number in range(1, attrs["count"] + 1)
+            ]
+        attrs["usernames"] = [User.normalize_username(name) for name in attrs["usernames"]]
+        return attrs
+
+
+class TestUserTokensSerializer(TestUserResponseSerializer):
+    access = serializers.CharField(required=False)
+    refresh = serializers.CharField(required=False)
+
+
+class TestUsersBulkResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    conflicts = serializers.ListField(child=serializers.CharField())
+    users = TestUserTokensSerializer(many=True)
+
+
+class SlowQueriesQuerySerializer(serializers.Serializer):
+    route = serializers.CharField(required=False, help_text="Маршрут, например api/points/search/")
+
+
+class SlowQuerySampleSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    captured_at = serializers.DateTimeField()
+    route = serializers.CharField(allow_null=True)
+    database = serializers.CharField()
+    sql = serializers.CharField()
+    params = serializers.ListField(child=serializers.JSONField())
+    duration_ms = serializers.FloatField()
+    explain_ms = serializers.FloatField()
+    planning_ms = serializers.FloatField(allow_null=True)
+    execution_ms = serializers.FloatField(allow_null=True)
+    indexes = serializers.ListField(child=serializers.CharField())
+    seq_scans = serializers.ListField(child=serializers.CharField())
+    plan = serializers.JSONField()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from rest_framework import serializers
+
+
+class BulkItemsRequestSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+
+
+class BulkItemResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BulkCreateResponseSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = BulkItemResultSerializer(many=True)
+
+
+def validate_bulk_items(
+    serializer_class: type[serializers.Serializer], items: list[dict[str, Any]]
+) -> tuple[list[tuple[int, dict[str, Any]]], dict[int, dict[str, Any]]]:
+    """
+    Валидирует элементы по одному, чтобы ошибка строки не валила весь батч.
+
+    Возвращает `(валидные (index, data), {index: errors})`.
+    """
+    valid_items: list[tuple[int, dict[str, Any]]] = []
+    errors: dict[int, dict[str, Any]] = {}
+    for index, item in enumerate(items):
+        item_serializer = serializer_class(data=item)
+        if item_serializer.is_valid():
+            valid_items.append((index, item_serializer.validated_data))
+        else:
+            errors[index] = item_serializer.errors
+    return valid_items, errors
+
+
+def build_bulk_response(
+    *, total: int, created_ids: dict[int, int], errors: dict[int, dict[str, Any]]
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    for index in range(total):
+        if index in created_ids:
+            results.append({"index": index, "id": created_ids[index]})
+        else:
+            results.append({"index": index, "errors": errors.get(index, {})})
+    return {"created": len(created_ids), "failed": total - len(created_ids), "results": results}
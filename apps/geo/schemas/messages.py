@@ -15,3 +15,10 @@ class MessageResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Message
         fields = ("id", "point_id", "text", "author", "created_at")
+
+
+class NearestMessageResponseSerializer(MessageResponseSerializer):
+    distance_m = serializers.FloatField(read_only=True)
+
+    class Meta(MessageResponseSerializer.Meta):
+        fields = (*MessageResponseSerializer.Meta.fields, "distance_m")
@@ -16,3 +16,10 @@ class PointResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = Point
         fields = ("id", "title", "latitude", "longitude", "created_at")
+
+
+class NearestPointResponseSerializer(PointResponseSerializer):
+    distance_m = serializers.FloatField(read_only=True)
+
+    class Meta(PointResponseSerializer.Meta):
+        fields = (*PointResponseSerializer.Meta.fields, "distance_m")
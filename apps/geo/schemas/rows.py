@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from rest_framework import serializers
+
+from apps.geo.metrics import timed
+
+# Тот же формат дат, что у ModelSerializer (DATETIME_FORMAT, текущая таймзона).
+_datetime_field = serializers.DateTimeField()
+
+
+class PointRowSerializer:
+    """
+    Быстрый аналог `PointResponseSerializer` для строк-проекций (`point_rows`):
+    словарь собирается напрямую, без полей DRF на каждое значение. JSON тот же.
+    """
+
+    def to_representation(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "latitude": row["latitude"],
+            "longitude": row["longitude"],
+            "created_at": _datetime_field.to_representation(row["created_at"]),
+        }
+
+    def serialize_many(self, rows: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        with timed("serialize", exclude_db=True):
+            return [self.to_representation(row) for row in rows]
+
+
+class MessageRowSerializer:
+    """Быстрый аналог `MessageResponseSerializer` для строк-проекций (`message_rows`)."""
+
+    def to_representation(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            "id": row["id"],
+            "point_id": row["point_id"],
+            "text": row["text"],
+            "author": row["author_username"],
+            "created_at": _datetime_field.to_representation(row["created_at"]),
+        }
+
+    def serialize_many(self, rows: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+        with timed("serialize", exclude_db=True):
+            return [self.to_representation(row) for row in rows]
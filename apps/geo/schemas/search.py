@@ -1,7 +1,75 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from apps.geo.schemas.points import PointResponseSerializer
+
 
 class RadiusSearchQuerySerializer(serializers.Serializer):
     latitude = serializers.FloatField(min_value=-90.0, max_value=90.0)
     longitude = serializers.FloatField(min_value=-180.0, max_value=180.0)
     radius = serializers.FloatField(min_value=0.0)
+
+
+class MessagesSearchQuerySerializer(RadiusSearchQuerySerializer):
+    since = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Только сообщения с id больше указанного (последний увиденный клиентом)",
+    )
+
+
+class NearestSearchQuerySerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90.0, max_value=90.0)
+    longitude = serializers.FloatField(min_value=-180.0, max_value=180.0)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=20)
+
+
+class BatchSearchRequestSerializer(serializers.Serializer):
+    probes = RadiusSearchQuerySerializer(
+        many=True, min_length=1, max_length=settings.SEARCH_BATCH_MAX_PROBES
+    )
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.SEARCH_BATCH_MAX_LIMIT, default=100
+    )
+    dedupe = serializers.BooleanField(default=False)
+
+
+class ExportQuerySerializer(RadiusSearchQuerySerializer):
+    output = serializers.ChoiceField(choices=["ndjson", "geojson"], default="ndjson")
+
+
+class BoundingBoxQuerySerializer(serializers.Serializer):
+    """`min_longitude > max_longitude` — прямоугольник через антимеридиан."""
+
+    min_latitude = serializers.FloatField(min_value=-90.0, max_value=90.0)
+    min_longitude = serializers.FloatField(min_value=-180.0, max_value=180.0)
+    max_latitude = serializers.FloatField(min_value=-90.0, max_value=90.0)
+    max_longitude = serializers.FloatField(min_value=-180.0, max_value=180.0)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["min_latitude"] > attrs["max_latitude"]:
+            raise serializers.ValidationError(
+                {"min_latitude": ["min_latitude не должен превышать max_latitude."]}
+            )
+        return attrs
+
+
+class ClusterQuerySerializer(BoundingBoxQuerySerializer):
+    zoom = serializers.IntegerField(min_value=0, max_value=settings.TILE_MAX_ZOOM)
+
+
+class ClusterResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    sample_id = serializers.IntegerField()
+
+
+class BatchSearchProbeResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    truncated = serializers.BooleanField()
+    points = PointResponseSerializer(many=True)
+
+
+class BatchSearchResponseSerializer(serializers.Serializer):
+    results = BatchSearchProbeResultSerializer(many=True)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
-from apps.geo.services.exceptions import UsernameAlreadyExistsError
+from apps.geo.services.exceptions import InvalidUsernameError, UsernameAlreadyExistsError
 
 User = get_user_model()
 logger = logging.getLogger("apps.geo")
@@ -24,6 +28,46 @@ class AdminService:
         )
         return created_user
 
+    def create_test_users(
+        self, *, usernames: Sequence[str], password: str
+    ) -> tuple[list[User], list[str]]:
+        """
+        Пакетный вариант `create_test_user`: `(созданные, занятые username)`.
+
+        Пароль хешируется один раз (PBKDF2 — десятки мс), хеш общий для всех
+        пользователей пакета; занятые имена — одним запросом, вставка — `bulk_create`.
+        Занятые имена и повторы внутри пакета пропускаются; имена нормализуются и проверяются
+        так же, как в `create_user` (`bulk_create` этого не делает).
+        """
+        normalized = list(dict.fromkeys(self._normalize_username(name) for name in usernames))
+        for name in normalized:
+            try:
+                User.username_validator(name)
+            except ValidationError as exc:
+                raise InvalidUsernameError(username=name) from exc
+        taken = set(User.objects.filter(username__in=normalized).values_list("username", flat=True))
+        conflicts = [name for name in normalized if name in taken]
+        new_usernames = [name for name in normalized if name not in taken]
+        if not new_usernames:
+            return [], conflicts
+
+        password_hash = make_password(password)
+        try:
+            with transaction.atomic():
+                created_users = User.objects.bulk_create(
+                    [User(username=name, password=password_hash) for name in new_usernames],
+                    batch_size=1000,
+                )
+        except IntegrityError as exc:
+            # Имя заняли параллельно между проверкой и вставкой — пакет целиком не создан.
+            raced = User.objects.filter(username__in=new_usernames).values_list(
+                "username", flat=True
+            )
+            raise UsernameAlreadyExistsError(username=next(iter(raced), "")) from exc
+
+        logger.info("test_users_created count=%s conflicts=%s", len(created_users), len(conflicts))
+        return created_users, conflicts
+
     @staticmethod
     def _normalize_username(username: str) -> str:
-        return username.strip()
+        return User.normalize_username(username.strip())
@@ -15,3 +15,23 @@ class UsernameAlreadyExistsError(GeoServiceError):
     def __init__(self, *, username: str) -> None:
         super().__init__(f"Username already exists: {username}")
         self.username = username
+
+
+class InvalidUsernameError(GeoServiceError):
+    def __init__(self, *, username: str) -> None:
+        super().__init__(f"Invalid username: {username}")
+        self.username = username
+
+
+class LiveFeedOverflowError(GeoServiceError):
+    """Клиент ленты не успевает читать: очередь подписки переполнена."""
+
+    def __init__(self) -> None:
+        super().__init__("Live feed subscription queue overflowed")
+
+
+class LiveFeedBacklogTruncatedError(GeoServiceError):
+    """
+    Пропущенных сообщений больше `LIVE_FEED_BACKLOG_LIMIT`: отдана только первая порция,
+    остаток клиент получит, переподключившись с `Last-Event-ID`.
+    """
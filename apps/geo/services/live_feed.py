@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import queue
+import threading
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+
+from apps.geo.db_router import PRIMARY_DB_ALIAS
+from apps.geo.repositories.messages_repo import MessagesRepository
+from apps.geo.repositories.notifications_repo import (
+    NOTIFY_MAX_PAYLOAD_BYTES,
+    NotificationsRepository,
+)
+from apps.geo.services.exceptions import LiveFeedBacklogTruncatedError, LiveFeedOverflowError
+from apps.geo.services.search_service import SearchService
+
+logger = logging.getLogger("apps.geo")
+
+MESSAGES_CHANNEL = "geo_messages"
+EARTH_RADIUS_M = 6_371_008.8
+# Консервативные оценки длины градуса (км), как у кэша поиска: круг не выйдет за ячейки.
+KM_PER_DEGREE_LATITUDE = 110.0
+KM_PER_DEGREE_LONGITUDE_AT_EQUATOR = 111.0
+# Ближе к полюсу долготные ячейки вырождаются — такие подписки проверяются на каждом событии.
+MAX_INDEXED_LATITUDE = 85.0
+# Пауза перед переподключением LISTEN после ошибки (сек).
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class Subscription:
+    """
+    Подписка на круг `(latitude, longitude, radius_km)`.
+
+    Брокер кладёт строки сообщений из своего потока; читатель — sync-генератор (WSGI)
+    или корутина в event loop (`loop`, ASGI). Очередь ограничена: медленный клиент
+    получает `LiveFeedOverflowError` и переподключается с `Last-Event-ID`.
+    """
+
+    def __init__(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_km = radius_km
+        self.overflowed = False
+        self._loop = loop
+        maxsize = settings.LIVE_FEED_QUEUE_SIZE
+        self._queue: queue.Queue | asyncio.Queue = (
+            asyncio.Queue(maxsize=maxsize) if loop is not None else queue.Queue(maxsize=maxsize)
+        )
+
+    def covers(self, *, latitude: float, longitude: float) -> bool:
+        return _haversine_m(self.latitude, self.longitude, latitude, longitude) <= (
+            self.radius_km * 1000.0
+        )
+
+    def deliver(self, row: dict[str, Any]) -> None:
+        """Вызывается из потока брокера."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._put, row)
+        else:
+            self._put(row)
+
+    def get(self, *, timeout: float) -> dict[str, Any] | None:
+        """Следующая строка или `None`, если за `timeout` секунд ничего не пришло."""
+        try:
+            row = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            row = None
+        self._raise_if_overflowed()
+        return row
+
+    async def aget(self, *, timeout: float) -> dict[str, Any] | None:
+        try:
+            row = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except TimeoutError:
+            row = None
+        self._raise_if_overflowed()
+        return row
+
+    def _put(self, row: dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except (queue.Full, asyncio.QueueFull):
+            self.overflowed = True
+
+    def _raise_if_overflowed(self) -> None:
+        if self.overflowed:
+            raise LiveFeedOverflowError()
+
+
+class SubscriptionIndex:
+    """
+    Сетка `LIVE_FEED_CELL_DEG`: ячейка → подписки, чей круг её задевает.
+
+    Событие проверяется только против подписок своей ячейки (и «широких», которые
+    не уложились в `LIVE_FEED_MAX_CELLS`), поэтому стоимость сообщения растёт с числом
+    подходящих подписчиков, а не всех подключённых.
+    """
+
+    def __init__(self) -> None:
+        self._cells: dict[tuple[int, int], set[Subscription]] = defaultdict(set)
+        self._cells_of: dict[Subscription, list[tuple[int, int]]] = {}
+        self._wide: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cells_of) + len(self._wide)
+
+    def add(self, subscription: Subscription) -> None:
+        cells = _cells_covering(
+            latitude=subscription.latitude,
+            longitude=subscription.longitude,
+            radius_km=subscription.radius_km,
+        )
+        with self._lock:
+            if cells is None:
+                self._wide.add(subscription)
+                return
+            self._cells_of[subscription] = cells
+            for cell in cells:
+                self._cells[cell].add(subscription)
+
+    def remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._wide.discard(subscription)
+            for cell in self._cells_of.pop(subscription, []):
+                subscribers = self._cells[cell]
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._cells[cell]
+
+    def match(self, *, latitude: float, longitude: float) -> list[Subscription]:
+        with self._lock:
+            candidates = [*self._cells.get(_cell_of(latitude, longitude), ()), *self._wide]
+        return [
+            subscription
+            for subscription in candidates
+            if subscription.covers(latitude=latitude, longitude=longitude)
+        ]
+
+
+class LiveFeedBroker:
+    """
+    Брокер процесса: поток слушает `LISTEN geo_messages` (события всех воркеров) и
+    раздаёт новые сообщения подходящим подпискам. Поток стартует с первой подпиской.
+    """
+
+    def __init__(
+        self,
+        *,
+        notifications_repo: NotificationsRepository | None = None,
+        messages_repo: MessagesRepository | None = None,
+    ) -> None:
+        self._notifications_repo = notifications_repo or NotificationsRepository()
+        self._messages_repo = messages_repo or MessagesRepository()
+        self._index = SubscriptionIndex()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    def subscribe(self, subscription: Subscription) -> None:
+        self._index.add(subscription)
+        self._ensure_listening()
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._index.remove(subscription)
+
+    def dispatch(self, payload: str) -> int:
+        """Раздаёт одно событие; возвращает число получателей."""
+        event = json.loads(payload)
+        subscriptions = self._index.match(latitude=event["latitude"], longitude=event["longitude"])
+        if not subscriptions:
+            return 0
+        row = event.get("row")
+        if row is None:
+            # Не влезло в NOTIFY — читаем строку из БД (один раз на процесс, не на подписчика).
+            rows = self._messages_repo.get_message_rows(message_ids=[event["id"]])
+            if not rows:
+                return 0
+            row = rows[0]
+        else:
+            row = {**row, "created_at": datetime.fromisoformat(row["created_at"])}
+        for subscription in subscriptions:
+            subscription.deliver(row)
+        return len(subscriptions)
+
+    def _ensure_listening(self) -> None:
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._listen_forever, name="geo-live-feed", daemon=True
+            )
+            self._thread.start()
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                for payload in self._notifications_repo.listen(
+                    channel=MESSAGES_CHANNEL, timeout=settings.LIVE_FEED_HEARTBEAT_SECONDS
+                ):
+                    if payload is not None:
+                        self.dispatch(payload)
+            except Exception:
+                logger.exception("live_feed_listen_failed subscribers=%s", len(self._index))
+                time.sleep(RECONNECT_DELAY_SECONDS)
+
+
+class LiveFeedService:
+    def __init__(
+        self,
+        *,
+        broker: LiveFeedBroker | None = None,
+        notifications_repo: NotificationsRepository | None = None,
+        search_service: SearchService | None = None,
+    ) -> None:
+        self._broker = broker or get_live_feed_broker()
+        self._notifications_repo = notifications_repo or NotificationsRepository()
+        self._search_service = search_service or SearchService()
+
+    def publish_messages(self, rows: Iterable[dict[str, Any]]) -> None:
+        """
+        `rows` — проекции `message_rows` с координатами (`latitude`, `longitude`).
+        Вызывать в транзакции записи: события уйдут подписчикам после коммита.
+        """
+        self._notifications_repo.publish(
+            channel=MESSAGES_CHANNEL, payloads=[_event_payload(row) for row in rows]
+        )
+
+    def follow(
+        self, *, latitude: float, longitude: float, radius_km: float, since_id: int | None
+    ) -> Iterator[dict[str, Any] | None]:
+        """
+        Строки сообщений в круге: сначала пропущенные после `since_id`, затем новые по мере
+        появления; `None` — тик без событий раз в `LIVE_FEED_HEARTBEAT_SECONDS`. После
+        backlog соединения с БД текущего потока закрываются (возвращаются в пул). Если
+        пропущенных больше `LIVE_FEED_BACKLOG_LIMIT`, после первых из них поток завершается
+        `LiveFeedBacklogTruncatedError`. Параметры проверяются сразу, до первой строки.
+        """
+        backlog = self._backlog(
+            latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+        )
+        subscription = Subscription(latitude=latitude, longitude=longitude, radius_km=radius_km)
+        return self._follow(subscription, backlog=backlog)
+
+    def afollow(
+        self, *, latitude: float, longitude: float, radius_km: float, since_id: int | None
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """`follow` для ASGI: ожидание событий не занимает поток."""
+        backlog = self._backlog(
+            latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+        )
+        return self._afollow(
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            backlog=backlog,
+        )
+
+    def _follow(
+        self, subscription: Subscription, *, backlog: QuerySet | None
+    ) -> Iterator[dict[str, Any] | None]:
+        # Сначала подписка, потом backlog: сообщение между ними не потеряется (дубли отсекаем).
+        self._broker.subscribe(subscription)
+        try:
+            backlog_ids: set[int] = set()
+            for row in backlog if backlog is not None else ():
+                _check_backlog_size(backlog_ids)
+                backlog_ids.add(row["id"])
+                yield row
+            _release_connections()
+            while True:
+                row = subscription.get(timeout=settings.LIVE_FEED_HEARTBEAT_SECONDS)
+                if not _is_backlog_duplicate(row, backlog_ids):
+                    yield row
+        finally:
+            self._broker.unsubscribe(subscription)
+
+    async def _afollow(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        backlog: QuerySet | None,
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        subscription = Subscription(
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            loop=asyncio.get_running_loop(),
+        )
+        self._broker.subscribe(subscription)
+        try:
+            backlog_ids: set[int] = set()
+            if backlog is not None:
+                async for row in backlog:
+                    _check_backlog_size(backlog_ids)
+                    backlog_ids.add(row["id"])
+                    yield row
+            await sync_to_async(_release_connections)()
+            while True:
+                row = await subscription.aget(timeout=settings.LIVE_FEED_HEARTBEAT_SECONDS)
+                if not _is_backlog_duplicate(row, backlog_ids):
+                    yield row
+        finally:
+            self._broker.unsubscribe(subscription)
+
+    def _backlog(
+        self, *, latitude: float, longitude: float, radius_km: float, since_id: int | None
+    ) -> QuerySet | None:
+        # `search_messages` проверяет радиус и строит ленивый QuerySet (SQL — при чтении).
+        queryset = self._search_service.search_messages(
+            latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+        )
+        if since_id is None:
+            return None
+        # Из primary: отставшая реплика могла бы не знать о сообщениях, чьи NOTIFY подписка
+        # уже пропустила. Лишняя строка — признак того, что backlog не уместился в лимит.
+        return queryset.using(PRIMARY_DB_ALIAS)[: settings.LIVE_FEED_BACKLOG_LIMIT + 1]
+
+
+_broker: LiveFeedBroker | None = None
+_broker_lock = threading.Lock()
+
+
+def get_live_feed_broker() -> LiveFeedBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = LiveFeedBroker()
+    return _broker
+
+
+def _release_connections() -> None:
+    # Django закрывает соединения запроса по `request_finished`, а у потокового ответа он
+    # приходит только после закрытия ленты: без этого каждая подписка держала бы соединение
+    # (и место в пуле `DB_POOL_MAX_SIZE`) всё время жизни. Дальше лента читает только очередь.
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def _check_backlog_size(backlog_ids: set[int]) -> None:
+    if len(backlog_ids) >= settings.LIVE_FEED_BACKLOG_LIMIT:
+        raise LiveFeedBacklogTruncatedError()
+
+
+def _is_backlog_duplicate(row: dict[str, Any] | None, backlog_ids: set[int]) -> bool:
+    # Дубль — только строка, уже отданная из backlog. Сравнение `id > последнего` потеряло бы
+    # сообщение с меньшим id, закоммиченное позже (id выдаются до коммита).
+    if row is None or row["id"] not in backlog_ids:
+        return False
+    backlog_ids.discard(row["id"])
+    return True
+
+
+def _event_payload(row: dict[str, Any]) -> str:
+    event = {"id": row["id"], "latitude": row["latitude"], "longitude": row["longitude"]}
+    message_row = {
+        "id": row["id"],
+        "point_id": row["point_id"],
+        "text": row["text"],
+        "author_username": row["author_username"],
+        "created_at": row["created_at"].isoformat(),
+    }
+    payload = json.dumps({**event, "row": message_row}, ensure_ascii=False)
+    if len(payload.encode("utf-8")) <= NOTIFY_MAX_PAYLOAD_BYTES:
+        return payload
+    return json.dumps(event)
+
+
+def _cells_covering(
+    *, latitude: float, longitude: float, radius_km: float
+) -> list[tuple[int, int]] | None:
+    cell_deg = settings.LIVE_FEED_CELL_DEG
+    delta_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if max(abs(min_lat), abs(max_lat)) > MAX_INDEXED_LATITUDE:
+        return None
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    delta_lon = radius_km / (KM_PER_DEGREE_LONGITUDE_AT_EQUATOR * cos_lat)
+
+    columns_total = math.ceil(360.0 / cell_deg)
+    rows = range(
+        math.floor((min_lat + 90.0) / cell_deg), math.floor((max_lat + 90.0) / cell_deg) + 1
+    )
+    first_column = math.floor((longitude - delta_lon + 180.0) / cell_deg)
+    last_column = math.floor((longitude + delta_lon + 180.0) / cell_deg)
+    columns_count = min(last_column - first_column + 1, columns_total)
+    if len(rows) * columns_count > settings.LIVE_FEED_MAX_CELLS:
+        return None
+    # Остаток от деления «склеивает» сетку на антимеридиане.
+    columns = {(first_column + offset) % columns_total for offset in range(columns_count)}
+    return [(row, column) for row in rows for column in columns]
+
+
+def _cell_of(latitude: float, longitude: float) -> tuple[int, int]:
+    cell_deg = settings.LIVE_FEED_CELL_DEG
+    columns_total = math.ceil(360.0 / cell_deg)
+    row = math.floor((latitude + 90.0) / cell_deg)
+    column = math.floor((longitude + 180.0) / cell_deg) % columns_total
+    return row, column
+
+
+def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
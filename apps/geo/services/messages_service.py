@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
+from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
 from apps.geo.models.message import Message
 from apps.geo.models.point import Point
 from apps.geo.repositories.messages_repo import MessagesRepository
 from apps.geo.repositories.points_repo import PointsRepository
 from apps.geo.services.exceptions import PointNotFoundError
+from apps.geo.services.live_feed import LiveFeedService
+from apps.geo.services.search_cache import MESSAGES_KIND, SearchCache
 
 User = get_user_model()
 logger = logging.getLogger("apps.geo")
@@ -20,9 +26,13 @@ class MessagesService:
         *,
         messages_repo: MessagesRepository | None = None,
         points_repo: PointsRepository | None = None,
+        search_cache: SearchCache | None = None,
+        live_feed_service: LiveFeedService | None = None,
     ) -> None:
         self._messages_repo = messages_repo or MessagesRepository()
         self._points_repo = points_repo or PointsRepository()
+        self._search_cache = search_cache or SearchCache()
+        self._live_feed_service = live_feed_service or LiveFeedService()
 
     def create_message(self, *, point_id: int, author: User, text: str) -> Message:
         point = self._get_point(point_id)
@@ -37,8 +47,95 @@ class MessagesService:
             getattr(author, "id", None),
             len(normalized_text),
         )
+        self._invalidate_search_cache_on_commit([(point.latitude, point.longitude)])
+        self._live_feed_service.publish_messages(
+            [self._feed_row(created_message, author, (point.latitude, point.longitude))]
+        )
         return created_message
 
+    async def acreate_message(self, *, point_id: int, author: User, text: str) -> Message:
+        """`create_message` для async-view; запись в autocommit, кэш сбрасывается сразу."""
+        point = await self._points_repo.aget_point_by_id(point_id=point_id)
+        if point is None:
+            raise PointNotFoundError(point_id=point_id)
+        normalized_text = self._normalize_text(text)
+        created_message = await self._messages_repo.acreate_message(
+            point=point, author=author, text=normalized_text
+        )
+        logger.info(
+            "message_created id=%s point_id=%s author_id=%s text_len=%s",
+            created_message.id,
+            point.id,
+            getattr(author, "id", None),
+            len(normalized_text),
+        )
+        await sync_to_async(self._search_cache.invalidate)(
+            MESSAGES_KIND, [(point.latitude, point.longitude)]
+        )
+        await sync_to_async(self._live_feed_service.publish_messages)(
+            [self._feed_row(created_message, author, (point.latitude, point.longitude))]
+        )
+        return created_message
+
+    def bulk_create_messages(
+        self, *, author: User, items: Sequence[dict[str, Any]]
+    ) -> list[Message | None]:
+        """
+        Создаёт сообщения пачкой: существование точек проверяется одним запросом,
+        вставка — одним INSERT. Результат выровнен по `items`; `None` — точки нет.
+        """
+        point_locations = self._points_repo.get_point_locations(
+            point_ids={item["point_id"] for item in items}
+        )
+        rows = [
+            (item["point_id"], self._normalize_text(item["text"]))
+            for item in items
+            if item["point_id"] in point_locations
+        ]
+        created_messages = iter(
+            self._messages_repo.bulk_create_messages(
+                author=author, rows=rows, point_locations=point_locations
+            )
+            if rows
+            else []
+        )
+        results = [
+            next(created_messages) if item["point_id"] in point_locations else None
+            for item in items
+        ]
+        self._invalidate_search_cache_on_commit([point_locations[point_id] for point_id, _ in rows])
+        self._live_feed_service.publish_messages(
+            [
+                self._feed_row(message, author, point_locations[message.point_id])
+                for message in results
+                if message is not None
+            ]
+        )
+        logger.info(
+            "messages_bulk_created count=%s missing_points=%s author_id=%s",
+            len(rows),
+            len(items) - len(rows),
+            getattr(author, "id", None),
+        )
+        return results
+
+    def _invalidate_search_cache_on_commit(self, locations: list[tuple[float, float]]) -> None:
+        # После коммита: иначе параллельный поиск успеет закэшировать ответ без сообщения.
+        transaction.on_commit(lambda: self._search_cache.invalidate(MESSAGES_KIND, locations))
+
+    @staticmethod
+    def _feed_row(message: Message, author: User, location: tuple[float, float]) -> dict[str, Any]:
+        # Та же проекция, что `message_rows`, плюс координаты для фильтра подписок.
+        return {
+            "id": message.id,
+            "point_id": message.point_id,
+            "text": message.text,
+            "created_at": message.created_at,
+            "author_username": author.username,
+            "latitude": location[0],
+            "longitude": location[1],
+        }
+
     def _get_point(self, point_id: int) -> Point:
         point = self._points_repo.get_point_by_id(point_id=point_id)
         if point is None:
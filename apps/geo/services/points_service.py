@@ -1,16 +1,32 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
+from functools import partial
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
 
 from apps.geo.models.point import Point
 from apps.geo.repositories.points_repo import PointsRepository
+from apps.geo.services.search_cache import POINTS_KIND, SearchCache
+from apps.geo.services.tiles_service import TilesService
 
 logger = logging.getLogger("apps.geo")
 
 
 class PointsService:
-    def __init__(self, points_repo: PointsRepository | None = None) -> None:
+    def __init__(
+        self,
+        points_repo: PointsRepository | None = None,
+        *,
+        tiles_service: TilesService | None = None,
+        search_cache: SearchCache | None = None,
+    ) -> None:
         self._points_repo = points_repo or PointsRepository()
+        self._tiles_service = tiles_service or TilesService()
+        self._search_cache = search_cache or SearchCache()
 
     def create_point(self, *, title: str | None, latitude: float, longitude: float) -> Point:
         normalized_title = self._normalize_title(title)
@@ -24,8 +40,61 @@ class PointsService:
             longitude,
             bool(normalized_title),
         )
+        self._invalidate_caches_on_commit([(latitude, longitude)])
+        return created_point
+
+    async def acreate_point(self, *, title: str | None, latitude: float, longitude: float) -> Point:
+        """
+        `create_point` для async-view. Async ORM работает в autocommit — к моменту
+        возврата точка уже закоммичена, поэтому кэши сбрасываются сразу, без `on_commit`.
+        """
+        normalized_title = self._normalize_title(title)
+        created_point = await self._points_repo.acreate_point(
+            title=normalized_title, latitude=latitude, longitude=longitude
+        )
+        logger.info(
+            "point_created id=%s lat=%s lon=%s has_title=%s",
+            created_point.id,
+            latitude,
+            longitude,
+            bool(normalized_title),
+        )
+        await sync_to_async(self._invalidate_caches)([(latitude, longitude)])
         return created_point
 
+    def bulk_create_points(
+        self, *, items: Sequence[dict[str, Any]], use_copy: bool = False
+    ) -> list[int]:
+        """Создаёт точки одной транзакцией; id возвращаются в порядке `items`."""
+        rows = [
+            {
+                "title": self._normalize_title(item.get("title")),
+                "latitude": item["latitude"],
+                "longitude": item["longitude"],
+            }
+            for item in items
+        ]
+        with transaction.atomic():
+            if use_copy:
+                created_ids = self._points_repo.copy_points(rows=rows)
+            else:
+                created_ids = self._points_repo.bulk_create_points(rows=rows)
+            self._invalidate_caches_on_commit([(row["latitude"], row["longitude"]) for row in rows])
+        logger.info(
+            "points_bulk_created count=%s method=%s",
+            len(created_ids),
+            "copy" if use_copy else "insert",
+        )
+        return created_ids
+
+    def _invalidate_caches_on_commit(self, locations: list[tuple[float, float]]) -> None:
+        # После коммита: иначе параллельный запрос успеет закэшировать тайл/поиск без новой точки.
+        transaction.on_commit(partial(self._invalidate_caches, locations))
+
+    def _invalidate_caches(self, locations: list[tuple[float, float]]) -> None:
+        self._tiles_service.invalidate_points(locations)
+        self._search_cache.invalidate(POINTS_KIND, locations)
+
     @staticmethod
     def _normalize_title(title: str | None) -> str | None:
         if title is None:
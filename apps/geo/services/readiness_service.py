@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger("apps.geo")
+
+# Запрос прогрева: заодно подгружает типы PostGIS (geometry/geography) в соединение.
+WARM_UP_SQL = "SELECT postgis_lib_version()"
+
+_warmed_up = threading.Event()
+
+
+class ReadinessService:
+    """
+    Прогрев соединений с БД при старте воркера и проверка готовности.
+
+    С пулом (`DB_POOL=1`) первый курсор открывает пул (остальные `min_size` соединений
+    пул добирает в фоне), и через соединение прогоняется запрос с типами PostGIS — первые
+    запросы пользователей не платят за TCP, аутентификацию и загрузку типов. Ожидание
+    соединения ограничено `DB_POOL_TIMEOUT`; ошибка прогрева не закрывает пул. Без пула постоянные соединения живут в
+    потоках запросов, поэтому прогрев только проверяет доступность БД.
+    """
+
+    def warm_up(self) -> bool:
+        try:
+            for alias in settings.DATABASES:
+                connection = connections[alias]
+                pool = connection.pool if connection.vendor == "postgresql" else None
+                with connection.cursor() as cursor:
+                    cursor.execute(WARM_UP_SQL)
+                if pool is not None:
+                    # Соединение возвращается в пул и достанется первому запросу.
+                    connection.close()
+        except Exception as exc:
+            logger.warning("db_warm_up_failed error=%s", exc)
+            return False
+        _warmed_up.set()
+        logger.info("db_warmed_up aliases=%s", ",".join(settings.DATABASES))
+        return True
+
+    def is_ready(self) -> bool:
+        """Прогрев выполнен (при необходимости — прямо сейчас) и БД отвечает."""
+        if not _warmed_up.is_set() and not self.warm_up():
+            return False
+        try:
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError as exc:
+            logger.warning("db_not_ready error=%s", exc)
+            return False
+        return True
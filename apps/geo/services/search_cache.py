@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("apps.geo")
+
+T = TypeVar("T")
+
+POINTS_KIND = "points"
+MESSAGES_KIND = "messages"
+
+# Консервативные оценки длины градуса (км): площадь поиска не должна выйти за найденные ячейки.
+KM_PER_DEGREE_LATITUDE = 110.0
+KM_PER_DEGREE_LONGITUDE_AT_EQUATOR = 111.0
+# Ближе к полюсу долготные ячейки вырождаются — такие поиски не кэшируются.
+MAX_CACHED_LATITUDE = 85.0
+
+
+class SearchCache:
+    """
+    Кэш ответов поиска в радиусе поверх Django cache API.
+
+    Центр и радиус округляются (`snap`), поиск выполняется уже по округлённым
+    значениям — поэтому одинаковый ключ всегда означает одинаковый результат.
+
+    Инвалидация точечная: у каждой ячейки сетки `SEARCH_CACHE_CELL_DEG` есть версия,
+    а ключ ответа включает версии всех ячеек, которые задевает круг поиска. Запись
+    меняет версию своей ячейки, и старые ответы просто перестают находиться (и
+    вытесняются по TTL).
+    """
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SEARCH_CACHE_TTL > 0
+
+    @staticmethod
+    def snap(*, latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float]:
+        return (
+            round(latitude, settings.SEARCH_CACHE_COORD_PRECISION),
+            round(longitude, settings.SEARCH_CACHE_COORD_PRECISION),
+            round(radius_km, settings.SEARCH_CACHE_RADIUS_PRECISION),
+        )
+
+    def get_or_compute(
+        self,
+        *,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        compute: Callable[[], T],
+        cacheable: Callable[[T], bool] | None = None,
+    ) -> T:
+        """`cacheable(result)` — класть ли вычисленный ответ в кэш (по умолчанию — всегда)."""
+        cells = self._cells_covering(latitude=latitude, longitude=longitude, radius_km=radius_km)
+        if cells is None:
+            return compute()
+
+        key = self._entry_key(
+            kind=kind,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            versions=self._cell_versions(kind, cells),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = compute()
+        if cacheable is None or cacheable(result):
+            cache.set(key, result, timeout=settings.SEARCH_CACHE_TTL)
+        return result
+
+    async def aget_or_compute(
+        self,
+        *,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """`get_or_compute` для async-кода: async API кэша, `compute` — корутина."""
+        cells = self._cells_covering(latitude=latitude, longitude=longitude, radius_km=radius_km)
+        if cells is None:
+            return await compute()
+
+        key = self._entry_key(
+            kind=kind,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            versions=await self._acell_versions(kind, cells),
+        )
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
+
+        result = await compute()
+        await cache.aset(key, result, timeout=settings.SEARCH_CACHE_TTL)
+        return result
+
+    def invalidate(self, kind: str, locations: Iterable[tuple[float, float]]) -> None:
+        """Новые версии ячеек, в которые попали `(lat, lon)`."""
+        cells = {self._cell_of(latitude=lat, longitude=lon) for lat, lon in locations}
+        if not cells:
+            return
+        version = time.time_ns()
+        cache.set_many({self._cell_key(kind, cell): version for cell in cells}, timeout=None)
+        logger.info("search_cache_invalidated kind=%s cells=%s", kind, len(cells))
+
+    def _cell_versions(self, kind: str, cells: list[tuple[int, int]]) -> list[int]:
+        keys = [self._cell_key(kind, cell) for cell in cells]
+        versions = cache.get_many(keys)
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            # Новое значение, а не 0: после вытеснения версии старые ответы не «оживут».
+            initial = time.time_ns()
+            for key in missing:
+                cache.add(key, initial, timeout=None)
+            versions.update(cache.get_many(missing))
+        return [versions.get(key, 0) for key in keys]
+
+    async def _acell_versions(self, kind: str, cells: list[tuple[int, int]]) -> list[int]:
+        keys = [self._cell_key(kind, cell) for cell in cells]
+        versions = await cache.aget_many(keys)
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            initial = time.time_ns()
+            for key in missing:
+                await cache.aadd(key, initial, timeout=None)
+            versions.update(await cache.aget_many(missing))
+        return [versions.get(key, 0) for key in keys]
+
+    @staticmethod
+    def _cells_covering(
+        *, latitude: float, longitude: float, radius_km: float
+    ) -> list[tuple[int, int]] | None:
+        """Ячейки, пересекающие описанный вокруг круга прямоугольник; `None` — не кэшировать."""
+        cell_deg = settings.SEARCH_CACHE_CELL_DEG
+        delta_lat = radius_km / KM_PER_DEGREE_LATITUDE
+        min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+        if max(abs(min_lat), abs(max_lat)) > MAX_CACHED_LATITUDE:
+            return None
+        cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        delta_lon = radius_km / (KM_PER_DEGREE_LONGITUDE_AT_EQUATOR * cos_lat)
+
+        columns_total = math.ceil(360.0 / cell_deg)
+        rows = range(
+            math.floor((min_lat + 90.0) / cell_deg), math.floor((max_lat + 90.0) / cell_deg) + 1
+        )
+        first_column = math.floor((longitude - delta_lon + 180.0) / cell_deg)
+        last_column = math.floor((longitude + delta_lon + 180.0) / cell_deg)
+        columns_count = min(last_column - first_column + 1, columns_total)
+        if len(rows) * columns_count > settings.SEARCH_CACHE_MAX_CELLS:
+            return None
+        # Остаток от деления «склеивает» сетку на антимеридиане.
+        columns = sorted(
+            {(first_column + offset) % columns_total for offset in range(columns_count)}
+        )
+        return [(row, column) for row in rows for column in columns]
+
+    @staticmethod
+    def _cell_of(*, latitude: float, longitude: float) -> tuple[int, int]:
+        cell_deg = settings.SEARCH_CACHE_CELL_DEG
+        columns_total = math.ceil(360.0 / cell_deg)
+        row = math.floor((latitude + 90.0) / cell_deg)
+        column = math.floor((longitude + 180.0) / cell_deg) % columns_total
+        return row, column
+
+    @staticmethod
+    def _cell_key(kind: str, cell: tuple[int, int]) -> str:
+        row, column = cell
+        cell_deg = settings.SEARCH_CACHE_CELL_DEG
+        return f"geo:search:cell:{kind}:{cell_deg}:{row}:{column}"
+
+    @staticmethod
+    def _entry_key(
+        *,
+        kind: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        versions: list[int],
+    ) -> str:
+        raw = json.dumps([latitude, longitude, radius_km, variant, versions], separators=(",", ":"))
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"geo:search:{kind}:{digest}"
+
+
+def request_variant(
+    *, base_url: str, query_params: Mapping[str, str], exclude: Iterable[str]
+) -> str:
+    """
+    Всё, кроме центра и радиуса, что влияет на ответ: страница, режим пагинации, курсор
+    и адрес эндпоинта (ссылки `next`/`previous` абсолютные).
+    """
+    excluded = set(exclude)
+    params = sorted((name, value) for name, value in query_params.items() if name not in excluded)
+    return json.dumps([base_url, params], separators=(",", ":"))
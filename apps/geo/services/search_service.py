@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+from typing import Any, TypeVar
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import router
 from django.db.models import QuerySet
 from rest_framework.exceptions import ValidationError
 
+from apps.geo.db_router import reads_pinned_to_primary
 from apps.geo.models.message import Message
 from apps.geo.models.point import Point
+from apps.geo.repositories.expressions import BoundingBox
 from apps.geo.repositories.messages_repo import MessagesRepository
 from apps.geo.repositories.points_repo import PointsRepository
+from apps.geo.services.search_cache import MESSAGES_KIND, POINTS_KIND, SearchCache
 
 logger = logging.getLogger("apps.geo")
 
+T = TypeVar("T")
+
 
 class SearchService:
     def __init__(
@@ -20,27 +30,333 @@ class SearchService:
         *,
         points_repo: PointsRepository | None = None,
         messages_repo: MessagesRepository | None = None,
+        search_cache: SearchCache | None = None,
     ) -> None:
         self._points_repo = points_repo or PointsRepository()
         self._messages_repo = messages_repo or MessagesRepository()
+        self._search_cache = search_cache or SearchCache()
 
     def search_points(
-        self, *, latitude: float, longitude: float, radius_km: float
-    ) -> QuerySet[Point]:
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        allow_index: bool = False,
+    ) -> QuerySet[dict[str, Any]] | Sequence[dict[str, Any]]:
+        """
+        `allow_index=True` разрешает вернуть результат in-process индекса — последовательность
+        без методов QuerySet (подходит для page-number пагинации, но не для keyset/выгрузки).
+        """
         self._validate_radius(radius_km)
         logger.info("points_search lat=%s lon=%s radius_km=%s", latitude, longitude, radius_km)
+        if allow_index:
+            indexed = self._points_repo.search_points_within_radius_indexed(
+                latitude=latitude, longitude=longitude, radius_km=radius_km
+            )
+            if indexed is not None:
+                return indexed
         return self._points_repo.search_points_within_radius(
             latitude=latitude, longitude=longitude, radius_km=radius_km
         )
 
     def search_messages(
-        self, *, latitude: float, longitude: float, radius_km: float
-    ) -> QuerySet[Message]:
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since_id: int | None = None,
+    ) -> QuerySet[dict[str, Any]]:
+        """`since_id` — только сообщения новее (id больше) последнего увиденного клиентом."""
         self._validate_radius(radius_km)
-        logger.info("messages_search lat=%s lon=%s radius_km=%s", latitude, longitude, radius_km)
+        logger.info(
+            "messages_search lat=%s lon=%s radius_km=%s since_id=%s",
+            latitude,
+            longitude,
+            radius_km,
+            since_id,
+        )
         return self._messages_repo.search_messages_within_radius(
+            latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+        )
+
+    def search_points_cached(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet[dict[str, Any]] | Sequence[dict[str, Any]]], T],
+        allow_index: bool = False,
+    ) -> T:
+        """
+        `render(search_points(...))` через кэш ответов; `variant` — остальные параметры
+        запроса, влияющие на ответ (страница, курсор).
+        """
+        return self._cached_search(
+            kind=POINTS_KIND,
+            search=partial(self.search_points, allow_index=allow_index),
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            render=render,
+        )
+
+    def search_messages_cached(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet[dict[str, Any]]], T],
+        since_id: int | None = None,
+    ) -> T:
+        return self._cached_search(
+            kind=MESSAGES_KIND,
+            search=partial(self.search_messages, since_id=since_id),
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            render=render,
+        )
+
+    def search_messages_validated(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet[dict[str, Any]]], T],
+        etag_for: Callable[[dict[str, int | None]], str],
+        is_fresh: Callable[[str], bool],
+        since_id: int | None = None,
+    ) -> tuple[str, T | None]:
+        """
+        `search_messages_cached` для условного GET: `(etag, тело)`; тело `None` — копия
+        клиента актуальна (`is_fresh(etag)`), и страница не запрашивалась.
+
+        Тег — `etag_for` от дешёвой пробы (`count`, `newest_id` по GiST-индексу). Проба и
+        страница идут в одну базу, проба первой: тег не может описывать выборку новее тела
+        (в худшем случае клиент лишний раз получит 200). В кэш поиска тег кладётся вместе
+        с телом, и при попадании в кэш БД не нужна вовсе.
+        """
+        self._validate_radius(radius_km)
+        use_cache = self._search_cache.enabled
+        if use_cache:
+            latitude, longitude, radius_km = self._search_cache.snap(
+                latitude=latitude, longitude=longitude, radius_km=radius_km
+            )
+            # После своей записи — мимо кэша, как в `_cached_search`.
+            use_cache = not reads_pinned_to_primary()
+
+        def compute() -> tuple[str, T | None]:
+            using = router.db_for_read(Message)
+            state = self._messages_repo.summarize_messages_within_radius(
+                latitude=latitude,
+                longitude=longitude,
+                radius_km=radius_km,
+                using=using,
+                since_id=since_id,
+            )
+            etag = etag_for(state)
+            if is_fresh(etag):
+                return etag, None
+            queryset = self.search_messages(
+                latitude=latitude, longitude=longitude, radius_km=radius_km, since_id=since_id
+            )
+            return etag, render(queryset.using(using))
+
+        if not use_cache:
+            return compute()
+        return self._search_cache.get_or_compute(
+            kind=MESSAGES_KIND,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            compute=compute,
+            cacheable=lambda entry: entry[1] is not None,
+        )
+
+    async def asearch_points_cached(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet[dict[str, Any]]], Awaitable[T]],
+    ) -> T:
+        """
+        `search_points_cached` для async-view: `render` — корутина (async ORM), кэш — через
+        async API. In-process индекс не используется: его поиск и догрузка синхронные.
+        """
+        return await self._acached_search(
+            kind=POINTS_KIND,
+            search=self.search_points,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            render=render,
+        )
+
+    async def asearch_messages_cached(
+        self,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet[dict[str, Any]]], Awaitable[T]],
+    ) -> T:
+        return await self._acached_search(
+            kind=MESSAGES_KIND,
+            search=self.search_messages,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            render=render,
+        )
+
+    def search_points_batch(
+        self, *, probes: Sequence[dict[str, float]], limit: int, dedupe: bool
+    ) -> list[dict[str, Any]]:
+        """
+        Поиск в радиусе для многих центров одним SQL. Результат выровнен по `probes`:
+        `{"index", "truncated", "points"}`; `truncated` — у центра больше `limit` точек.
+        С `dedupe` точка остаётся только у первого центра, в который попала (`limit`
+        применяется до удаления дублей).
+        """
+        for index, probe in enumerate(probes):
+            try:
+                self._validate_radius(probe["radius"])
+            except ValidationError as exc:
+                raise ValidationError({"probes": {str(index): exc.detail}}) from exc
+        logger.info("points_batch_search probes=%s limit=%s dedupe=%s", len(probes), limit, dedupe)
+
+        points = self._points_repo.search_points_within_radii(
+            probes=[(probe["latitude"], probe["longitude"], probe["radius"]) for probe in probes],
+            limit=limit + 1,
+        )
+        results = [
+            {"index": index, "truncated": False, "points": []} for index in range(len(probes))
+        ]
+        fetched = [0] * len(probes)
+        seen_ids: set[int] = set()
+        for point in points:
+            result = results[point.probe_index]
+            fetched[point.probe_index] += 1
+            if fetched[point.probe_index] > limit:
+                result["truncated"] = True
+                continue
+            if dedupe:
+                if point.id in seen_ids:
+                    continue
+                seen_ids.add(point.id)
+            result["points"].append(point)
+        return results
+
+    def search_points_in_bbox(self, *, bbox: BoundingBox) -> QuerySet[dict[str, Any]]:
+        logger.info("points_bbox_search bbox=%s", bbox)
+        return self._points_repo.search_points_in_bbox(bbox=bbox)
+
+    def search_messages_in_bbox(self, *, bbox: BoundingBox) -> QuerySet[dict[str, Any]]:
+        logger.info("messages_bbox_search bbox=%s", bbox)
+        return self._messages_repo.search_messages_in_bbox(bbox=bbox)
+
+    def nearest_points(self, *, latitude: float, longitude: float, limit: int) -> QuerySet[Point]:
+        logger.info("points_nearest lat=%s lon=%s limit=%s", latitude, longitude, limit)
+        return self._points_repo.find_nearest_points(
+            latitude=latitude, longitude=longitude, limit=limit
+        )
+
+    def nearest_messages(
+        self, *, latitude: float, longitude: float, limit: int
+    ) -> QuerySet[Message]:
+        logger.info("messages_nearest lat=%s lon=%s limit=%s", latitude, longitude, limit)
+        return self._messages_repo.find_latest_messages_on_nearest_points(
+            latitude=latitude, longitude=longitude, limit=limit
+        )
+
+    def cluster_points(self, *, bbox: BoundingBox, zoom: int) -> list[dict[str, Any]]:
+        # Ячейка ~ CLUSTER_CELL_PX пикселей тайла 256px на данном зуме.
+        grid_size_deg = 360.0 / (2**zoom) * settings.CLUSTER_CELL_PX / 256
+        logger.info("points_clusters bbox=%s zoom=%s grid_deg=%s", bbox, zoom, grid_size_deg)
+        return self._points_repo.cluster_points_in_bbox(
+            bbox=bbox, grid_size_deg=grid_size_deg, limit=settings.CLUSTER_MAX_ROWS
+        )
+
+    def _cached_search(
+        self,
+        *,
+        kind: str,
+        search: Callable[..., QuerySet | Sequence],
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet | Sequence], T],
+    ) -> T:
+        self._validate_radius(radius_km)
+        if not self._search_cache.enabled:
+            return render(search(latitude=latitude, longitude=longitude, radius_km=radius_km))
+
+        latitude, longitude, radius_km = self._search_cache.snap(
             latitude=latitude, longitude=longitude, radius_km=radius_km
         )
+        if reads_pinned_to_primary():
+            # После своей записи — мимо кэша: его мог заполнить запрос к отставшей реплике.
+            return render(search(latitude=latitude, longitude=longitude, radius_km=radius_km))
+        return self._search_cache.get_or_compute(
+            kind=kind,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            compute=lambda: render(
+                search(latitude=latitude, longitude=longitude, radius_km=radius_km)
+            ),
+        )
+
+    async def _acached_search(
+        self,
+        *,
+        kind: str,
+        search: Callable[..., QuerySet],
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        variant: str,
+        render: Callable[[QuerySet], Awaitable[T]],
+    ) -> T:
+        # `search` только строит QuerySet (без запросов), поэтому безопасен в event loop.
+        self._validate_radius(radius_km)
+        if not self._search_cache.enabled:
+            return await render(search(latitude=latitude, longitude=longitude, radius_km=radius_km))
+
+        latitude, longitude, radius_km = self._search_cache.snap(
+            latitude=latitude, longitude=longitude, radius_km=radius_km
+        )
+        if await sync_to_async(reads_pinned_to_primary)():
+            return await render(search(latitude=latitude, longitude=longitude, radius_km=radius_km))
+        return await self._search_cache.aget_or_compute(
+            kind=kind,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            variant=variant,
+            compute=lambda: render(
+                search(latitude=latitude, longitude=longitude, radius_km=radius_km)
+            ),
+        )
 
     @staticmethod
     def _validate_radius(radius_km: float) -> None:
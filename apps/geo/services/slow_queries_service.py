@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from apps.geo.repositories.query_sampler import SlowQueryLog
+
+logger = logging.getLogger("apps.geo")
+
+
+class SlowQueriesService:
+    def __init__(self, *, slow_query_log: SlowQueryLog | None = None) -> None:
+        self._slow_query_log = slow_query_log or SlowQueryLog()
+
+    def list_samples(self, *, route: str | None = None) -> list[dict[str, Any]]:
+        """Сэмплы EXPLAIN из кольцевого буфера, новые первыми; `route` — фильтр по маршруту."""
+        samples = self._slow_query_log.entries()
+        if route:
+            samples = [sample for sample in samples if sample["route"] == route]
+        return samples
+
+    def clear(self) -> None:
+        self._slow_query_log.clear()
+        logger.info("slow_query_samples_cleared")
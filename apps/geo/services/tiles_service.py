@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.geo.repositories.tiles_repo import TilesRepository
+
+logger = logging.getLogger("apps.geo")
+
+# Широта, на которой обрезается проекция Web Mercator.
+MAX_MERCATOR_LATITUDE = 85.0511287798066
+# Поколение кэша тайлов: смена поколения разом «сбрасывает» все тайлы.
+GENERATION_CACHE_KEY = "geo:tile:points:generation"
+
+
+class TilesService:
+    def __init__(self, tiles_repo: TilesRepository | None = None) -> None:
+        self._tiles_repo = tiles_repo or TilesRepository()
+
+    @staticmethod
+    def is_valid_tile(*, z: int, x: int, y: int) -> bool:
+        if not 0 <= z <= settings.TILE_MAX_ZOOM:
+            return False
+        tiles_per_axis = 2**z
+        return 0 <= x < tiles_per_axis and 0 <= y < tiles_per_axis
+
+    def get_points_tile(self, *, z: int, x: int, y: int) -> bytes:
+        if settings.TILE_CACHE_TTL <= 0:
+            return self._tiles_repo.render_points_tile(z=z, x=x, y=y)
+
+        cache_key = self._cache_key(generation=self._generation(), z=z, x=x, y=y)
+        tile = cache.get(cache_key)
+        if tile is not None:
+            return tile
+
+        tile = self._tiles_repo.render_points_tile(z=z, x=x, y=y)
+        cache.set(cache_key, tile, timeout=settings.TILE_CACHE_TTL)
+        logger.info("points_tile_rendered z=%s x=%s y=%s bytes=%s", z, x, y, len(tile))
+        return tile
+
+    def invalidate_points(self, locations: Iterable[tuple[float, float]]) -> None:
+        """
+        Сбрасывает закэшированные тайлы всех зумов, в которые попадают `(lat, lon)`.
+
+        Для больших пачек (импорт) точечное удаление дороже полного сброса —
+        тогда просто меняется поколение кэша.
+        """
+        tiles = {
+            (z, x, y)
+            for latitude, longitude in locations
+            for z in range(settings.TILE_MAX_ZOOM + 1)
+            for x, y in self._tiles_containing(latitude=latitude, longitude=longitude, z=z)
+        }
+        if not tiles or settings.TILE_CACHE_TTL <= 0:
+            return
+        if len(tiles) > settings.TILE_INVALIDATION_MAX_KEYS:
+            cache.set(GENERATION_CACHE_KEY, time.time_ns(), timeout=None)
+            logger.info("points_tiles_generation_bumped tiles=%s", len(tiles))
+            return
+        generation = self._generation()
+        cache.delete_many(
+            [self._cache_key(generation=generation, z=z, x=x, y=y) for z, x, y in tiles]
+        )
+
+    @staticmethod
+    def _generation() -> int:
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if generation is None:
+            # Новое значение, а не 0: после вытеснения ключа старые тайлы не «оживут».
+            cache.add(GENERATION_CACHE_KEY, time.time_ns(), timeout=None)
+            generation = cache.get(GENERATION_CACHE_KEY)
+        return generation
+
+    @staticmethod
+    def _tiles_containing(*, latitude: float, longitude: float, z: int) -> set[tuple[int, int]]:
+        tiles_per_axis = 2**z
+        latitude = max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, latitude))
+        tile_x = (longitude + 180.0) / 360.0 * tiles_per_axis
+        lat_rad = math.radians(latitude)
+        tile_y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * tiles_per_axis
+
+        # Точка ровно на границе попадает в оба соседних тайла (фильтр `&&` включает границу).
+        xs = {math.floor(tile_x)} | ({int(tile_x) - 1} if tile_x == int(tile_x) else set())
+        ys = {math.floor(tile_y)} | ({int(tile_y) - 1} if tile_y == int(tile_y) else set())
+        return {
+            (x, y) for x in xs for y in ys if 0 <= x < tiles_per_axis and 0 <= y < tiles_per_axis
+        }
+
+    @staticmethod
+    def _cache_key(*, generation: int, z: int, x: int, y: int) -> str:
+        return f"geo:tile:points:{generation}:{z}:{x}:{y}"
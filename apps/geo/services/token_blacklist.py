@@ -0,0 +1,193 @@
+"""
+Фильтр Блума по jti токенов из чёрного списка simplejwt: проверка refresh-токена идёт в БД
+только если фильтр ответил «возможно» (ложноположительных — `TOKEN_BLACKLIST_FILTER_FP_RATE`).
+«Нет» от фильтра точное для всего, что он видел.
+
+Фильтр процесса строится при первой проверке, дальше его обновляет фоновый поток: раз в
+`TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS` догружает новые записи (по `blacklisted_at` с
+перекрытием `TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS`) и раз в
+`TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS` пересобирает целиком — истёкшие токены выпадают,
+размер подстраивается. Запросы к БД и блокировка обновления на пути запроса не лежат.
+
+Токен, добавленный в список в другом воркере, до догрузки виден через метку в общем
+кэше (`CACHE_BACKEND`). С LocMem метка видна только своему процессу и повторное
+использование ротированного токена в другом воркере возможно до догрузки, поэтому по
+умолчанию фильтр включён только с общим кэшем. Если фоновая догрузка отстала дольше, чем
+живёт метка, фильтру не доверяем и проверяем в БД.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.geo.repositories.token_blacklist_repo import TokenBlacklistRepository
+
+logger = logging.getLogger("apps.geo")
+
+CACHE_KEY_PREFIX = "geo:jwtbl"
+MIN_CAPACITY = 1024
+
+
+class BloomFilter:
+    """Битовый массив на `bytearray`, k позиций двойным хешированием blake2b."""
+
+    def __init__(self, *, capacity: int, fp_rate: float) -> None:
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        # Повторы (перекрытие догрузки) не считаются: `count` — оценка заполненности.
+        if item in self:
+            return
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item)
+        )
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+
+class TokenBlacklistFilter:
+    def __init__(self, *, repo: TokenBlacklistRepository | None = None) -> None:
+        self._repo = repo or TokenBlacklistRepository()
+        self._lock = threading.Lock()
+        self._bloom: BloomFilter | None = None
+        self._watermark: datetime | None = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self._thread: threading.Thread | None = None
+
+    def might_contain(self, jti: str) -> bool:
+        """`False` — токена точно нет в списке; `True` — нужна проверка в БД."""
+        if self._bloom is None:
+            # Первая проверка в процессе строит фильтр сама, дальше — фоновый поток.
+            self.refresh()
+            self._ensure_refreshing()
+        if time.monotonic() - self._refreshed_at > _recent_ttl():
+            # Догрузка отстала (например, БД была недоступна): метки недавних записей
+            # уже могли истечь, поэтому «нет» фильтра больше не точное.
+            return True
+        return jti in self._bloom or cache.get(self._recent_key(jti)) is not None
+
+    def add(self, jti: str) -> None:
+        """Токен только что попал в список (сигнал `post_save`, см. `GeoConfig.ready`)."""
+        cache.set(self._recent_key(jti), 1, timeout=_recent_ttl())
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def refresh(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._refreshed_at < settings.TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if (
+                not force
+                and now - self._refreshed_at < settings.TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS
+            ):
+                return
+            if (
+                force
+                or self._bloom is None
+                or self._bloom.count >= self._bloom.capacity
+                or now - self._rebuilt_at >= settings.TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS
+            ):
+                self._rebuild()
+                self._rebuilt_at = now
+            else:
+                self._catch_up()
+            self._refreshed_at = now
+
+    def _rebuild(self) -> None:
+        started = timezone.now()
+        rows = list(self._repo.blacklisted_jtis(since=None, now=started))
+        bloom = BloomFilter(
+            capacity=max(MIN_CAPACITY, len(rows) * 2),
+            fp_rate=settings.TOKEN_BLACKLIST_FILTER_FP_RATE,
+        )
+        for jti, _ in rows:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._watermark = max([started, *(blacklisted_at for _, blacklisted_at in rows)])
+        logger.info("token_blacklist_filter_rebuilt count=%s bits=%s", len(rows), bloom.size)
+
+    def _catch_up(self) -> None:
+        overlap = timedelta(seconds=settings.TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS)
+        for jti, blacklisted_at in self._repo.blacklisted_jtis(
+            since=self._watermark - overlap, now=timezone.now()
+        ):
+            self._bloom.add(jti)
+            self._watermark = max(self._watermark, blacklisted_at)
+
+    def _ensure_refreshing(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_forever, name="geo-token-blacklist-filter", daemon=True
+            )
+            self._thread.start()
+
+    def _refresh_forever(self) -> None:
+        while True:
+            time.sleep(settings.TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("token_blacklist_filter_refresh_failed")
+
+    @staticmethod
+    def _recent_key(jti: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{jti}"
+
+
+def _recent_ttl() -> float:
+    # Метка должна дожить до догрузки, которая гарантированно подхватит запись.
+    return (
+        settings.TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS
+        + settings.TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS
+    )
+
+
+_filter: TokenBlacklistFilter | None = None
+_filter_lock = threading.Lock()
+
+
+def get_token_blacklist_filter() -> TokenBlacklistFilter | None:
+    """Фильтр процесса или `None`, если он выключен (`TOKEN_BLACKLIST_FILTER=0`)."""
+    global _filter
+    if not settings.TOKEN_BLACKLIST_FILTER:
+        return None
+    if _filter is None:
+        with _filter_lock:
+            if _filter is None:
+                _filter = TokenBlacklistFilter()
+    return _filter
+
+
+def remember_blacklisted_token(sender: Any, instance: Any, created: bool, **kwargs: Any) -> None:
+    """Обработчик `post_save` для `BlacklistedToken`."""
+    blacklist_filter = get_token_blacklist_filter()
+    if created and blacklist_filter is not None:
+        blacklist_filter.add(instance.token.jti)
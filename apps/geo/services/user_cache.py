@@ -0,0 +1,114 @@
+"""
+Кэш пользователей для JWT-аутентификации: без него каждый запрос с токеном читает строку
+`auth_user` по pk.
+
+Два уровня: словарь в памяти процесса (`AUTH_USER_LOCAL_TTL`, несколько секунд) и общий
+Django cache (`AUTH_USER_CACHE_TTL`) — только если кэш действительно общий (`CACHE_IS_SHARED`):
+в LocMem сброс записи не дошёл бы до других воркеров. `save()`/`delete()` пользователя
+(сигналы, см. `GeoConfig.ready`) удаляют запись из общего кэша и из памяти своего процесса; в
+остальных воркерах старая копия живёт не дольше `AUTH_USER_LOCAL_TTL`. `QuerySet.update()`
+сигналов не шлёт — после него запись уходит по TTL.
+
+Кэшируется не экземпляр модели, а несколько полей (`CACHED_USER_FIELDS`) и дайджест хэша
+пароля для `CHECK_REVOKE_TOKEN` — сам хэш в кэш не попадает.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+CACHE_KEY_PREFIX = "geo:authuser"
+LOCAL_MAX_USERS = 10000
+# Кроме pk и USERNAME_FIELD: то, что проверяют аутентификация и permission-классы.
+CACHED_USER_FIELDS = ("is_active", "is_staff", "is_superuser")
+
+
+class UserCache:
+    def __init__(self) -> None:
+        self._local: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AUTH_USER_CACHE_TTL > 0
+
+    def get(self, user_id: Any) -> tuple[Any, str] | None:
+        """
+        `(пользователь, дайджест хэша пароля)` или `None`. Пользователь — новый экземпляр с
+        закэшированными полями; остальные поля отложенные (загрузятся из БД при обращении,
+        `save()` запишет только загруженные).
+        """
+        if not self.enabled:
+            return None
+        key = self._key(user_id)
+        now = time.monotonic()
+        with self._lock:
+            expires, snapshot = self._local.get(key, (0.0, None))
+        if expires <= now:
+            snapshot = cache.get(key) if settings.CACHE_IS_SHARED else None
+            if snapshot is None:
+                return None
+            self._remember(key, snapshot, now)
+        user_model = get_user_model()
+        fields = snapshot["fields"]
+        user = user_model.from_db(
+            router.db_for_read(user_model), list(fields), list(fields.values())
+        )
+        return user, snapshot["password_digest"]
+
+    def set(self, user_id: Any, user: Any) -> None:
+        if not self.enabled:
+            return
+        key = self._key(user_id)
+        snapshot = {
+            "fields": {attname: getattr(user, attname) for attname in _cached_attnames()},
+            "password_digest": get_md5_hash_password(user.password),
+        }
+        if settings.CACHE_IS_SHARED:
+            cache.set(key, snapshot, timeout=settings.AUTH_USER_CACHE_TTL)
+        self._remember(key, snapshot, time.monotonic())
+
+    def invalidate(self, user_id: Any) -> None:
+        key = self._key(user_id)
+        with self._lock:
+            self._local.pop(key, None)
+        cache.delete(key)
+
+    def _remember(self, key: str, snapshot: dict[str, Any], now: float) -> None:
+        with self._lock:
+            if len(self._local) >= LOCAL_MAX_USERS:
+                self._local.clear()
+            self._local[key] = (now + settings.AUTH_USER_LOCAL_TTL, snapshot)
+
+    @staticmethod
+    def _key(user_id: Any) -> str:
+        return f"{CACHE_KEY_PREFIX}:{user_id}"
+
+
+def _cached_attnames() -> list[str]:
+    # В порядке concrete_fields — его ожидает `Model.from_db`.
+    user_model = get_user_model()
+    names = {user_model._meta.pk.name, user_model.USERNAME_FIELD, *CACHED_USER_FIELDS}
+    return [field.attname for field in user_model._meta.concrete_fields if field.name in names]
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """
+    Обработчик `post_save`/`post_delete` модели пользователя. Второй раз — после коммита:
+    конкурентный запрос мог успеть закэшировать строку из ещё не закоммиченной версии.
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    user_cache.invalidate(user_id)
+    transaction.on_commit(lambda: user_cache.invalidate(user_id), using=kwargs.get("using"))
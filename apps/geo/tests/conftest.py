@@ -1,9 +1,23 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_throttle_purge(settings):
+    # Попутная чистка geo_rate_limits добавляла бы запрос к случайному тесту.
+    settings.THROTTLE_PURGE_EVERY = 0
+
+
 @pytest.fixture()
 def api_client() -> APIClient:
     return APIClient()
@@ -1,5 +1,13 @@
+import json
+from io import StringIO
 from uuid import uuid4
 
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
 
 def test_admin_test_user_endpoint_requires_authentication(api_client):
     username = f"u_{uuid4().hex}"
@@ -34,3 +42,61 @@ def test_admin_test_user_endpoint_creates_user(admin_client):
     assert resp.status_code == 201
     assert resp.data["id"] > 0
     assert resp.data["username"] == username
+
+
+def test_admin_bulk_test_users_issue_working_tokens_and_skip_conflicts(admin_client, user):
+    resp = admin_client.post(
+        "/api/admin/test-users/bulk/",
+        data={"usernames": ["user", "load_a", "load_b"], "password": "S0mething-Longer_123"},
+        format="json",
+    )
+
+    assert resp.status_code == 201
+    assert resp.data["created"] == 2
+    assert resp.data["conflicts"] == ["user"]
+    assert [item["username"] for item in resp.data["users"]] == ["load_a", "load_b"]
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {resp.data['users'][0]['access']}")
+    search = client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=5")
+    assert search.status_code == 200
+
+
+def test_create_test_users_command_writes_ndjson(db, tmp_path):
+    output = tmp_path / "users.ndjson"
+
+    call_command(
+        "create_test_users",
+        count=3,
+        prefix="cmd_",
+        password="S0mething-Longer_123",
+        output=output,
+        stderr=StringIO(),
+    )
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [record["username"] for record in records] == ["cmd_1", "cmd_2", "cmd_3"]
+    assert all(record["refresh"] for record in records)
+    assert User.objects.get(username="cmd_2").check_password("S0mething-Longer_123")
+
+
+def test_admin_bulk_test_users_returns_200_when_all_names_are_taken(admin_client, user):
+    resp = admin_client.post(
+        "/api/admin/test-users/bulk/",
+        data={"usernames": ["user"], "password": "S0mething-Longer_123"},
+        format="json",
+    )
+
+    assert resp.status_code == 200
+    assert resp.data["created"] == 0
+    assert resp.data["conflicts"] == ["user"]
+
+
+def test_admin_bulk_test_users_rejects_invalid_usernames(admin_client):
+    resp = admin_client.post(
+        "/api/admin/test-users/bulk/",
+        data={"usernames": ["load ok", "load/slash"], "password": "S0mething-Longer_123"},
+        format="json",
+    )
+
+    assert resp.status_code == 400
+    assert not User.objects.filter(username__startswith="load").exists()
@@ -0,0 +1,56 @@
+from django.contrib.gis.geos import Point as GeoPoint
+
+from apps.geo.models.message import Message
+from apps.geo.models.point import Point
+
+SEARCH_QUERY = "latitude=55.751244&longitude=37.618423&radius=2"
+
+
+def _create_point(*, title: str, latitude: float, longitude: float) -> Point:
+    location = GeoPoint(longitude, latitude, srid=4326)
+    return Point.objects.create(title=title, location=location)
+
+
+def test_async_search_requires_authentication(api_client, db):
+    resp = api_client.get(f"/api/async/points/search/?{SEARCH_QUERY}")
+    assert resp.status_code == 401
+
+
+def test_async_create_point_and_search_match_sync_endpoints(auth_client, db):
+    created = auth_client.post(
+        "/api/async/points/",
+        data={"title": "  async  ", "latitude": 55.751244, "longitude": 37.618423},
+        format="json",
+    )
+    assert created.status_code == 201
+    assert created.data["title"] == "async"
+    _create_point(title="far", latitude=56.751244, longitude=37.618423)
+
+    for query in (SEARCH_QUERY, f"{SEARCH_QUERY}&pagination=cursor"):
+        async_resp = auth_client.get(f"/api/async/points/search/?{query}")
+        sync_resp = auth_client.get(f"/api/points/search/?{query}")
+        assert async_resp.status_code == 200
+        assert [p["id"] for p in async_resp.data["results"]] == [created.data["id"]]
+        assert async_resp.data["results"] == sync_resp.data["results"]
+    assert async_resp.data["next"] is None
+
+
+def test_async_create_message_and_search_messages(auth_client, user, db):
+    point = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+
+    missing = auth_client.post(
+        "/api/async/points/messages/", data={"point_id": 999999, "text": "x"}, format="json"
+    )
+    assert missing.status_code == 404
+
+    created = auth_client.post(
+        "/api/async/points/messages/", data={"point_id": point.id, "text": " hi "}, format="json"
+    )
+    assert created.status_code == 201
+    assert created.data["author"] == user.username
+    assert Message.objects.get(id=created.data["id"]).text == "hi"
+
+    resp = auth_client.get(f"/api/async/points/messages/search/?{SEARCH_QUERY}")
+    assert resp.status_code == 200
+    assert resp.data["count"] == 1
+    assert resp.data["results"][0]["id"] == created.data["id"]
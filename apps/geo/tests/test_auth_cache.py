@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.geo.services.user_cache import CACHE_KEY_PREFIX
+
+SEARCH_URL = "/api/points/search/?latitude=55.75&longitude=37.61&radius=5"
+
+
+def _auth_user_queries(captured: CaptureQueriesContext) -> list[str]:
+    return [query["sql"] for query in captured.captured_queries if '"auth_user"' in query["sql"]]
+
+
+def test_cached_user_skips_auth_user_query(auth_client):
+    assert auth_client.get(SEARCH_URL).status_code == 200
+
+    with CaptureQueriesContext(connection) as captured:
+        assert auth_client.get(SEARCH_URL).status_code == 200
+
+    assert _auth_user_queries(captured) == []
+
+
+def test_deactivated_user_is_rejected_immediately(auth_client, user):
+    assert auth_client.get(SEARCH_URL).status_code == 200
+
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+
+    assert auth_client.get(SEARCH_URL).status_code == 401
+
+
+def test_shared_cache_holds_user_fields_without_password_hash(auth_client, user):
+    assert auth_client.get(SEARCH_URL).status_code == 200
+    # LocMem не общий: только копия в памяти процесса.
+    assert cache.get(f"{CACHE_KEY_PREFIX}:{user.pk}") is None
+
+    user.save()
+    with override_settings(CACHE_IS_SHARED=True):
+        assert auth_client.get(SEARCH_URL).status_code == 200
+        snapshot = cache.get(f"{CACHE_KEY_PREFIX}:{user.pk}")
+
+    assert snapshot["fields"]["username"] == "user"
+    assert user.password not in repr(snapshot)
+
+
+@override_settings(JWT_STATELESS_READS=True, AUTH_USER_CACHE_TTL=0)
+def test_stateless_reads_use_token_claims_only(auth_client):
+    with CaptureQueriesContext(connection) as captured:
+        assert auth_client.get(SEARCH_URL).status_code == 200
+        resp = auth_client.post(
+            "/api/points/", {"latitude": 55.75, "longitude": 37.61}, format="json"
+        )
+
+    assert resp.status_code == 201
+    # Только создание точки загрузило пользователя.
+    assert len(_auth_user_queries(captured)) == 1
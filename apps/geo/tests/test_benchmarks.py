@@ -0,0 +1,61 @@
+import random
+from io import StringIO
+
+from django.core.management import call_command
+
+from apps.geo.benchmarks.dataset import generate_points, zipf_sampler
+from apps.geo.benchmarks.runner import compare_runs
+from apps.geo.benchmarks.scenarios import missing_scenarios
+from apps.geo.models.message import Message
+from apps.geo.models.point import Point
+from apps.geo.routers.urls import urlpatterns
+
+
+def test_every_route_has_benchmark_scenario():
+    assert missing_scenarios([pattern.name for pattern in urlpatterns]) == []
+
+
+def test_dataset_generators_are_seeded_and_skewed():
+    first = list(generate_points(random.Random(1), count=200))
+    assert first == list(generate_points(random.Random(1), count=200))
+    assert all(-90 <= row["latitude"] <= 90 and -180 <= row["longitude"] < 180 for row in first)
+
+    sampler = zipf_sampler(random.Random(1), exponent=1.3, maximum=50)
+    counts = [next(sampler) for _ in range(2000)]
+    assert 0 <= min(counts) and max(counts) < 50
+    # Zipf: больше всего точек без сообщений, хвост длинный.
+    assert counts.count(0) > counts.count(1) > counts.count(10)
+
+
+def test_generate_dataset_loads_points_and_messages(db):
+    call_command(
+        "generate_dataset",
+        points=25,
+        authors=2,
+        batch_size=10,
+        max_messages_per_point=4,
+        stdout=StringIO(),
+    )
+
+    assert Point.objects.count() == 25
+    assert Message.objects.exists()
+    message = Message.objects.select_related("point", "author").first()
+    assert message.location == message.point.location
+    assert message.author.username.startswith("bench_author_")
+
+
+def test_compare_runs_flags_latency_and_query_regressions():
+    def report(p95: float, queries: float) -> dict:
+        return {
+            "scenarios": [
+                {
+                    "name": "points-search",
+                    "latency_ms": {"p95": p95},
+                    "queries_per_request": {"mean": queries},
+                }
+            ]
+        }
+
+    assert compare_runs(report(10, 2), report(11, 2), threshold=0.2)[0]["regressed"] is False
+    assert compare_runs(report(10, 2), report(13, 2), threshold=0.2)[0]["regressed"] is True
+    assert compare_runs(report(10, 2), report(10, 3), threshold=0.2)[0]["regressed"] is True
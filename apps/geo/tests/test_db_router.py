@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from apps.geo.checks import check_replicas_have_shared_cache
+from apps.geo.db_router import PrimaryReplicaRouter, sticky_cache_entry
+from apps.geo.middleware import ReplicaStickinessMiddleware
+from apps.geo.models.point import Point
+
+User = get_user_model()
+
+
+def _route_read_during(request, *, status: int = 200) -> list[str]:
+    routed: list[str] = []
+
+    def view(req):
+        routed.append(PrimaryReplicaRouter().db_for_read(Point))
+        return HttpResponse(status=status)
+
+    ReplicaStickinessMiddleware(view)(request)
+    return routed
+
+
+@override_settings(DB_REPLICAS=["replica_1"])
+def test_router_reads_geo_models_from_replica_and_writes_to_primary():
+    db_router = PrimaryReplicaRouter()
+    assert db_router.db_for_read(Point) == "replica_1"
+    assert db_router.db_for_write(Point) == "default"
+    # Пользователи и прочие модели — только primary.
+    assert db_router.db_for_read(User) == "default"
+    assert db_router.allow_migrate("replica_1", "geo") is False
+
+
+@override_settings(DB_REPLICAS=["replica_1"], DB_REPLICA_STICKINESS_SECONDS=5)
+def test_user_reads_go_to_primary_after_own_write(user):
+    factory = RequestFactory()
+
+    write = factory.post("/api/points/")
+    write.user = user
+    assert _route_read_during(write, status=201) == ["default"]
+
+    own_read = factory.get("/api/points/search/")
+    own_read.user = user
+    assert _route_read_during(own_read) == ["default"]
+
+    other_read = factory.get("/api/points/search/")
+    other_read.user = User(pk=user.pk + 1, username="other")
+    assert _route_read_during(other_read) == ["replica_1"]
+
+
+@override_settings(DB_REPLICAS=["replica_1"], DB_REPLICA_STICKINESS_SECONDS=5)
+def test_failed_write_does_not_pin_user_reads(user):
+    factory = RequestFactory()
+
+    write = factory.post("/api/points/")
+    write.user = user
+    _route_read_during(write, status=400)
+
+    read = factory.get("/api/points/search/")
+    read.user = user
+    assert _route_read_during(read) == ["replica_1"]
+
+
+@override_settings(DB_REPLICAS=["replica_1"], DB_REPLICA_STICKINESS_SECONDS=5, SEARCH_CACHE_TTL=30)
+def test_stickiness_outlives_search_cache_entries(user):
+    write = RequestFactory().post("/api/points/")
+    write.user = user
+    _, timeout = sticky_cache_entry(write)
+    assert timeout == 35
+
+
+@override_settings(DB_REPLICAS=["replica_1"], CACHE_IS_SHARED=False)
+def test_replicas_without_shared_cache_fail_system_check():
+    assert [error.id for error in check_replicas_have_shared_cache()] == ["geo.E001"]
+
+    with override_settings(CACHE_IS_SHARED=True):
+        assert check_replicas_have_shared_cache() == []
@@ -0,0 +1,55 @@
+import json
+
+from django.contrib.gis.geos import Point as GeoPoint
+
+from apps.geo.models.message import Message
+from apps.geo.models.point import Point
+
+
+def _create_point(*, title: str, latitude: float, longitude: float) -> Point:
+    location = GeoPoint(longitude, latitude, srid=4326)
+    return Point.objects.create(title=title, location=location)
+
+
+def test_export_points_streams_ndjson(auth_client, db):
+    center = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+    _create_point(title="far", latitude=55.781244, longitude=37.618423)
+
+    resp = auth_client.get(
+        "/api/points/search/export/?latitude=55.751244&longitude=37.618423&radius=1"
+    )
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/x-ndjson"
+
+    lines = b"".join(resp.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == [center.id]
+    assert rows[0]["latitude"] == 55.751244
+    assert rows[0]["title"] == "center"
+
+
+def test_export_messages_streams_geojson_feature_collection(auth_client, user, db):
+    point = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+    message = Message.objects.create(point=point, author=user, text="hello")
+
+    resp = auth_client.get(
+        "/api/points/messages/search/export/"
+        "?latitude=55.751244&longitude=37.618423&radius=1&output=geojson",
+        HTTP_ACCEPT="application/geo+json",
+    )
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/geo+json"
+
+    collection = json.loads(b"".join(resp.streaming_content))
+    assert collection["type"] == "FeatureCollection"
+    (feature,) = collection["features"]
+    assert feature["id"] == message.id
+    assert feature["geometry"]["coordinates"] == [37.618423, 55.751244]
+    assert feature["properties"]["author"] == user.username
+
+
+def test_export_rejects_unknown_output(auth_client, db):
+    resp = auth_client.get(
+        "/api/points/search/export/?latitude=55&longitude=37&radius=1&output=csv"
+    )
+    assert resp.status_code == 400
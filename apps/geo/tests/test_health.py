@@ -0,0 +1,40 @@
+from django.db import connection
+
+from apps.geo.services.readiness_service import ReadinessService
+
+
+def test_readiness_returns_200_without_auth_when_db_is_available(api_client, db):
+    resp = api_client.get("/api/health/ready/")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ready"}
+
+
+def test_readiness_returns_503_when_warm_up_fails(api_client, db, monkeypatch):
+    from apps.geo.services import readiness_service
+
+    monkeypatch.setattr(readiness_service, "WARM_UP_SQL", "SELECT missing_function()")
+    monkeypatch.setattr(readiness_service, "_warmed_up", readiness_service.threading.Event())
+
+    resp = api_client.get("/api/health/ready/")
+    assert resp.status_code == 503
+    assert resp.json() == {"status": "unavailable"}
+
+
+def test_warm_up_opens_pool_and_returns_connection_to_it(transactional_db, monkeypatch):
+    connection.close()
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+    monkeypatch.setitem(
+        connection.settings_dict,
+        "OPTIONS",
+        {
+            **connection.settings_dict["OPTIONS"],
+            "pool": {"min_size": 1, "max_size": 2, "timeout": 5},
+        },
+    )
+    try:
+        # Пул ещё не открыт: прогрев открывает его сам, а не падает на PoolClosed.
+        assert ReadinessService().warm_up()
+        assert not connection.pool.closed
+        assert connection.connection is None
+    finally:
+        connection.close_pool()
@@ -0,0 +1,117 @@
+from datetime import UTC, datetime
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from apps.geo.services.exceptions import LiveFeedBacklogTruncatedError
+from apps.geo.services.live_feed import (
+    LiveFeedBroker,
+    LiveFeedService,
+    Subscription,
+    SubscriptionIndex,
+    _event_payload,
+)
+
+
+@override_settings(LIVE_FEED_CELL_DEG=0.1, LIVE_FEED_MAX_CELLS=256)
+def test_subscription_index_matches_exact_circle_across_antimeridian():
+    index = SubscriptionIndex()
+    east = Subscription(latitude=0.0, longitude=179.99, radius_km=5)
+    far = Subscription(latitude=10.0, longitude=10.0, radius_km=5)
+    index.add(east)
+    index.add(far)
+
+    # Точка по ту сторону антимеридиана — в ~3 км от центра подписки.
+    assert index.match(latitude=0.0, longitude=-179.985) == [east]
+    # Ячейка задета кругом, но точка за радиусом.
+    assert index.match(latitude=0.06, longitude=179.99) == []
+
+    index.remove(east)
+    assert index.match(latitude=0.0, longitude=-179.985) == []
+    assert len(index) == 1
+
+
+@override_settings(LIVE_FEED_QUEUE_SIZE=10)
+def test_broker_dispatches_only_to_subscriptions_covering_message():
+    broker = LiveFeedBroker()
+    near = Subscription(latitude=55.75, longitude=37.61, radius_km=1)
+    far = Subscription(latitude=59.93, longitude=30.33, radius_km=1)
+    broker._index.add(near)
+    broker._index.add(far)
+    created_at = datetime(2024, 1, 1, tzinfo=UTC)
+
+    payload = _event_payload(
+        {
+            "id": 5,
+            "point_id": 1,
+            "text": "привет",
+            "created_at": created_at,
+            "author_username": "user",
+            "latitude": 55.751,
+            "longitude": 37.611,
+        }
+    )
+
+    assert broker.dispatch(payload) == 1
+    assert near.get(timeout=0)["created_at"] == created_at
+    assert far.get(timeout=0) is None
+
+
+def _offline_service(monkeypatch) -> LiveFeedService:
+    broker = LiveFeedBroker()
+    monkeypatch.setattr(broker, "_ensure_listening", lambda: None)
+    return LiveFeedService(broker=broker)
+
+
+@override_settings(LIVE_FEED_BACKLOG_LIMIT=2, LIVE_FEED_HEARTBEAT_SECONDS=0)
+def test_follow_skips_backlog_duplicates_but_not_late_lower_ids(monkeypatch):
+    subscription = Subscription(latitude=55.75, longitude=37.61, radius_km=1)
+    rows = _offline_service(monkeypatch)._follow(subscription, backlog=[{"id": 3}, {"id": 5}])
+    assert [next(rows), next(rows)] == [{"id": 3}, {"id": 5}]
+
+    # id 5 уже отдан из backlog; id 4 выдан раньше, но закоммичен позже — его нужно отдать.
+    subscription.deliver({"id": 5})
+    subscription.deliver({"id": 4})
+    assert next(rows) == {"id": 4}
+    assert next(rows) is None
+
+
+@override_settings(LIVE_FEED_BACKLOG_LIMIT=2)
+def test_follow_reports_truncated_backlog(monkeypatch):
+    service = _offline_service(monkeypatch)
+    subscription = Subscription(latitude=55.75, longitude=37.61, radius_km=1)
+    rows = service._follow(subscription, backlog=[{"id": 3}, {"id": 4}, {"id": 5}])
+
+    assert [next(rows), next(rows)] == [{"id": 3}, {"id": 4}]
+    with pytest.raises(LiveFeedBacklogTruncatedError):
+        next(rows)
+    assert len(service._broker._index) == 0
+
+
+@override_settings(LIVE_FEED_HEARTBEAT_SECONDS=0)
+def test_follow_releases_db_connection_while_waiting(monkeypatch, transactional_db):
+    connection.ensure_connection()
+    subscription = Subscription(latitude=55.75, longitude=37.61, radius_km=1)
+    rows = _offline_service(monkeypatch)._follow(subscription, backlog=[{"id": 3}])
+
+    assert next(rows) == {"id": 3}
+    assert connection.connection is not None
+    # Ожидание событий: соединение запроса возвращено, лента читает только очередь.
+    assert next(rows) is None
+    assert connection.connection is None
+
+
+def test_messages_stream_validates_area(auth_client):
+    response = auth_client.get(
+        "/api/points/messages/stream/", {"latitude": 55.75, "longitude": 37.61, "radius": -1}
+    )
+    assert response.status_code == 400
+
+    response = auth_client.get(
+        "/api/points/messages/stream/",
+        {"latitude": 55.75, "longitude": 37.61, "radius": 1},
+        HTTP_LAST_EVENT_ID="abc",
+    )
+    assert response.status_code == 400
+    assert "since" in response.json()
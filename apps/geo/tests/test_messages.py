@@ -45,3 +45,58 @@ def test_create_message_creates_message(auth_client, user, db):
     assert msg.point_id == point.id
     assert msg.author_id == user.id
     assert msg.text == "hello"
+
+
+def test_bulk_create_messages_reports_missing_points_per_item(auth_client, user, db):
+    first = _create_point(title="A", latitude=55.0, longitude=37.0)
+    second = _create_point(title="B", latitude=56.0, longitude=38.0)
+    resp = auth_client.post(
+        "/api/points/messages/bulk/",
+        data={
+            "items": [
+                {"point_id": first.id, "text": " one "},
+                {"point_id": 999999, "text": "lost"},
+                {"point_id": second.id, "text": ""},
+                {"point_id": second.id, "text": "two"},
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == 201
+    assert resp.data["created"] == 2
+    assert resp.data["failed"] == 2
+
+    ok_first, missing, blank, ok_second = resp.data["results"]
+    assert "point_id" in missing["errors"]
+    assert "text" in blank["errors"]
+    assert Message.objects.get(id=ok_first["id"]).text == "one"
+    assert Message.objects.get(id=ok_second["id"]).point_id == second.id
+    assert Message.objects.filter(author=user).count() == 2
+
+
+def test_bulk_create_messages_requires_authentication(api_client, db):
+    resp = api_client.post(
+        "/api/points/messages/bulk/",
+        data={"items": [{"point_id": 1, "text": "hello"}]},
+        format="json",
+    )
+    assert resp.status_code == 401
+
+
+def test_messages_copy_point_location_on_create_and_bulk_create(auth_client, user, db):
+    first = _create_point(title="A", latitude=55.0, longitude=37.0)
+    second = _create_point(title="B", latitude=56.5, longitude=-38.25)
+
+    single = auth_client.post(
+        "/api/points/messages/", data={"point_id": first.id, "text": "one"}, format="json"
+    )
+    bulk = auth_client.post(
+        "/api/points/messages/bulk/",
+        data={"items": [{"point_id": second.id, "text": "two"}]},
+        format="json",
+    )
+    direct = Message.objects.create(point=second, author=user, text="three")
+
+    assert Message.objects.get(id=single.data["id"]).location.coords == (37.0, 55.0)
+    assert Message.objects.get(id=bulk.data["results"][0]["id"]).location.coords == (-38.25, 56.5)
+    assert Message.objects.get(id=direct.id).location.coords == (-38.25, 56.5)
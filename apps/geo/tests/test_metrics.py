@@ -0,0 +1,36 @@
+from django.test import override_settings
+
+
+def test_response_has_server_timing_with_db_and_auth(auth_client, db):
+    resp = auth_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=1")
+
+    assert resp.status_code == 200
+    server_timing = resp["Server-Timing"]
+    assert server_timing.startswith("total;dur=")
+    assert "db;dur=" in server_timing and "queries" in server_timing
+    assert "auth;dur=" in server_timing
+
+
+@override_settings(DEBUG=True)
+def test_metrics_endpoint_exposes_route_histograms(auth_client, db):
+    auth_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=1")
+
+    resp = auth_client.get("/api/metrics/")
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("text/plain")
+    body = resp.content.decode()
+    assert "geo_http_request_duration_seconds_bucket" in body
+    assert 'geo_http_request_db_queries_count{route="api/points/search/"}' in body
+
+
+def test_metrics_endpoint_is_closed_without_token_outside_debug(api_client, db):
+    assert api_client.get("/api/metrics/").status_code == 403
+
+
+@override_settings(METRICS_TOKEN="secret")
+def test_metrics_endpoint_requires_token_when_configured(api_client, db):
+    assert api_client.get("/api/metrics/").status_code == 403
+
+    resp = api_client.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+    assert resp.status_code == 200
@@ -1,3 +1,7 @@
+from io import StringIO
+
+from django.core.management import call_command
+
 from apps.geo.models.point import Point
 
 
@@ -34,3 +38,50 @@ def test_create_point_creates_point(auth_client, db):
 
     point = Point.objects.get(id=resp.data["id"])
     assert point.title == "A"
+
+
+def test_bulk_create_points_returns_ids_in_input_order_and_row_errors(auth_client, db):
+    resp = auth_client.post(
+        "/api/points/bulk/",
+        data={
+            "items": [
+                {"title": " A ", "latitude": 55.0, "longitude": 37.0},
+                {"title": "bad", "latitude": 999.0, "longitude": 37.0},
+                {"latitude": 56.0, "longitude": 38.0},
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == 201
+    assert resp.data["created"] == 2
+    assert resp.data["failed"] == 1
+
+    first, second, third = resp.data["results"]
+    assert "latitude" in second["errors"]
+    assert first["id"] < third["id"]
+    assert Point.objects.get(id=first["id"]).title == "A"
+    assert Point.objects.get(id=third["id"]).latitude == 56.0
+
+
+def test_bulk_create_points_returns_400_when_all_rows_invalid(auth_client, db):
+    resp = auth_client.post(
+        "/api/points/bulk/",
+        data={"items": [{"latitude": 999.0, "longitude": 37.0}]},
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert resp.data["created"] == 0
+    assert not Point.objects.exists()
+
+
+def test_import_points_command_loads_csv_with_copy(tmp_path, db):
+    source = tmp_path / "points.csv"
+    source.write_text("title,latitude,longitude\nA,55.0,37.0\nB,999,37.0\nC,56.0,38.0\n")
+    ids_out = tmp_path / "ids.txt"
+
+    call_command("import_points", str(source), "--ids-out", str(ids_out), stderr=StringIO())
+
+    first_id, bad_id, third_id = ids_out.read_text().splitlines()
+    assert bad_id == ""
+    assert Point.objects.get(id=int(first_id)).title == "A"
+    assert Point.objects.get(id=int(third_id)).longitude == 38.0
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.gis.geos import Point as GeoPoint
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.geo.models.point import Point
+from apps.geo.services.search_service import SearchService
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture()
+def points_index_settings(settings, tmp_path):
+    settings.POINTS_INDEX_PATH = str(tmp_path / "points-index")
+    settings.POINTS_INDEX_REFRESH_SECONDS = 0
+    settings.SEARCH_CACHE_TTL = 0
+    return settings
+
+
+def _create_point(latitude: float, longitude: float) -> Point:
+    return Point.objects.create(title=None, location=GeoPoint(longitude, latitude, srid=4326))
+
+
+def test_indexed_search_matches_sql_including_antimeridian(auth_client, db, points_index_settings):
+    # Сетка вокруг центра с шагом ~100 м: часть точек ложится у самой границы радиуса.
+    for step in range(-30, 31):
+        _create_point(0.0, (179.99 + step * 0.0009 + 180.0) % 360.0 - 180.0)
+        _create_point(55.75 + step * 0.0009, 37.61)
+    call_command("build_points_index")
+
+    for latitude, longitude, radius in [
+        (0.0, 179.99, 1.5),
+        (55.75, 37.61, 2.0),
+        (55.75, 37.61, 0.3),
+    ]:
+        sql_ids = list(
+            SearchService()
+            .search_points(latitude=latitude, longitude=longitude, radius_km=radius)
+            .values_list("id", flat=True)
+        )
+        resp = auth_client.get(
+            f"/api/points/search/?latitude={latitude}&longitude={longitude}&radius={radius}"
+            "&page_size=200"
+        )
+        assert resp.status_code == 200
+        assert resp.data["count"] == len(sql_ids)
+        assert [p["id"] for p in resp.data["results"]] == sql_ids
+
+
+def test_indexed_search_catches_up_points_created_after_snapshot(
+    auth_client, db, points_index_settings
+):
+    before = _create_point(55.75, 37.61)
+    call_command("build_points_index")
+    after = _create_point(55.7501, 37.6101)
+
+    resp = auth_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=1")
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.data["results"]] == [before.id, after.id]
+
+
+def test_indexed_search_catches_up_late_committed_points(auth_client, db, points_index_settings):
+    before = _create_point(55.75, 37.61)
+    call_command("build_points_index")
+    # Строка долгого импорта: created_at проставлен задолго до коммита, id — новый.
+    late = _create_point(55.7501, 37.6101)
+    Point.objects.filter(id=late.id).update(created_at=timezone.now() - timedelta(hours=1))
+
+    resp = auth_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=1")
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.data["results"]] == [before.id, late.id]
@@ -1,7 +1,12 @@
 from django.contrib.gis.geos import Point as GeoPoint
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from apps.geo.models.message import Message
 from apps.geo.models.point import Point
+from apps.geo.schemas.messages import MessageResponseSerializer
+from apps.geo.schemas.points import PointResponseSerializer
 
 
 def _create_point(*, title: str, latitude: float, longitude: float) -> Point:
@@ -60,3 +65,291 @@ def test_search_radius_over_limit_returns_400(auth_client, settings):
     settings.MAX_SEARCH_RADIUS_KM = 1
     resp = auth_client.get("/api/points/search/?latitude=55&longitude=37&radius=2")
     assert resp.status_code == 400
+
+
+def test_search_points_cursor_pagination_walks_all_pages_without_count(auth_client, db):
+    points = [
+        _create_point(title=f"p{i}", latitude=55.751244, longitude=37.618423) for i in range(5)
+    ]
+
+    seen_ids = []
+    url = "/api/points/search/?latitude=55.751244&longitude=37.618423&radius=1&pagination=cursor&page_size=2"
+    while url:
+        resp = auth_client.get(url)
+        assert resp.status_code == 200
+        assert "count" not in resp.data
+        seen_ids.extend(p["id"] for p in resp.data["results"])
+        url = resp.data["next"]
+
+    assert seen_ids == [p.id for p in points]
+
+
+def test_search_messages_cursor_pagination_orders_by_created_at_and_id(auth_client, user, db):
+    point = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+    messages = [Message.objects.create(point=point, author=user, text=f"m{i}") for i in range(3)]
+
+    base = "/api/points/messages/search/?latitude=55.751244&longitude=37.618423&radius=1"
+    first = auth_client.get(f"{base}&pagination=cursor&page_size=2")
+    assert first.status_code == 200
+    assert [m["id"] for m in first.data["results"]] == [messages[0].id, messages[1].id]
+
+    second = auth_client.get(first.data["next"])
+    assert second.status_code == 200
+    assert [m["id"] for m in second.data["results"]] == [messages[2].id]
+    assert second.data["next"] is None
+
+
+def test_search_points_invalid_cursor_returns_404(auth_client, db):
+    resp = auth_client.get(
+        "/api/points/search/?latitude=55.751244&longitude=37.618423&radius=1&cursor=not-a-cursor"
+    )
+    assert resp.status_code == 404
+
+
+def test_nearest_points_are_ordered_by_distance_with_meters(auth_client, db):
+    far = _create_point(title="far", latitude=55.781244, longitude=37.618423)
+    center = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+    near = _create_point(title="near", latitude=55.761244, longitude=37.618423)
+
+    resp = auth_client.get("/api/points/nearest/?latitude=55.751244&longitude=37.618423&limit=2")
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.data] == [center.id, near.id]
+    assert resp.data[0]["distance_m"] < 1
+    assert 1000 < resp.data[1]["distance_m"] < 1200
+    assert far.id not in {p["id"] for p in resp.data}
+
+
+def test_nearest_messages_come_from_nearest_points_with_messages(auth_client, user, db):
+    _create_point(title="empty", latitude=55.751244, longitude=37.618423)
+    near = _create_point(title="near", latitude=55.761244, longitude=37.618423)
+    far = _create_point(title="far", latitude=55.781244, longitude=37.618423)
+    older = Message.objects.create(point=near, author=user, text="old")
+    newer = Message.objects.create(point=near, author=user, text="new")
+    Message.objects.create(point=far, author=user, text="far")
+
+    resp = auth_client.get(
+        "/api/points/messages/nearest/?latitude=55.751244&longitude=37.618423&limit=2"
+    )
+    assert resp.status_code == 200
+    assert [m["id"] for m in resp.data] == [newer.id, older.id]
+    assert all(m["distance_m"] > 1000 for m in resp.data)
+
+
+def test_clusters_group_points_into_one_row_per_cell(auth_client, db):
+    moscow = [_create_point(title="m", latitude=55.75, longitude=37.61) for _ in range(3)]
+    _create_point(title="spb", latitude=59.93, longitude=30.33)
+    _create_point(title="outside", latitude=10.0, longitude=10.0)
+
+    resp = auth_client.get(
+        "/api/points/clusters/"
+        "?min_latitude=50&min_longitude=25&max_latitude=65&max_longitude=45&zoom=8"
+    )
+    assert resp.status_code == 200
+    assert [c["count"] for c in resp.data] == [3, 1]
+    biggest = resp.data[0]
+    assert biggest["sample_id"] == moscow[0].id
+    assert abs(biggest["latitude"] - 55.75) < 1e-6
+    assert abs(biggest["longitude"] - 37.61) < 1e-6
+
+
+def test_clusters_handle_viewport_crossing_antimeridian(auth_client, db):
+    _create_point(title="east", latitude=0.0, longitude=179.5)
+    _create_point(title="west", latitude=0.0, longitude=-179.5)
+    _create_point(title="greenwich", latitude=0.0, longitude=0.0)
+
+    resp = auth_client.get(
+        "/api/points/clusters/"
+        "?min_latitude=-5&min_longitude=170&max_latitude=5&max_longitude=-170&zoom=6"
+    )
+    assert resp.status_code == 200
+    assert sum(c["count"] for c in resp.data) == 2
+
+
+def test_clusters_reject_inverted_latitudes(auth_client, db):
+    resp = auth_client.get(
+        "/api/points/clusters/"
+        "?min_latitude=10&min_longitude=0&max_latitude=5&max_longitude=1&zoom=3"
+    )
+    assert resp.status_code == 400
+
+
+def test_bbox_search_points_returns_only_points_inside_rectangle(auth_client, db):
+    inside = _create_point(title="inside", latitude=55.75, longitude=37.61)
+    _create_point(title="outside", latitude=59.93, longitude=30.33)
+
+    resp = auth_client.get(
+        "/api/points/bbox/?min_latitude=55&min_longitude=37&max_latitude=56&max_longitude=38"
+    )
+    assert resp.status_code == 200
+    assert resp.data["count"] == 1
+    assert [p["id"] for p in resp.data["results"]] == [inside.id]
+
+
+def test_bbox_search_points_crossing_antimeridian_with_cursor(auth_client, db):
+    east = _create_point(title="east", latitude=0.0, longitude=179.5)
+    west = _create_point(title="west", latitude=0.0, longitude=-179.5)
+    _create_point(title="greenwich", latitude=0.0, longitude=0.0)
+
+    resp = auth_client.get(
+        "/api/points/bbox/?min_latitude=-5&min_longitude=170&max_latitude=5&max_longitude=-170"
+        "&pagination=cursor&page_size=1"
+    )
+    assert resp.status_code == 200
+    assert [p["id"] for p in resp.data["results"]] == [east.id]
+
+    second = auth_client.get(resp.data["next"])
+    assert [p["id"] for p in second.data["results"]] == [west.id]
+    assert second.data["next"] is None
+
+
+def test_bbox_search_messages_filters_by_point_location(auth_client, user, db):
+    inside = _create_point(title="inside", latitude=55.75, longitude=37.61)
+    outside = _create_point(title="outside", latitude=59.93, longitude=30.33)
+    message = Message.objects.create(point=inside, author=user, text="in")
+    Message.objects.create(point=outside, author=user, text="out")
+
+    resp = auth_client.get(
+        "/api/points/messages/bbox/"
+        "?min_latitude=55&min_longitude=37&max_latitude=56&max_longitude=38"
+    )
+    assert resp.status_code == 200
+    assert [m["id"] for m in resp.data["results"]] == [message.id]
+
+
+@override_settings(SEARCH_CACHE_TTL=30)
+def test_search_points_repeated_query_is_served_from_cache(auth_client, db):
+    cached = _create_point(title="cached", latitude=55.751244, longitude=37.618423)
+    url = "/api/points/search/?latitude=55.751244&longitude=37.618423&radius=1"
+    first = auth_client.get(url)
+
+    # Мимо сервиса: версия ячейки не меняется, поэтому ответ остаётся из кэша.
+    _create_point(title="not-invalidated", latitude=55.751244, longitude=37.618423)
+    nearby = auth_client.get(url.replace("55.751244", "55.751241"))
+
+    assert [p["id"] for p in first.data["results"]] == [cached.id]
+    assert nearby.data == first.data
+
+
+@override_settings(SEARCH_CACHE_TTL=30)
+def test_search_points_cache_is_invalidated_by_created_point(
+    auth_client, db, django_capture_on_commit_callbacks
+):
+    url = "/api/points/search/?latitude=55.751244&longitude=37.618423&radius=1"
+    assert auth_client.get(url).data["count"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        created = auth_client.post(
+            "/api/points/", {"latitude": 55.7513, "longitude": 37.6185}, format="json"
+        )
+    assert created.status_code == 201
+
+    resp = auth_client.get(url)
+    assert [p["id"] for p in resp.data["results"]] == [created.data["id"]]
+
+
+def test_batch_search_groups_points_by_probe_with_dedupe_and_limit(auth_client, db):
+    shared = _create_point(title="shared", latitude=55.751244, longitude=37.618423)
+    only_first = _create_point(title="first", latitude=55.746244, longitude=37.618423)
+    only_second = _create_point(title="second", latitude=55.756244, longitude=37.618423)
+    probes = [
+        {"latitude": 55.748744, "longitude": 37.618423, "radius": 0.4},
+        {"latitude": 55.753744, "longitude": 37.618423, "radius": 0.4},
+        {"latitude": 10.0, "longitude": 10.0, "radius": 1},
+    ]
+
+    resp = auth_client.post("/api/points/search/batch/", {"probes": probes}, format="json")
+    assert resp.status_code == 200
+    assert [[p["id"] for p in r["points"]] for r in resp.data["results"]] == [
+        [shared.id, only_first.id],
+        [shared.id, only_second.id],
+        [],
+    ]
+
+    resp = auth_client.post(
+        "/api/points/search/batch/", {"probes": probes, "dedupe": True, "limit": 1}, format="json"
+    )
+    assert resp.status_code == 200
+    assert [[p["id"] for p in r["points"]] for r in resp.data["results"]] == [
+        [shared.id],
+        [],
+        [],
+    ]
+    assert [r["truncated"] for r in resp.data["results"]] == [True, True, False]
+
+
+def test_batch_search_reports_radius_limit_per_probe(auth_client, settings):
+    settings.MAX_SEARCH_RADIUS_KM = 1
+    probes = [
+        {"latitude": 55.0, "longitude": 37.0, "radius": 0.5},
+        {"latitude": 55.0, "longitude": 37.0, "radius": 2},
+    ]
+    resp = auth_client.post("/api/points/search/batch/", {"probes": probes}, format="json")
+    assert resp.status_code == 400
+    assert "1" in resp.data["probes"]
+
+
+def test_search_projection_output_matches_model_serializers(auth_client, user, db):
+    point = _create_point(title="center", latitude=55.751244, longitude=37.618423)
+    message = Message.objects.create(point=point, author=user, text="hello")
+    query = "?latitude=55.751244&longitude=37.618423&radius=1"
+
+    points_resp = auth_client.get(f"/api/points/search/{query}")
+    messages_resp = auth_client.get(f"/api/points/messages/search/{query}")
+
+    assert points_resp.data["results"] == [PointResponseSerializer(point).data]
+    assert messages_resp.data["results"] == [MessageResponseSerializer(message).data]
+
+
+def test_search_messages_since_returns_only_newer_messages(auth_client, user, db):
+    point = _create_point(title="p", latitude=55.751244, longitude=37.618423)
+    seen = Message.objects.create(point=point, author=user, text="seen")
+    newer = Message.objects.create(point=point, author=user, text="newer")
+
+    resp = auth_client.get(
+        "/api/points/messages/search/"
+        f"?latitude=55.751244&longitude=37.618423&radius=1&since={seen.id}"
+    )
+    assert resp.status_code == 200
+    assert [m["id"] for m in resp.data["results"]] == [newer.id]
+
+
+def test_search_messages_returns_304_until_area_changes(
+    auth_client, user, db, django_capture_on_commit_callbacks
+):
+    point = _create_point(title="p", latitude=55.751244, longitude=37.618423)
+    Message.objects.create(point=point, author=user, text="first")
+    url = "/api/points/messages/search/?latitude=55.751244&longitude=37.618423&radius=1"
+
+    first = auth_client.get(url)
+    etag = first["ETag"]
+    assert first.status_code == 200
+
+    unchanged = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert unchanged.status_code == 304
+    assert unchanged["ETag"] == etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.post(
+            "/api/points/messages/", data={"point_id": point.id, "text": "new"}, format="json"
+        )
+    changed = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+    assert len(changed.data["results"]) == 2
+
+
+@override_settings(SEARCH_CACHE_TTL=0)
+def test_search_messages_304_skips_page_query(auth_client, user, db):
+    point = _create_point(title="p", latitude=55.751244, longitude=37.618423)
+    Message.objects.create(point=point, author=user, text="first")
+    url = "/api/points/messages/search/?latitude=55.751244&longitude=37.618423&radius=1"
+    etag = auth_client.get(url)["ETag"]
+
+    with CaptureQueriesContext(connection) as queries:
+        unchanged = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert unchanged.status_code == 304
+    messages_queries = [q["sql"] for q in queries.captured_queries if "geo_messages" in q["sql"]]
+    assert len(messages_queries) == 1
+    assert "COUNT(" in messages_queries[0]
+    assert '"geo_messages"."text"' not in messages_queries[0]
@@ -0,0 +1,79 @@
+import json
+
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.geo.checks import check_process_local_caches
+from apps.geo.repositories.query_sampler import is_sampleable, summarize_plan
+
+SAMPLE_EVERY_QUERY = {
+    "SLOW_QUERY_SAMPLER": True,
+    "SLOW_QUERY_THRESHOLD_MS": 0,
+    "SLOW_QUERY_SAMPLE_RATE": 1.0,
+    "SLOW_QUERY_MIN_INTERVAL_SECONDS": 0,
+}
+
+
+def test_summarize_plan_lists_indexes_and_seq_scans():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Bitmap Index Scan", "Index Name": "geo_points_location_gist"},
+            {"Node Type": "Seq Scan", "Relation Name": "geo_messages"},
+        ],
+    }
+
+    assert summarize_plan(plan) == {
+        "indexes": ["geo_points_location_gist"],
+        "seq_scans": ["geo_messages"],
+    }
+
+
+def test_sampler_skips_statements_with_side_effects():
+    assert is_sampleable('SELECT "geo_points"."id" FROM "geo_points" WHERE "geo_points"."id" = %s')
+    # Резервирование id в `copy_points`: повтор под EXPLAIN ANALYZE израсходовал бы значения.
+    assert not is_sampleable(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)"
+    )
+    assert not is_sampleable('SELECT "geo_points"."id" FROM "geo_points" FOR UPDATE')
+    assert not is_sampleable(
+        'WITH moved AS (DELETE FROM "geo_messages" RETURNING id) SELECT count(*) FROM moved'
+    )
+
+
+@override_settings(**SAMPLE_EVERY_QUERY)
+def test_slow_spatial_query_is_explained_into_buffer(admin_client):
+    resp = admin_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=5")
+    assert resp.status_code == 200
+
+    resp = admin_client.get("/api/admin/slow-queries/", {"route": "api/points/search/"})
+
+    assert resp.status_code == 200
+    sample = resp.json()[0]
+    assert sample["database"] == "default"
+    assert "geo_points" in sample["sql"]
+    assert sample["plan"]["Plan"]["Node Type"]
+    assert sample["execution_ms"] is not None
+
+
+@override_settings(**SAMPLE_EVERY_QUERY)
+def test_slow_queries_export_is_staff_only(admin_client, user):
+    user_client = APIClient()
+    user_client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    assert user_client.get("/api/admin/slow-queries/").status_code == 403
+
+    admin_client.get("/api/points/search/?latitude=55.75&longitude=37.61&radius=5")
+    resp = admin_client.get("/api/admin/slow-queries/export/")
+
+    assert resp.status_code == 200
+    lines = b"".join(resp.streaming_content).decode().splitlines()
+    assert lines and all("plan" in json.loads(line) for line in lines)
+
+
+@override_settings(SLOW_QUERY_SAMPLER=True, TILE_CACHE_TTL=0, CACHE_IS_SHARED=False)
+def test_sampler_with_per_process_cache_warns_on_check():
+    assert [message.id for message in check_process_local_caches()] == ["geo.W001"]
+
+    with override_settings(CACHE_IS_SHARED=True):
+        assert check_process_local_caches() == []
@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.geo.repositories.rate_limits_repo import RateLimitsRepository
+from apps.geo.throttling import (
+    DatabaseRateLimitStore,
+    GCRAAnonRateThrottle,
+    LocalRateLimitStore,
+)
+
+
+def test_database_store_allows_burst_then_denies_with_wait(db):
+    repo = RateLimitsRepository()
+
+    results = [repo.acquire(key="test:burst", interval=10, tolerance=20) for _ in range(3)]
+
+    assert results[:2] == [None, None]
+    assert 0 < results[2] <= 10
+
+
+@override_settings(THROTTLE_PURGE_EVERY=3)
+def test_database_store_purges_every_nth_acquire(db, monkeypatch):
+    store = DatabaseRateLimitStore()
+    purges = []
+    monkeypatch.setattr(store._repo, "purge_expired", lambda *, limit: purges.append(limit))
+
+    for index in range(7):
+        store.acquire(f"test:purge:{index}", interval=1, tolerance=1)
+
+    assert len(purges) == 2
+
+
+def test_local_store_allows_burst_and_bounds_keys():
+    store = LocalRateLimitStore(max_keys=2)
+
+    assert store.acquire("a", interval=10, tolerance=20) is None
+    assert store.acquire("a", interval=10, tolerance=20) is None
+    assert 0 < store.acquire("a", interval=10, tolerance=20) <= 10
+
+    store.acquire("b", interval=10, tolerance=20)
+    store.acquire("c", interval=10, tolerance=20)
+    assert len(store._tats) == 2
+
+
+@pytest.mark.parametrize(("backend", "ip"), [("database", "10.0.0.1"), ("local", "10.0.0.2")])
+def test_throttle_instances_share_limit(db, monkeypatch, backend, ip):
+    monkeypatch.setattr(GCRAAnonRateThrottle, "THROTTLE_RATES", {"anon": "2/min"})
+    request = Request(APIRequestFactory().get("/", REMOTE_ADDR=ip))
+    request.user = AnonymousUser()
+
+    with override_settings(THROTTLE_BACKEND=backend):
+        # Каждый запрос DRF создаёт новый экземпляр throttle — состояние только в хранилище.
+        allowed = [GCRAAnonRateThrottle().allow_request(request, None) for _ in range(2)]
+        denied = GCRAAnonRateThrottle()
+
+        assert allowed == [True, True]
+        assert denied.allow_request(request, None) is False
+        assert 0 < denied.wait() <= 30
@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.geo.checks import check_process_local_caches
+from apps.geo.services.tiles_service import TilesService
+
+
+def test_points_tile_out_of_range_returns_404(auth_client, db):
+    resp = auth_client.get("/api/tiles/1/2/0.mvt")
+    assert resp.status_code == 404
+
+
+@override_settings(TILE_CACHE_TTL=3600)
+def test_points_tile_is_rendered_once_and_then_served_from_cache(auth_client, db):
+    auth_client.post(
+        "/api/points/", data={"latitude": 55.751244, "longitude": 37.618423}, format="json"
+    )
+    first = auth_client.get("/api/tiles/0/0/0.mvt")
+    assert first.status_code == 200
+    assert first["Content-Type"] == "application/vnd.mapbox-vector-tile"
+    assert len(first.content) > 0
+
+    # Тайл из кэша: остаются запросы аутентификации и throttling-а, но не к geo_points.
+    with CaptureQueriesContext(connection) as queries:
+        second = auth_client.get("/api/tiles/0/0/0.mvt")
+    assert second.content == first.content
+    assert not [query for query in queries.captured_queries if "geo_points" in query["sql"]]
+
+
+@override_settings(TILE_CACHE_TTL=3600)
+def test_create_point_invalidates_cached_tiles_containing_it(
+    auth_client, db, django_capture_on_commit_callbacks
+):
+    empty = auth_client.get("/api/tiles/2/2/1.mvt")
+    assert empty.content == b""
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.post(
+            "/api/points/", data={"latitude": 55.751244, "longitude": 37.618423}, format="json"
+        )
+
+    refreshed = auth_client.get("/api/tiles/2/2/1.mvt")
+    assert len(refreshed.content) > 0
+
+
+def test_tiles_containing_includes_both_tiles_on_a_shared_border():
+    assert TilesService._tiles_containing(latitude=10.0, longitude=0.0, z=1) == {(0, 0), (1, 0)}
+    assert TilesService._tiles_containing(latitude=55.75, longitude=37.61, z=2) == {(2, 1)}
+
+
+@override_settings(TILE_CACHE_TTL=0)
+def test_points_tile_is_not_cached_when_cache_is_disabled(auth_client, db):
+    auth_client.get("/api/tiles/0/0/0.mvt")
+
+    with CaptureQueriesContext(connection) as queries:
+        auth_client.get("/api/tiles/0/0/0.mvt")
+    assert any("geo_points" in query["sql"] for query in queries.captured_queries)
+
+
+@override_settings(TILE_CACHE_TTL=3600, SLOW_QUERY_SAMPLER=False, CACHE_IS_SHARED=False)
+def test_tile_cache_with_per_process_cache_warns_on_check():
+    assert [message.id for message in check_process_local_caches()] == ["geo.W001"]
+
+    with override_settings(CACHE_IS_SHARED=True):
+        assert check_process_local_caches() == []
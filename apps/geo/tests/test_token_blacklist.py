@@ -0,0 +1,69 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.geo.services.token_blacklist import BloomFilter, TokenBlacklistFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, fp_rate=0.001)
+    members = [f"jti-{number}" for number in range(1000)]
+    for member in members:
+        bloom.add(member)
+
+    assert all(member in bloom for member in members)
+    false_positives = sum(f"other-{number}" in bloom for number in range(10000))
+    assert false_positives < 100
+
+
+@override_settings(TOKEN_BLACKLIST_FILTER=True)
+def test_rotated_refresh_token_is_rejected(api_client, user):
+    resp = api_client.post(
+        "/api/auth/token/", {"username": "user", "password": "pass"}, format="json"
+    )
+    refresh = resp.json()["refresh"]
+
+    rotated = api_client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+    reused = api_client.post("/api/auth/token/refresh/", {"refresh": refresh}, format="json")
+
+    assert rotated.status_code == 200
+    assert reused.status_code == 401
+
+
+@override_settings(
+    TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS=5, TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS=60
+)
+def test_stale_filter_defers_to_database(db, monkeypatch):
+    blacklist_filter = TokenBlacklistFilter()
+    monkeypatch.setattr(blacklist_filter, "_ensure_refreshing", lambda: None)
+    assert blacklist_filter.might_contain("never-blacklisted") is False
+
+    # Фоновая догрузка не отрабатывала дольше, чем живут метки недавних записей.
+    blacklist_filter._refreshed_at -= 66
+    assert blacklist_filter.might_contain("never-blacklisted") is True
+
+
+def test_purge_expired_tokens_keeps_live_ones(user):
+    now = timezone.now()
+    for jti, expires_at in (
+        ("expired-1", now - timedelta(days=1)),
+        ("live-1", now + timedelta(days=1)),
+    ):
+        token = OutstandingToken.objects.create(
+            user=user, jti=jti, token=jti, expires_at=expires_at
+        )
+        BlacklistedToken.objects.create(token=token)
+    OutstandingToken.objects.create(
+        user=user, jti="expired-2", token="expired-2", expires_at=now - timedelta(hours=1)
+    )
+    stdout = StringIO()
+
+    call_command("purge_expired_tokens", batch_size=1, stdout=stdout)
+
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live-1"]
+    assert BlacklistedToken.objects.count() == 1
+    assert "deleted=2 blacklisted=1" in stdout.getvalue()
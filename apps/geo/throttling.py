@@ -0,0 +1,129 @@
+"""
+Throttling по GCRA (generic cell rate algorithm) вместо списков отметок времени DRF.
+
+Состояние ключа — одно число (TAT), проверка — O(1) независимо от лимита. Хранилище
+задаёт `THROTTLE_BACKEND`:
+
+- `database` (по умолчанию) — таблица `geo_rate_limits` на primary, атомарный upsert
+  (`RateLimitsRepository`): лимит общий для всех воркеров и хостов;
+- `local` — словарь в памяти процесса: лимит на воркер, для разработки и тестов.
+
+Лимиты и scope-ы — как у `AnonRateThrottle`/`UserRateThrottle` (`DEFAULT_THROTTLE_RATES`):
+`N/period` пропускает всплеск до N запросов, дальше — один запрос на `period / N`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from typing import Any, Protocol
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from apps.geo.repositories.rate_limits_repo import RateLimitsRepository
+
+# Просроченные строки чистит каждый THROTTLE_PURGE_EVERY-й запрос процесса, порцией не больше
+# PURGE_BATCH.
+PURGE_BATCH = 1000
+LOCAL_MAX_KEYS = 10000
+
+
+class RateLimitStore(Protocol):
+    def acquire(self, key: str, *, interval: float, tolerance: float) -> float | None:
+        """`None` — разрешён, иначе секунды до следующей попытки."""
+
+
+class DatabaseRateLimitStore:
+    def __init__(self, *, repo: RateLimitsRepository | None = None) -> None:
+        self._repo = repo or RateLimitsRepository()
+        self._acquired = itertools.count(1)
+
+    def acquire(self, key: str, *, interval: float, tolerance: float) -> float | None:
+        wait = self._repo.acquire(key=key, interval=interval, tolerance=tolerance)
+        purge_every = settings.THROTTLE_PURGE_EVERY
+        if purge_every and next(self._acquired) % purge_every == 0:
+            self._repo.purge_expired(limit=PURGE_BATCH)
+        return wait
+
+
+class LocalRateLimitStore:
+    """GCRA в памяти процесса; не больше `max_keys` ключей (старые вытесняются)."""
+
+    def __init__(self, *, max_keys: int = LOCAL_MAX_KEYS) -> None:
+        self._max_keys = max_keys
+        self._tats: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, *, interval: float, tolerance: float) -> float | None:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tats.get(key, now), now) + interval
+            if tat - now > tolerance:
+                return tat - now - tolerance
+            if key not in self._tats and len(self._tats) >= self._max_keys:
+                self._evict(now)
+            self._tats[key] = tat
+            return None
+
+    def _evict(self, now: float) -> None:
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+        if len(self._tats) >= self._max_keys:
+            # Все ключи активны — вытесняем самый давно вставленный.
+            del self._tats[next(iter(self._tats))]
+
+
+_stores: dict[str, RateLimitStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_rate_limit_store() -> RateLimitStore:
+    backend = settings.THROTTLE_BACKEND
+    with _stores_lock:
+        if backend not in _stores:
+            if backend == "database":
+                _stores[backend] = DatabaseRateLimitStore()
+            elif backend == "local":
+                _stores[backend] = LocalRateLimitStore()
+            else:
+                raise ImproperlyConfigured(f"Unknown THROTTLE_BACKEND: {backend!r}")
+        return _stores[backend]
+
+
+class GCRAThrottleMixin:
+    """
+    Заменяет `allow_request`/`wait` у `SimpleRateThrottle`: разбор лимита, scope и ключ
+    (`get_cache_key`) — родительские.
+    """
+
+    rate: str | None
+    key: str | None
+    num_requests: int
+    duration: int
+    wait_seconds: float | None = None
+
+    def allow_request(self, request: Request, view: Any) -> bool:
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.wait_seconds = get_rate_limit_store().acquire(
+            self.key, interval=self.duration / self.num_requests, tolerance=self.duration
+        )
+        return self.wait_seconds is None
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class GCRAAnonRateThrottle(GCRAThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class GCRAUserRateThrottle(GCRAThrottleMixin, UserRateThrottle):
+    pass
@@ -0,0 +1,60 @@
+"""
+Refresh-токен и сериализаторы simplejwt, проверяющие чёрный список через фильтр Блума
+процесса (`apps.geo.services.token_blacklist`): запрос в БД — только при «возможно».
+Подключаются через `SIMPLE_JWT["TOKEN_REFRESH_SERIALIZER"]` и `TOKEN_BLACKLIST_SERIALIZER`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from rest_framework_simplejwt.serializers import TokenBlacklistSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.geo.services.token_blacklist import get_token_blacklist_filter
+
+
+class FilteredRefreshToken(RefreshToken):
+    def check_blacklist(self) -> None:
+        blacklist_filter = get_token_blacklist_filter()
+        if blacklist_filter is None or blacklist_filter.might_contain(
+            self.payload[api_settings.JTI_CLAIM]
+        ):
+            super().check_blacklist()
+
+
+class FilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = FilteredRefreshToken
+
+
+class FilteredTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = FilteredRefreshToken
+
+
+def issue_token_pairs(users: Sequence[Any]) -> list[dict[str, str]]:
+    """
+    `{"access", "refresh"}` для каждого пользователя, как `RefreshToken.for_user`, но
+    `OutstandingToken` пишутся одним `bulk_create`, а не INSERT-ом на токен.
+    """
+    # `Token.for_user` в обход `BlacklistMixin.for_user` (он делает INSERT сам).
+    refresh_tokens = [super(BlacklistMixin, FilteredRefreshToken).for_user(user) for user in users]
+    OutstandingToken.objects.bulk_create(
+        [
+            OutstandingToken(
+                user=user,
+                jti=refresh[api_settings.JTI_CLAIM],
+                token=str(refresh),
+                created_at=refresh.current_time,
+                expires_at=datetime_from_epoch(refresh["exp"]),
+            )
+            for user, refresh in zip(users, refresh_tokens, strict=True)
+        ],
+        batch_size=1000,
+    )
+    return [
+        {"access": str(refresh.access_token), "refresh": str(refresh)} for refresh in refresh_tokens
+    ]
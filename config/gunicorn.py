@@ -0,0 +1,30 @@
+"""
+Конфигурация gunicorn: `gunicorn config.wsgi:application -c config/gunicorn.py`.
+
+После старта каждого воркера соединения с БД прогреваются заранее (см. ReadinessService),
+а `GET /api/health/ready/` отвечает 200 только после прогрева.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# ASGI: `gunicorn config.asgi:application -c config/gunicorn.py` с
+# GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker (для /api/async/... эндпоинтов).
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+
+def post_worker_init(worker) -> None:
+    from apps.geo.services.readiness_service import ReadinessService
+
+    ReadinessService().warm_up()
+
+
+def child_exit(server, worker) -> None:
+    # Убирает live-файлы метрик завершившегося воркера (PROMETHEUS_MULTIPROC_DIR).
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
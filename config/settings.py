@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "django.contrib.gis",
     "rest_framework",
+    "adrf",
     "rest_framework_simplejwt",
     "rest_framework_simplejwt.token_blacklist",
     "drf_spectacular",
@@ -32,11 +33,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.geo.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.geo.middleware.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -62,6 +65,28 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# Соединения с БД:
+# - DB_POOL=1 — пул psycopg3 на процесс (DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE); с пулом
+#   CONN_MAX_AGE должен быть 0;
+# - иначе — постоянные соединения на поток (DB_CONN_MAX_AGE сек).
+# CONN_HEALTH_CHECKS проверяет соединение перед использованием (с пулом — при выдаче из пула).
+# DB_SERVER_SIDE_BINDING=1 — серверные параметры: psycopg подготавливает (PREPARE) запрос после
+# DB_PREPARE_THRESHOLD выполнений на соединении. Несовместимо с PgBouncer в transaction-режиме.
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+DB_SERVER_SIDE_BINDING = os.getenv("DB_SERVER_SIDE_BINDING", "0") == "1"
+
+_db_options: dict = {}
+if DB_POOL:
+    _db_options["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "8")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+    }
+if DB_SERVER_SIDE_BINDING:
+    _db_options["server_side_binding"] = True
+    _db_options["prepare_threshold"] = int(os.getenv("DB_PREPARE_THRESHOLD", "2"))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.contrib.gis.db.backends.postgis",
@@ -70,8 +95,47 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": _db_options,
+    }
+}
+
+# Реплики для чтения: DB_REPLICA_HOSTS=host1,host2:5433 (остальные параметры — как у default).
+# Чтения моделей geo идут в реплики, запись и чтения после недавней записи пользователя
+# (DB_REPLICA_STICKINESS_SECONDS + SEARCH_CACHE_TTL) — в primary, см. apps/geo/db_router.py.
+# Метка read-your-writes хранится в кэше: реплики требуют общего CACHE_BACKEND (geo.E001).
+DB_REPLICAS: list[str] = []
+for _index, _replica in enumerate(
+    filter(None, (host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(","))), start=1
+):
+    _host, _, _port = _replica.partition(":")
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DB_REPLICAS.append(f"replica_{_index}")
+DB_REPLICA_STICKINESS_SECONDS = int(os.getenv("DB_REPLICA_STICKINESS_SECONDS", "5"))
+DATABASE_ROUTERS = ["apps.geo.db_router.PrimaryReplicaRouter"]
+
+
+# По умолчанию — LocMem (свой кэш у каждого процесса). Для нескольких gunicorn-воркеров
+# задайте общий backend, например django.core.cache.backends.db.DatabaseCache
+# (+ `manage.py createcachetable`) или django.core.cache.backends.redis.RedisCache.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
+# LocMem/Dummy не видны другим воркерам: кэши, которые инвалидируются при записи,
+# по умолчанию включаются только с общим backend.
+CACHE_IS_SHARED = CACHES["default"]["BACKEND"] not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -100,20 +164,50 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": True,
+    "TOKEN_REFRESH_SERIALIZER": "apps.geo.tokens.FilteredTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "apps.geo.tokens.FilteredTokenBlacklistSerializer",
 }
 
+# Фильтр Блума по чёрному списку refresh-токенов (см. apps/geo/services/token_blacklist.py):
+# догрузка новых записей раз в TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS с перекрытием
+# TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS, полная пересборка раз в ..._REBUILD_SECONDS.
+# По умолчанию включён только с общим кэшем: с LocMem ротированный refresh-токен в других
+# воркерах принимается до их догрузки.
+TOKEN_BLACKLIST_FILTER = os.getenv("TOKEN_BLACKLIST_FILTER", "1" if CACHE_IS_SHARED else "0") == "1"
+TOKEN_BLACKLIST_FILTER_FP_RATE = float(os.getenv("TOKEN_BLACKLIST_FILTER_FP_RATE", "0.001"))
+TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS = float(
+    os.getenv("TOKEN_BLACKLIST_FILTER_REFRESH_SECONDS", "5")
+)
+TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS = int(
+    os.getenv("TOKEN_BLACKLIST_FILTER_OVERLAP_SECONDS", "60")
+)
+TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS = float(
+    os.getenv("TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS", "3600")
+)
+
+# Кэш пользователей JWT-аутентификации: общий кэш на AUTH_USER_CACHE_TTL секунд (0 — выключен;
+# без общего CACHE_BACKEND этот уровень не используется) и копия в памяти процесса на
+# AUTH_USER_LOCAL_TTL (столько живёт старая версия пользователя в других воркерах после
+# изменения). JWT_STATELESS_READS=1 — GET поиска/выгрузок/тайлов без чтения пользователя,
+# только по claims токена.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_LOCAL_TTL = float(os.getenv("AUTH_USER_LOCAL_TTL", "5"))
+JWT_STATELESS_READS = os.getenv("JWT_STATELESS_READS", "0") == "1"
+
 # Включает служебный эндпоинт создания тестового пользователя (только для IsAdminUser).
 ENABLE_TEST_USER_ENDPOINT = os.getenv("ENABLE_TEST_USER_ENDPOINT", "1" if DEBUG else "0") == "1"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+    "DEFAULT_AUTHENTICATION_CLASSES": ("apps.geo.authentication.CachedJWTAuthentication",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.geo.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "apps.geo.throttling.GCRAAnonRateThrottle",
+        "apps.geo.throttling.GCRAUserRateThrottle",
     ),
     "DEFAULT_THROTTLE_RATES": {
         "anon": os.getenv("THROTTLE_ANON", "30/min"),
@@ -123,6 +217,83 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "50")),
 }
 
+# Хранилище состояния throttling-а (GCRA): `database` — общая таблица на primary, лимит
+# на весь кластер; `local` — память процесса, лимит на каждый воркер отдельно.
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "database")
+# `database`: каждый N-й запрос процесса удаляет порцию просроченных строк (0 — не удалять).
+THROTTLE_PURGE_EVERY = int(os.getenv("THROTTLE_PURGE_EVERY", "1000"))
+
+# GET /api/metrics/ (Prometheus): только с `Authorization: Bearer <METRICS_TOKEN>`
+# (bearer_token в scrape_config). Без METRICS_TOKEN эндпоинт доступен только при DEBUG.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Сэмплер медленных гео-запросов (EXPLAIN ANALYZE в кольцевой буфер, admin/slow-queries/).
+# Выключен по умолчанию: сэмплированный запрос выполняется повторно. Буфер — в кэше Django:
+# общий для воркеров только с общим CACHE_BACKEND.
+SLOW_QUERY_SAMPLER = os.getenv("SLOW_QUERY_SAMPLER", "0") == "1"
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "0.1"))
+SLOW_QUERY_MIN_INTERVAL_SECONDS = float(os.getenv("SLOW_QUERY_MIN_INTERVAL_SECONDS", "10"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100"))
+
+# Максимум элементов в одном запросе пакетных эндпоинтов (points/bulk/ и т.п.).
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+# Размер порции серверного курсора при потоковой выгрузке (points/search/export/).
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Векторные тайлы (tiles/{z}/{x}/{y}.mvt): максимальный зум, TTL кэша (сек) и порог,
+# после которого инвалидация пачки точек сбрасывает весь кэш тайлов. Без общего кэша TTL по
+# умолчанию 0 (кэш выключен): инвалидация видна только воркеру, создавшему точку.
+TILE_MAX_ZOOM = int(os.getenv("TILE_MAX_ZOOM", "22"))
+TILE_CACHE_TTL = int(os.getenv("TILE_CACHE_TTL", "3600" if CACHE_IS_SHARED else "0"))
+TILE_INVALIDATION_MAX_KEYS = int(os.getenv("TILE_INVALIDATION_MAX_KEYS", "10000"))
+# Cache-Control для клиента: серверный кэш инвалидируется сразу, клиентский — нет.
+TILE_CLIENT_MAX_AGE = int(os.getenv("TILE_CLIENT_MAX_AGE", "0"))
+
+# Кластеризация (points/clusters/): размер ячейки в пикселях тайла и лимит строк ответа.
+CLUSTER_CELL_PX = int(os.getenv("CLUSTER_CELL_PX", "64"))
+CLUSTER_MAX_ROWS = int(os.getenv("CLUSTER_MAX_ROWS", "2000"))
+
+# Пакетный поиск (points/search/batch/): максимум центров в запросе и точек на центр.
+SEARCH_BATCH_MAX_PROBES = int(os.getenv("SEARCH_BATCH_MAX_PROBES", "500"))
+SEARCH_BATCH_MAX_LIMIT = int(os.getenv("SEARCH_BATCH_MAX_LIMIT", "1000"))
+
+# Кэш ответов поиска в радиусе (points/search/, points/messages/search/).
+# TTL в секундах (0 — кэш выключен; по умолчанию 30 с общим кэшем, иначе 0: инвалидация
+# в LocMem одного воркера не видна остальным); центр и радиус округляются до
+# SEARCH_CACHE_COORD_PRECISION / SEARCH_CACHE_RADIUS_PRECISION знаков. Инвалидация —
+# по версиям ячеек сетки SEARCH_CACHE_CELL_DEG; поиск, задевающий больше
+# SEARCH_CACHE_MAX_CELLS ячеек, не кэшируется.
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "30" if CACHE_IS_SHARED else "0"))
+SEARCH_CACHE_CELL_DEG = float(os.getenv("SEARCH_CACHE_CELL_DEG", "0.05"))
+SEARCH_CACHE_MAX_CELLS = int(os.getenv("SEARCH_CACHE_MAX_CELLS", "64"))
+SEARCH_CACHE_COORD_PRECISION = int(os.getenv("SEARCH_CACHE_COORD_PRECISION", "4"))
+SEARCH_CACHE_RADIUS_PRECISION = int(os.getenv("SEARCH_CACHE_RADIUS_PRECISION", "2"))
+
+# Живая лента сообщений (points/messages/stream/, SSE). Подписки процесса индексируются
+# сеткой LIVE_FEED_CELL_DEG; круг больше LIVE_FEED_MAX_CELLS ячеек проверяется на каждом
+# событии. Keepalive раз в LIVE_FEED_HEARTBEAT_SECONDS; клиент, отставший больше чем на
+# LIVE_FEED_QUEUE_SIZE событий, отключается (event: overflow). При переподключении
+# (since / Last-Event-ID) досылается не больше LIVE_FEED_BACKLOG_LIMIT пропущенных сообщений,
+# дальше — event: truncated и переподключение за следующей порцией.
+LIVE_FEED_CELL_DEG = float(os.getenv("LIVE_FEED_CELL_DEG", "0.1"))
+LIVE_FEED_MAX_CELLS = int(os.getenv("LIVE_FEED_MAX_CELLS", "256"))
+LIVE_FEED_HEARTBEAT_SECONDS = float(os.getenv("LIVE_FEED_HEARTBEAT_SECONDS", "15"))
+LIVE_FEED_QUEUE_SIZE = int(os.getenv("LIVE_FEED_QUEUE_SIZE", "100"))
+LIVE_FEED_BACKLOG_LIMIT = int(os.getenv("LIVE_FEED_BACKLOG_LIMIT", "100"))
+
+# In-process индекс точек (NumPy, см. `manage.py build_points_index`). Пусто — выключен.
+# Индекс обслуживает page-number поиск точек с радиусом до POINTS_INDEX_MAX_RADIUS_KM;
+# новые точки догружаются не чаще раза в POINTS_INDEX_REFRESH_SECONDS — по id больше
+# последнего увиденного и по created_at с перекрытием POINTS_INDEX_CATCHUP_OVERLAP_SECONDS
+# (для строк, закоммиченных позже параллельных транзакций с бо́льшими id).
+POINTS_INDEX_PATH = os.getenv("POINTS_INDEX_PATH") or None
+POINTS_INDEX_CELL_DEG = float(os.getenv("POINTS_INDEX_CELL_DEG", "0.1"))
+POINTS_INDEX_MAX_RADIUS_KM = float(os.getenv("POINTS_INDEX_MAX_RADIUS_KM", "200"))
+POINTS_INDEX_REFRESH_SECONDS = float(os.getenv("POINTS_INDEX_REFRESH_SECONDS", "1"))
+POINTS_INDEX_CATCHUP_OVERLAP_SECONDS = int(os.getenv("POINTS_INDEX_CATCHUP_OVERLAP_SECONDS", "60"))
+
 # Опциональный лимит радиуса поиска (км). Если переменная окружения не задана — лимит не применяется.
 _max_radius_raw = os.getenv("MAX_SEARCH_RADIUS_KM")
 MAX_SEARCH_RADIUS_KM = float(_max_radius_raw) if _max_radius_raw else None